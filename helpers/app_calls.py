@@ -0,0 +1,127 @@
+# mypy: ignore-errors
+
+import base64
+import dataclasses
+import functools
+from collections.abc import Iterator, Mapping
+from typing import Any, Final
+
+from algosdk import abi
+from algosdk.transaction import OnComplete
+
+from helpers.circulating_supply import LABEL_FIELDS, empty_config
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    APP_SPEC,
+    CirculatingSupplyConfig,
+)
+
+INIT_CONFIG: Final[str] = "init_config"
+SET_NOT_CIRCULATING_ADDRESS: Final[str] = "set_not_circulating_address"
+DELETE_CONFIG: Final[str] = "delete_config"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ConfigUpdate:
+    """Circulating supply config update performed by a confirmed App Call"""
+
+    method: str
+    asset_id: int
+    label: str | None = None
+    address: str | None = None
+
+
+@functools.cache
+def _config_methods() -> dict[bytes, abi.Method]:
+    methods = (
+        m.to_abi_method()
+        for m in APP_SPEC.methods
+        if m.name in (INIT_CONFIG, SET_NOT_CIRCULATING_ADDRESS, DELETE_CONFIG)
+    )
+    return {m.get_selector(): m for m in methods}
+
+
+def decode_config_update(app_args: list[bytes]) -> ConfigUpdate | None:
+    """Decodes the config update of an App Call from its arguments, if any."""
+    if not app_args:
+        return None
+    method = _config_methods().get(app_args[0])
+    if method is None:
+        return None
+    # Transaction arguments (the MBR payment) are not passed as App Call arguments
+    values = [
+        arg.type.decode(raw)
+        for arg, raw in zip(
+            (a for a in method.args if isinstance(a.type, abi.ABIType)),
+            app_args[1:],
+            strict=True,
+        )
+    ]
+    if method.name == SET_NOT_CIRCULATING_ADDRESS:
+        asset_id, address, label = values
+        return ConfigUpdate(method.name, asset_id, label=label, address=address)
+    return ConfigUpdate(method.name, values[0])
+
+
+def iter_app_calls(
+    txn: Mapping[str, Any], app_id: int
+) -> Iterator[tuple[list[bytes], Mapping[str, Any]]]:
+    """
+    Yields the arguments of the NoOp calls to the App, with the transaction they
+    belong to, including inner transactions. Accepts Indexer JSON transactions and
+    block (msgpack) signed transactions.
+    """
+    if "tx-type" in txn:  # Indexer
+        call = txn.get("application-transaction")
+        if (
+            call is not None
+            and call.get("application-id") == app_id
+            and call.get("on-completion", "noop") == "noop"
+        ):
+            yield [base64.b64decode(a) for a in call.get("application-args", [])], txn
+        inner_txns = txn.get("inner-txns", [])
+    else:  # Block
+        body = txn.get("txn", txn)
+        if (
+            body.get("type") == "appl"
+            and body.get("apid", 0) == app_id
+            and body.get("apan", OnComplete.NoOpOC) == OnComplete.NoOpOC
+        ):
+            yield list(body.get("apaa", [])), txn
+        inner_txns = txn.get("dt", {}).get("itx", [])
+    for inner in inner_txns:
+        yield from iter_app_calls(inner, app_id)
+
+
+def decode_config_updates(txn: Mapping[str, Any], app_id: int) -> list[ConfigUpdate]:
+    """Returns the config updates performed by a confirmed transaction."""
+    updates = []
+    for app_args, _call in iter_app_calls(txn, app_id):
+        update = decode_config_update(app_args)
+        if update is not None:
+            updates.append(update)
+    return updates
+
+
+def apply_config_update(
+    config: CirculatingSupplyConfig | None, update: ConfigUpdate
+) -> CirculatingSupplyConfig | None:
+    """Returns the config resulting from the update (None if deleted)."""
+    if update.method == INIT_CONFIG:
+        return empty_config()
+    if update.method == DELETE_CONFIG:
+        return None
+    return dataclasses.replace(
+        config or empty_config(), **{LABEL_FIELDS[update.label]: update.address}
+    )
+
+
+def encode_config_update(update: ConfigUpdate) -> list[bytes]:
+    """Encodes a config update as App Call arguments (inverse of the decoder)."""
+    method = next(m for m in _config_methods().values() if m.name == update.method)
+    values = [update.asset_id]
+    if update.method == SET_NOT_CIRCULATING_ADDRESS:
+        values += [update.address, update.label]
+    arg_types = [a.type for a in method.args if isinstance(a.type, abi.ABIType)]
+    return [method.get_selector()] + [
+        t.encode(v) for t, v in zip(arg_types, values, strict=True)
+    ]
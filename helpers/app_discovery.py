@@ -0,0 +1,216 @@
+# mypy: ignore-errors
+
+import base64
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any, Final
+
+from algokit_utils import CommonAppCallParams, LogicError
+
+from helpers.arc2_discovery import APPLICATION_ID, Arc2Resolver, iter_arc62_notes
+
+logger = logging.getLogger(__name__)
+
+MAX_GROUP_SIZE: Final[int] = 16
+ARC3_PROPERTIES: Final[str] = "properties"
+ARC62_PROPERTY: Final[str] = "arc-62"
+
+_MISS: Final = object()
+_FAILED: Final = object()
+
+# Reader returns the ARC-3 JSON metadata of the ASAs (None if without metadata)
+MetadataReader = Callable[[list[int]], dict[int, Mapping[str, Any] | None]]
+
+
+def registry_metadata_reader(
+    client: Any, sender: str | None = None  # noqa: ANN401
+) -> MetadataReader:
+    """
+    Returns a reader of the ASA metadata `properties` from an ARC-89 registry client,
+    simulating its `arc89_get_metadata_object_by_key` getter with a single group for
+    up to `MAX_GROUP_SIZE` ASAs (no signature, resources populated by the
+    simulation). A failing getter (e.g. ASA without metadata) is isolated, and read
+    as without metadata. The simulation `sender` defaults to the client default
+    sender.
+    """
+
+    def simulate(asset_ids: list[int]) -> dict[int, Mapping[str, Any] | None]:
+        group = client.new_group()
+        for asset_id in asset_ids:
+            group.arc89_get_metadata_object_by_key(
+                args=(asset_id, ARC3_PROPERTIES),
+                params=CommonAppCallParams(sender=sender),
+            )
+        try:
+            result = group.simulate(allow_unnamed_resources=True, skip_signatures=True)
+        except LogicError:
+            # A failing getter fails the whole group: isolate it
+            if len(asset_ids) == 1:
+                return {asset_ids[0]: None}
+            metadata = {}
+            for asset_id in asset_ids:
+                metadata.update(simulate([asset_id]))
+            return metadata
+        return {
+            a: _properties_metadata(r.value)
+            for a, r in zip(asset_ids, result.returns, strict=True)
+        }
+
+    def read(asset_ids: list[int]) -> dict[int, Mapping[str, Any] | None]:
+        metadata = {}
+        for i in range(0, len(asset_ids), MAX_GROUP_SIZE):
+            metadata.update(simulate(asset_ids[i : i + MAX_GROUP_SIZE]))
+        return metadata
+
+    return read
+
+
+def _properties_metadata(value: str) -> Mapping[str, Any] | None:
+    try:
+        return {ARC3_PROPERTIES: json.loads(value)}
+    except ValueError:
+        return None
+
+
+def parse_arc62_metadata(metadata: Mapping[str, Any] | None) -> int | None:
+    """Returns the App ID of the `properties.arc-62.application-id` metadata."""
+    if not isinstance(metadata, Mapping):
+        return None
+    arc62 = metadata.get("properties", {}).get(ARC62_PROPERTY, {})
+    app_id = arc62.get(APPLICATION_ID) if isinstance(arc62, Mapping) else None
+    return app_id if isinstance(app_id, int) and app_id > 0 else None
+
+
+class AppDiscovery:
+    """
+    ARC-62 App discovery for many ASAs: ARC-3 metadata on the ARC-89 registry first,
+    with fallback on the ARC-2 notes.
+
+    The cache misses are read from the registry in a single batch. Results
+    (undiscovered ASAs included) are cached until expired, invalidated explicitly or
+    by an observed transaction updating the ASA metadata or discovery note.
+    """
+
+    def __init__(
+        self,
+        read_metadata: MetadataReader,
+        *,
+        arc2: Arc2Resolver | None = None,
+        registry_app_id: int | None = None,
+        ttl: float | None = None,
+    ) -> None:
+        self._read_metadata = read_metadata
+        self.arc2 = arc2
+        self.registry_app_id = registry_app_id
+        self._ttl = ttl
+        self._entries: dict[int, tuple[int | None, float]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, asset_id: int) -> bool:
+        return self._cached(asset_id) is not _MISS
+
+    def resolve(self, asset_id: int) -> int | None:
+        return self.resolve_many([asset_id]).get(asset_id)
+
+    def resolve_many(self, asset_ids: Iterable[int]) -> dict[int, int]:
+        """Returns the App IDs of the ASAs (undiscovered ASAs are missing)."""
+        resolved: dict[int, int | None] = {}
+        misses = []
+        for asset_id in dict.fromkeys(asset_ids):
+            cached = self._cached(asset_id)
+            if cached is _MISS:
+                misses.append(asset_id)
+            else:
+                resolved[asset_id] = cached
+
+        if misses:
+            discovered = self._read_registry(misses)
+            # Failed reads are not cached as undiscovered, unless found on ARC-2
+            failed = {a for a, app_id in discovered.items() if app_id is _FAILED}
+            for asset_id in failed:
+                discovered[asset_id] = None
+            fallback = [a for a in misses if discovered[a] is None]
+            if fallback and self.arc2 is not None:
+                found = self.arc2.get_many(fallback)
+                discovered.update(found)
+                failed -= found.keys()
+            expires = time.monotonic() + self._ttl if self._ttl is not None else 0.0
+            with self._lock:
+                for asset_id, app_id in discovered.items():
+                    if asset_id not in failed:
+                        self._entries[asset_id] = (app_id, expires)
+            resolved.update(discovered)
+        return {a: app_id for a, app_id in resolved.items() if app_id is not None}
+
+    def invalidate(self, asset_id: int) -> None:
+        with self._lock:
+            self._entries.pop(asset_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def observe_transaction(self, txn: Mapping[str, Any]) -> None:
+        """
+        Invalidates the ASAs whose discovery may be changed by a confirmed transaction
+        (Indexer JSON or block format): ARC-62 notes and registry App Calls.
+        """
+        for asset_id, _app_id, _round in iter_arc62_notes(txn, round_num=0):
+            self.invalidate(asset_id)
+        if self.registry_app_id is not None:
+            for asset_id in _registry_call_assets(txn, self.registry_app_id):
+                self.invalidate(asset_id)
+
+    def _cached(self, asset_id: int) -> int | object | None:
+        with self._lock:
+            entry = self._entries.get(asset_id)
+            if entry is None:
+                return _MISS
+            app_id, expires = entry
+            if self._ttl is not None and time.monotonic() >= expires:
+                del self._entries[asset_id]
+                return _MISS
+            return app_id
+
+    def _read_registry(self, asset_ids: list[int]) -> dict[int, int | object | None]:
+        try:
+            metadata = self._read_metadata(asset_ids)
+        except Exception as e:
+            # A failed read must not fail the resolution: fall back on the ARC-2 notes
+            logger.warning(f"Failed reading ARC-89 metadata of ASAs {asset_ids}: {e}")
+            return dict.fromkeys(asset_ids, _FAILED)
+        return {a: parse_arc62_metadata(metadata.get(a)) for a in asset_ids}
+
+
+def _registry_call_assets(txn: Mapping[str, Any], app_id: int) -> Iterator[int]:
+    """
+    Yields the ASA argument of the App Calls to the registry, inner included: the
+    ARC-89 methods take the ASA as first argument (its ID, or its index in the
+    foreign ASAs as ABI `asset` reference).
+    """
+    if "tx-type" in txn:  # Indexer
+        call = txn.get("application-transaction")
+        if call is not None and call.get("application-id") == app_id:
+            args = [base64.b64decode(a) for a in call.get("application-args", [])]
+            yield from _asset_arg(args, call.get("foreign-assets", []))
+        inners = txn.get("inner-txns", [])
+    else:  # Block
+        body = txn.get("txn", txn)
+        if body.get("type") == "appl" and body.get("apid") == app_id:
+            yield from _asset_arg(body.get("apaa", []), body.get("apas", []))
+        inners = txn.get("dt", {}).get("itx", [])
+    for inner in inners:
+        yield from _registry_call_assets(inner, app_id)
+
+
+def _asset_arg(args: list[bytes], foreign_assets: list[int]) -> Iterator[int]:
+    if len(args) < 2:  # Method selector and ASA
+        return
+    arg = args[1]
+    if len(arg) == 8:
+        yield int.from_bytes(arg, "big")
+    elif len(arg) == 1 and arg[0] < len(foreign_assets):
+        yield foreign_assets[arg[0]]
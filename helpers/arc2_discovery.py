@@ -0,0 +1,189 @@
+# mypy: ignore-errors
+
+import base64
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from algosdk.v2client.indexer import IndexerClient
+
+from helpers.config_mirror import INDEXER_PAGE_LIMIT
+from smart_contracts.circulating_supply.config import ARC2_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# ARC-2 note prefix of ARC-62 discovery: `<dapp-name>:<data-format>`, JSON format
+ARC2_NOTE_PREFIX: Final[bytes] = f"{ARC2_PREFIX}:j".encode()
+APPLICATION_ID: Final[str] = "application-id"
+
+_SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS arc2_notes (
+    asset_id INTEGER PRIMARY KEY,
+    app_id INTEGER NOT NULL,
+    last_round INTEGER NOT NULL
+);
+"""
+
+
+def parse_arc62_note(note: bytes) -> int | None:
+    """Returns the App ID of an ARC-62 ARC-2 note, or None if not an ARC-62 note."""
+    # Cheap prefix check first: most notes are not ARC-62 and are never parsed
+    if not note.startswith(ARC2_NOTE_PREFIX):
+        return None
+    try:
+        data = json.loads(note[len(ARC2_NOTE_PREFIX) :])
+    except ValueError:
+        return None
+    app_id = data.get(APPLICATION_ID) if isinstance(data, dict) else None
+    return app_id if isinstance(app_id, int) and app_id > 0 else None
+
+
+def iter_arc62_notes(
+    txn: Mapping[str, Any], round_num: int | None = None
+) -> Iterator[tuple[int, int, int]]:
+    """
+    Yields the (ASA, App ID, round) of the ARC-62 notes of asset config transactions,
+    including inner transactions. Accepts Indexer JSON transactions and block
+    (msgpack) signed transactions, the latter requiring the block `round_num`.
+    """
+    if "tx-type" in txn:  # Indexer
+        round_num = txn.get("confirmed-round", round_num)
+        if txn["tx-type"] == "acfg" and "note" in txn:
+            app_id = parse_arc62_note(base64.b64decode(txn["note"]))
+            if app_id is not None:
+                asset_id = txn["asset-config-transaction"].get("asset-id") or txn.get(
+                    "created-asset-index"
+                )
+                yield asset_id, app_id, round_num
+        inners = txn.get("inner-txns", [])
+    else:  # Block
+        body = txn.get("txn", txn)
+        if body.get("type") == "acfg" and "note" in body:
+            app_id = parse_arc62_note(body["note"])
+            if app_id is not None:
+                yield body.get("caid") or txn.get("caid"), app_id, round_num
+        inners = txn.get("dt", {}).get("itx", [])
+    for inner in inners:
+        yield from iter_arc62_notes(inner, round_num)
+
+
+class Arc2Resolver:
+    """
+    Persistent (SQLite) resolver of ARC-62 Apps discovered through ARC-2 notes, as
+    `asset_id -> app_id`. The latest note of each ASA wins.
+
+    Asset config transactions are scanned once for all the ASAs, after the last
+    scanned round, instead of searching the transactions of each ASA.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "Arc2Resolver":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def last_round(self) -> int:
+        """Last round the resolver is synced to (0 if never synced)."""
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = 'last_round'"
+        ).fetchone()
+        return row[0] if row is not None else 0
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM arc2_notes").fetchone()[0]
+
+    def get(self, asset_id: int) -> int | None:
+        row = self._db.execute(
+            "SELECT app_id FROM arc2_notes WHERE asset_id = ?", (asset_id,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def get_many(self, asset_ids: Iterable[int]) -> dict[int, int]:
+        """Returns the App IDs of the discovered ASAs (undiscovered are missing)."""
+        found = {}
+        ids = list(dict.fromkeys(asset_ids))
+        # Bounded by the SQLite host parameters limit
+        for i in range(0, len(ids), 500):
+            chunk = ids[i : i + 500]
+            rows = self._db.execute(
+                f"SELECT asset_id, app_id FROM arc2_notes "
+                f"WHERE asset_id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(rows)
+        return found
+
+    def scan(
+        self, txns: Iterable[Mapping[str, Any]], *, round_num: int | None = None
+    ) -> int:
+        """
+        Records the ARC-62 notes of confirmed transactions (Indexer JSON or block
+        format), in confirmation order. Returns the number of recorded notes.
+        """
+        count = 0
+        with self._db:
+            for txn in txns:
+                for asset_id, app_id, note_round in iter_arc62_notes(txn, round_num):
+                    if note_round is None:
+                        raise ValueError("Transaction round is unknown")
+                    self._db.execute(
+                        "INSERT INTO arc2_notes VALUES (?, ?, ?) "
+                        "ON CONFLICT (asset_id) DO UPDATE SET "
+                        "app_id = excluded.app_id, last_round = excluded.last_round "
+                        "WHERE excluded.last_round >= arc2_notes.last_round",
+                        (asset_id, app_id, note_round),
+                    )
+                    count += 1
+        return count
+
+    def sync(self, indexer: IndexerClient) -> int:
+        """Scans the ARC-62 notes confirmed after the last synced round."""
+        count = 0
+        min_round = self.last_round + 1
+        next_page = None
+        current_round = None
+        while True:
+            response = indexer.search_transactions(
+                txn_type="acfg",
+                note_prefix=ARC2_NOTE_PREFIX,
+                min_round=min_round,
+                limit=INDEXER_PAGE_LIMIT,
+                next_page=next_page,
+            )
+            current_round = current_round or response["current-round"]
+            count += self.scan(response["transactions"])
+            next_page = response.get("next-token")
+            if not next_page or not response["transactions"]:
+                break
+        with self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('last_round', ?)",
+                (max(self.last_round, current_round),),
+            )
+        logger.info(f"Scanned {count} ARC-62 notes up to round {self.last_round}")
+        return count
+
+    def resolve(
+        self, asset_ids: Iterable[int], indexer: IndexerClient | None = None
+    ) -> dict[int, int]:
+        """Returns the App IDs of the ASAs, syncing first if an Indexer is given."""
+        if indexer is not None:
+            self.sync(indexer)
+        return self.get_many(asset_ids)
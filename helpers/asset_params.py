@@ -0,0 +1,194 @@
+# mypy: ignore-errors
+
+import dataclasses
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Callable, Mapping
+from typing import Any, Final
+
+from algokit_utils import AlgorandClient
+from algosdk.constants import ZERO_ADDRESS
+from algosdk.error import AlgodHTTPError
+from algosdk.transaction import AssetConfigTxn, Transaction
+
+DEFAULT_MAX_SIZE: Final[int] = 10_000
+
+_MISSING: Final = object()
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AssetParams:
+    """ASA parameters relevant for the circulating supply computation"""
+
+    asset_id: int
+    total: int
+    manager: str = ZERO_ADDRESS
+    reserve: str = ZERO_ADDRESS
+    clawback: str = ZERO_ADDRESS
+
+    @property
+    def is_arc54_compliant(self) -> bool:
+        return self.clawback == ZERO_ADDRESS
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+# Fetcher returns None if the ASA does not exist (never created or destroyed)
+AssetParamsFetcher = Callable[[int], AssetParams | None]
+
+
+def algod_asset_params_fetcher(algorand: AlgorandClient) -> AssetParamsFetcher:
+    """Returns a fetcher reading the ASA parameters from Algod."""
+
+    def fetch(asset_id: int) -> AssetParams | None:
+        try:
+            info = algorand.asset.get_by_id(asset_id)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        return AssetParams(
+            asset_id=info.asset_id,
+            total=info.total,
+            manager=info.manager or ZERO_ADDRESS,
+            reserve=info.reserve or ZERO_ADDRESS,
+            clawback=info.clawback or ZERO_ADDRESS,
+        )
+
+    return fetch
+
+
+class AssetParamsCache:
+    """
+    Bounded LRU cache of ASA parameters, shared by the circulating supply readers.
+
+    Entries (including non-existing ASAs) are kept until evicted or invalidated by
+    an observed asset config or destroy transaction. A fetch invalidated while in
+    flight is returned but not cached, as it may predate the invalidation.
+    """
+
+    def __init__(
+        self, fetch: AssetParamsFetcher, *, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("Cache max size must be positive")
+        self._fetch = fetch
+        self._max_size = max_size
+        self._entries: OrderedDict[int, AssetParams | None] = OrderedDict()
+        # Invalidations counters and fetches count of the ASAs being fetched
+        self._generations: dict[int, int] = {}
+        self._fetching: Counter[int] = Counter()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_algorand(
+        cls, algorand: AlgorandClient, *, max_size: int = DEFAULT_MAX_SIZE
+    ) -> "AssetParamsCache":
+        return cls(algod_asset_params_fetcher(algorand), max_size=max_size)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, asset_id: int) -> bool:
+        return asset_id in self._entries
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+        )
+
+    def get(self, asset_id: int) -> AssetParams | None:
+        """Returns the ASA parameters, or None if the ASA does not exist."""
+        with self._lock:
+            if asset_id in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(asset_id)
+                return self._entries[asset_id]
+            self._misses += 1
+            self._fetching[asset_id] += 1
+            generation = self._generations.setdefault(asset_id, 0)
+        params = _MISSING
+        try:
+            params = self._fetch(asset_id)
+        finally:
+            with self._lock:
+                invalidated = self._generations[asset_id] != generation
+                self._fetching[asset_id] -= 1
+                if not self._fetching[asset_id]:
+                    del self._fetching[asset_id]
+                    del self._generations[asset_id]
+                if params is not _MISSING and not invalidated:
+                    self._put(asset_id, params)
+        return params
+
+    def put(self, asset_id: int, params: AssetParams | None) -> None:
+        with self._lock:
+            self._put(asset_id, params)
+
+    def invalidate(self, asset_id: int) -> None:
+        with self._lock:
+            if asset_id in self._generations:
+                self._generations[asset_id] += 1
+            if self._entries.pop(asset_id, _MISSING) is not _MISSING:
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for asset_id in self._generations:
+                self._generations[asset_id] += 1
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+
+    def _put(self, asset_id: int, params: AssetParams | None) -> None:
+        self._entries[asset_id] = params
+        self._entries.move_to_end(asset_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def observe_transaction(self, txn: Transaction | Mapping[str, Any]) -> None:
+        """
+        Invalidates the cached ASA parameters affected by an asset config or destroy
+        transaction. Accepts either an SDK transaction or an Algod, Indexer or block
+        transaction (inner transactions are followed).
+        """
+        if isinstance(txn, Transaction):
+            if isinstance(txn, AssetConfigTxn) and txn.index:
+                self.invalidate(txn.index)
+            return
+        for asset_id in _configured_asset_ids(txn):
+            self.invalidate(asset_id)
+
+
+def _configured_asset_ids(txn: Mapping[str, Any]) -> list[int]:
+    asset_ids = []
+    # Algod responses and blocks wrap the transaction in a signed transaction
+    body = txn.get("txn", txn)
+    body = body.get("txn", body)
+    if body.get("tx-type", body.get("type")) == "acfg":
+        config = body.get("asset-config-transaction", body)
+        asset_id = config.get("asset-id", config.get("caid", 0))
+        if asset_id:  # Asset creations have no configured asset ID
+            asset_ids.append(asset_id)
+    for inner in txn.get("inner-txns", txn.get("dt", {}).get("itx", [])):
+        asset_ids.extend(_configured_asset_ids(inner))
+    return asset_ids
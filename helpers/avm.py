@@ -0,0 +1,1363 @@
+# mypy: ignore-errors
+
+import base64
+import dataclasses
+import functools
+import re
+from collections.abc import Callable, Mapping
+from typing import Any, Final, Protocol
+
+from helpers.cost_profiler import opcode_cost
+
+APP_CALL_BUDGET: Final[int] = 700
+MAX_STACK_DEPTH: Final[int] = 1_000
+MAX_BYTES_LENGTH: Final[int] = 4_096
+MAX_LOGS: Final[int] = 32
+MAX_LOG_SIZE: Final[int] = 1_024
+MAX_INNER_TRANSACTIONS: Final[int] = 256
+MAX_BOX_NAME_LENGTH: Final[int] = 64
+MAX_BOX_SIZE: Final[int] = 32_768
+MAX_UINT64: Final[int] = 2**64 - 1
+
+TXN_FIELDS: Final[tuple[str, ...]] = (
+    "Sender",
+    "Fee",
+    "FirstValid",
+    "FirstValidTime",
+    "LastValid",
+    "Note",
+    "Lease",
+    "Receiver",
+    "Amount",
+    "CloseRemainderTo",
+    "VotePK",
+    "SelectionPK",
+    "VoteFirst",
+    "VoteLast",
+    "VoteKeyDilution",
+    "Type",
+    "TypeEnum",
+    "XferAsset",
+    "AssetAmount",
+    "AssetSender",
+    "AssetReceiver",
+    "AssetCloseTo",
+    "GroupIndex",
+    "TxID",
+    "ApplicationID",
+    "OnCompletion",
+    "ApplicationArgs",
+    "NumAppArgs",
+    "Accounts",
+    "NumAccounts",
+    "ApprovalProgram",
+    "ClearStateProgram",
+    "RekeyTo",
+    "ConfigAsset",
+    "ConfigAssetTotal",
+    "ConfigAssetDecimals",
+    "ConfigAssetDefaultFrozen",
+    "ConfigAssetUnitName",
+    "ConfigAssetName",
+    "ConfigAssetURL",
+    "ConfigAssetMetadataHash",
+    "ConfigAssetManager",
+    "ConfigAssetReserve",
+    "ConfigAssetFreeze",
+    "ConfigAssetClawback",
+    "FreezeAsset",
+    "FreezeAssetAccount",
+    "FreezeAssetFrozen",
+    "Assets",
+    "NumAssets",
+    "Applications",
+    "NumApplications",
+    "GlobalNumUint",
+    "GlobalNumByteSlice",
+    "LocalNumUint",
+    "LocalNumByteSlice",
+    "ExtraProgramPages",
+    "Nonparticipation",
+    "Logs",
+    "NumLogs",
+    "CreatedAssetID",
+    "CreatedApplicationID",
+    "LastLog",
+    "StateProofPK",
+    "ApprovalProgramPages",
+    "NumApprovalProgramPages",
+    "ClearStateProgramPages",
+    "NumClearStateProgramPages",
+)
+GLOBAL_FIELDS: Final[tuple[str, ...]] = (
+    "MinTxnFee",
+    "MinBalance",
+    "MaxTxnLife",
+    "ZeroAddress",
+    "GroupSize",
+    "LogicSigVersion",
+    "Round",
+    "LatestTimestamp",
+    "CurrentApplicationID",
+    "CreatorAddress",
+    "CurrentApplicationAddress",
+    "GroupID",
+    "OpcodeBudget",
+    "CallerApplicationID",
+    "CallerApplicationAddress",
+    "AssetCreateMinBalance",
+    "AssetOptInMinBalance",
+    "GenesisHash",
+)
+ASSET_HOLDING_FIELDS: Final[tuple[str, ...]] = ("AssetBalance", "AssetFrozen")
+ASSET_PARAMS_FIELDS: Final[tuple[str, ...]] = (
+    "AssetTotal",
+    "AssetDecimals",
+    "AssetDefaultFrozen",
+    "AssetUnitName",
+    "AssetName",
+    "AssetURL",
+    "AssetMetadataHash",
+    "AssetManager",
+    "AssetReserve",
+    "AssetFreeze",
+    "AssetClawback",
+    "AssetCreator",
+)
+ACCT_PARAMS_FIELDS: Final[tuple[str, ...]] = (
+    "AcctBalance",
+    "AcctMinBalance",
+    "AcctAuthAddr",
+    "AcctTotalNumUint",
+    "AcctTotalNumByteSlice",
+    "AcctTotalExtraAppPages",
+    "AcctTotalAppsCreated",
+    "AcctTotalAppsOptedIn",
+    "AcctTotalAssetsCreated",
+    "AcctTotalAssets",
+    "AcctTotalBoxes",
+    "AcctTotalBoxBytes",
+)
+# Transaction fields holding arrays, read by index (`txna`, `gtxnsa`, ...)
+TXN_ARRAY_FIELDS: Final[frozenset[str]] = frozenset(
+    ("ApplicationArgs", "Accounts", "Assets", "Applications", "Logs")
+)
+
+# Immediate kinds: field names (by their table), signed or unsigned byte, varuint,
+# bytes, their lists (consuming the remaining arguments) and branch labels
+UINT8: Final[str] = "uint8"
+INT8: Final[str] = "int8"
+VARUINT: Final[str] = "varuint"
+BYTES: Final[str] = "bytes"
+VARUINTS: Final[str] = "varuints"
+BYTESS: Final[str] = "bytess"
+LABEL: Final[str] = "label"
+LABELS: Final[str] = "labels"
+TXN: Final[str] = "txn"
+GLOBAL: Final[str] = "global"
+ASSET_HOLDING: Final[str] = "asset_holding"
+ASSET_PARAMS: Final[str] = "asset_params"
+ACCT_PARAMS: Final[str] = "acct_params"
+
+_FIELDS: Final[dict[str, tuple[str, ...]]] = {
+    TXN: TXN_FIELDS,
+    GLOBAL: GLOBAL_FIELDS,
+    ASSET_HOLDING: ASSET_HOLDING_FIELDS,
+    ASSET_PARAMS: ASSET_PARAMS_FIELDS,
+    ACCT_PARAMS: ACCT_PARAMS_FIELDS,
+}
+
+StackValue = int | bytes
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OpSpec:
+    """AVM opcode: TEAL name, byte code and immediate kinds"""
+
+    name: str
+    code: int
+    immediates: tuple[str, ...] = ()
+
+
+# Opcodes of the Apps compiled by Puya (no LogicSig, crypto or local state ops)
+OP_SPECS: Final[dict[str, OpSpec]] = {
+    spec.name: spec
+    for spec in (
+        OpSpec("err", 0x00),
+        OpSpec("+", 0x08),
+        OpSpec("-", 0x09),
+        OpSpec("/", 0x0A),
+        OpSpec("*", 0x0B),
+        OpSpec("<", 0x0C),
+        OpSpec(">", 0x0D),
+        OpSpec("<=", 0x0E),
+        OpSpec(">=", 0x0F),
+        OpSpec("&&", 0x10),
+        OpSpec("||", 0x11),
+        OpSpec("==", 0x12),
+        OpSpec("!=", 0x13),
+        OpSpec("!", 0x14),
+        OpSpec("len", 0x15),
+        OpSpec("itob", 0x16),
+        OpSpec("btoi", 0x17),
+        OpSpec("%", 0x18),
+        OpSpec("|", 0x19),
+        OpSpec("&", 0x1A),
+        OpSpec("^", 0x1B),
+        OpSpec("~", 0x1C),
+        OpSpec("intcblock", 0x20, (VARUINTS,)),
+        OpSpec("intc", 0x21, (UINT8,)),
+        OpSpec("intc_0", 0x22),
+        OpSpec("intc_1", 0x23),
+        OpSpec("intc_2", 0x24),
+        OpSpec("intc_3", 0x25),
+        OpSpec("bytecblock", 0x26, (BYTESS,)),
+        OpSpec("bytec", 0x27, (UINT8,)),
+        OpSpec("bytec_0", 0x28),
+        OpSpec("bytec_1", 0x29),
+        OpSpec("bytec_2", 0x2A),
+        OpSpec("bytec_3", 0x2B),
+        OpSpec("txn", 0x31, (TXN,)),
+        OpSpec("global", 0x32, (GLOBAL,)),
+        OpSpec("gtxn", 0x33, (UINT8, TXN)),
+        OpSpec("load", 0x34, (UINT8,)),
+        OpSpec("store", 0x35, (UINT8,)),
+        OpSpec("txna", 0x36, (TXN, UINT8)),
+        OpSpec("gtxna", 0x37, (UINT8, TXN, UINT8)),
+        OpSpec("gtxns", 0x38, (TXN,)),
+        OpSpec("gtxnsa", 0x39, (TXN, UINT8)),
+        OpSpec("bnz", 0x40, (LABEL,)),
+        OpSpec("bz", 0x41, (LABEL,)),
+        OpSpec("b", 0x42, (LABEL,)),
+        OpSpec("return", 0x43),
+        OpSpec("assert", 0x44),
+        OpSpec("bury", 0x45, (UINT8,)),
+        OpSpec("popn", 0x46, (UINT8,)),
+        OpSpec("dupn", 0x47, (UINT8,)),
+        OpSpec("pop", 0x48),
+        OpSpec("dup", 0x49),
+        OpSpec("dup2", 0x4A),
+        OpSpec("dig", 0x4B, (UINT8,)),
+        OpSpec("swap", 0x4C),
+        OpSpec("select", 0x4D),
+        OpSpec("cover", 0x4E, (UINT8,)),
+        OpSpec("uncover", 0x4F, (UINT8,)),
+        OpSpec("concat", 0x50),
+        OpSpec("substring", 0x51, (UINT8, UINT8)),
+        OpSpec("substring3", 0x52),
+        OpSpec("extract", 0x57, (UINT8, UINT8)),
+        OpSpec("extract3", 0x58),
+        OpSpec("extract_uint16", 0x59),
+        OpSpec("extract_uint32", 0x5A),
+        OpSpec("extract_uint64", 0x5B),
+        OpSpec("replace2", 0x5C, (UINT8,)),
+        OpSpec("replace3", 0x5D),
+        OpSpec("asset_holding_get", 0x70, (ASSET_HOLDING,)),
+        OpSpec("asset_params_get", 0x71, (ASSET_PARAMS,)),
+        OpSpec("acct_params_get", 0x73, (ACCT_PARAMS,)),
+        OpSpec("pushbytes", 0x80, (BYTES,)),
+        OpSpec("pushint", 0x81, (VARUINT,)),
+        OpSpec("pushbytess", 0x82, (BYTESS,)),
+        OpSpec("pushints", 0x83, (VARUINTS,)),
+        OpSpec("callsub", 0x88, (LABEL,)),
+        OpSpec("retsub", 0x89),
+        OpSpec("proto", 0x8A, (UINT8, UINT8)),
+        OpSpec("frame_dig", 0x8B, (INT8,)),
+        OpSpec("frame_bury", 0x8C, (INT8,)),
+        OpSpec("switch", 0x8D, (LABELS,)),
+        OpSpec("match", 0x8E, (LABELS,)),
+        OpSpec("log", 0xB0),
+        OpSpec("itxn_begin", 0xB1),
+        OpSpec("itxn_field", 0xB2, (TXN,)),
+        OpSpec("itxn_submit", 0xB3),
+        OpSpec("box_create", 0xB9),
+        OpSpec("box_extract", 0xBA),
+        OpSpec("box_replace", 0xBB),
+        OpSpec("box_del", 0xBC),
+        OpSpec("box_len", 0xBD),
+        OpSpec("box_get", 0xBE),
+        OpSpec("box_put", 0xBF),
+        OpSpec("txnas", 0xC0, (TXN,)),
+        OpSpec("gtxnas", 0xC1, (UINT8, TXN)),
+        OpSpec("gtxnsas", 0xC2, (TXN,)),
+    )
+}
+_OPCODES: Final[dict[int, OpSpec]] = {spec.code: spec for spec in OP_SPECS.values()}
+
+_TOKEN: Final[re.Pattern] = re.compile(r'"(?:[^"\\]|\\.)*"|[^\s"]+')
+_BASE64_CHARS: Final[str] = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+)
+_STRING_ESCAPES: Final[dict[str, int]] = {
+    "n": 0x0A,
+    "r": 0x0D,
+    "t": 0x09,
+    "\\": 0x5C,
+    '"': 0x22,
+}
+
+
+class AssembleError(Exception):
+    """TEAL source rejected by the assembler"""
+
+
+class AvmError(Exception):
+    """Program failure, with the PC and the opcode of the failing instruction"""
+
+    def __init__(self, message: str, pc: int | None = None, op: str = "") -> None:
+        super().__init__(message)
+        self.pc = pc
+        self.op = op
+
+
+class EvalContext(Protocol):
+    """
+    Ledger and transaction group seen by an App Call evaluation. Accounts are
+    32-byte addresses; lookups of missing holdings, assets or boxes return None.
+    """
+
+    def txn_field(self, group_index: int, field: str) -> Any: ...  # noqa: ANN401
+
+    def global_field(self, field: str) -> StackValue: ...
+
+    def asset_holding(
+        self, address: bytes, asset_id: int, field: str
+    ) -> StackValue | None: ...
+
+    def asset_params(self, asset_id: int, field: str) -> StackValue | None: ...
+
+    def account_params(self, address: bytes, field: str) -> StackValue: ...
+
+    def box(self, name: bytes) -> bytes | None: ...
+
+    def put_box(self, name: bytes, value: bytes) -> None: ...
+
+    def delete_box(self, name: bytes) -> None: ...
+
+    def submit_inner(self, fields: Mapping[str, Any]) -> None: ...
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Program:
+    """Assembled TEAL: bytecode and the source line (0-based) of each op PC"""
+
+    bytecode: bytes
+    lines: dict[int, int]
+
+    def source_map(self) -> dict[str, Any]:
+        """Algod source map (v3) of the bytecode: a segment per op PC."""
+        segments, line = [], 0
+        for pc in range(len(self.bytecode)):
+            if pc in self.lines:
+                segments.append(_vlq_encode(0, 0, self.lines[pc] - line, 0))
+                line = self.lines[pc]
+            else:
+                segments.append("")
+        return {
+            "version": 3,
+            "sources": [],
+            "names": [],
+            "mappings": ";".join(segments),
+        }
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Evaluation:
+    """
+    Result of a program run: approved or rejected, opcode budget consumed, logs and
+    the execution trace steps (Algod simulate format), if traced.
+    """
+
+    approved: bool
+    cost: int
+    logs: list[bytes]
+    trace: list[dict[str, Any]]
+
+
+def assemble(teal: str) -> Program:
+    """
+    Assembles a TEAL program, its template variables substituted. Only the opcodes
+    of `OP_SPECS` are supported, without the `int`, `byte`, `addr` and `method`
+    pseudo-ops.
+    """
+    version = 1
+    code = bytearray()
+    lines: dict[int, int] = {}
+    labels: dict[str, int] = {}
+    # Branch offsets to patch: offset position, end of the instruction, label, line
+    branches: list[tuple[int, int, str, int]] = []
+    for number, source in enumerate(teal.splitlines()):
+        tokens = []
+        for token in _TOKEN.findall(source):
+            if token.startswith("//"):
+                break
+            tokens.append(token)
+        if not tokens:
+            continue
+        name, args = tokens[0], tokens[1:]
+        if name == "#pragma":
+            if args[:1] == ["version"]:
+                if code:
+                    raise AssembleError(f"{number + 1}: #pragma version after ops")
+                version = _parse_int(args[1], number)
+            continue
+        if name.endswith(":") and not args:
+            labels[name[:-1]] = len(code)
+            continue
+        spec = OP_SPECS.get(name)
+        if spec is None:
+            raise AssembleError(f"{number + 1}: unknown opcode: {name}")
+        lines[len(code)] = number
+        instruction = bytearray((spec.code,))
+        targets: list[tuple[int, str]] = []
+        for kind in spec.immediates:
+            if kind in (VARUINTS, BYTESS, LABELS):
+                values, args = args, []
+                # Label counts are a byte, constant counts a varuint
+                if kind == LABELS:
+                    instruction.append(len(values))
+                else:
+                    instruction += _uvarint(len(values))
+                for value in values:
+                    if kind == VARUINTS:
+                        instruction += _uvarint(_parse_int(value, number))
+                    elif kind == BYTESS:
+                        instruction += _length_prefixed(_parse_bytes(value, number))
+                    else:
+                        targets.append((len(instruction), value))
+                        instruction += b"\x00\x00"
+                continue
+            if not args:
+                raise AssembleError(f"{number + 1}: {name} expects {kind} immediate")
+            value, args = args[0], args[1:]
+            if kind == LABEL:
+                targets.append((len(instruction), value))
+                instruction += b"\x00\x00"
+            elif kind == VARUINT:
+                instruction += _uvarint(_parse_int(value, number))
+            elif kind == BYTES:
+                instruction += _length_prefixed(_parse_bytes(value, number))
+            elif kind in (UINT8, INT8):
+                low, high = (0, 255) if kind == UINT8 else (-128, 127)
+                instruction.append(_parse_int(value, number, low, high) & 0xFF)
+            else:
+                instruction.append(_field_index(kind, value, number))
+        if args:
+            raise AssembleError(f"{number + 1}: {name} has extra arguments")
+        end = len(code) + len(instruction)
+        branches.extend((len(code) + at, end, label, number) for at, label in targets)
+        code += instruction
+    for at, end, label, number in branches:
+        if label not in labels:
+            raise AssembleError(f"{number + 1}: reference to undefined label {label}")
+        offset = labels[label] - end
+        if not -(2**15) <= offset < 2**15:
+            raise AssembleError(f"{number + 1}: label {label} is too far")
+        code[at : at + 2] = (offset & 0xFFFF).to_bytes(2, "big")
+    header = _uvarint(version)
+    return Program(
+        bytecode=header + bytes(code),
+        lines={pc + len(header): line for pc, line in lines.items()},
+    )
+
+
+def evaluate(
+    program: bytes,
+    context: EvalContext,
+    group_index: int,
+    *,
+    budget: int = APP_CALL_BUDGET,
+    trace: Mapping[str, bool] | None = None,
+) -> Evaluation:
+    """
+    Runs an App program for the `group_index` transaction of the context group,
+    within the opcode budget. `trace` is the simulate `exec-trace-config`.
+
+    Raises `AvmError` on failure (Algod "logic eval error").
+    """
+    machine = _Machine(program, context, group_index, budget, trace)
+    approved = machine.run()
+    return Evaluation(
+        approved=approved, cost=machine.cost, logs=machine.logs, trace=machine.steps
+    )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Instruction:
+    spec: OpSpec
+    immediates: tuple[Any, ...]
+    next_pc: int
+
+
+@functools.lru_cache(maxsize=32)
+def _disassemble(program: bytes) -> dict[int, _Instruction]:
+    """Returns the program instructions by PC."""
+    _version, pc = _read_uvarint(program, 0)
+    instructions = {}
+    while pc < len(program):
+        spec = _OPCODES.get(program[pc])
+        if spec is None:
+            raise AvmError(f"invalid opcode {program[pc]:#04x}", pc)
+        start, at = pc, pc + 1
+        immediates: list[Any] = []
+        try:
+            for kind in spec.immediates:
+                value, at = _read_immediate(program, at, kind)
+                immediates.append(value)
+        except IndexError:
+            raise AvmError(
+                f"{spec.name} immediates beyond program end", start
+            ) from None
+        # Branch offsets are relative to the end of the instruction
+        if spec.immediates in ((LABEL,), (LABELS,)):
+            targets = [at + offset for offset in _as_list(immediates[0])]
+            immediates = [targets if spec.immediates == (LABELS,) else targets[0]]
+        instructions[start] = _Instruction(spec, tuple(immediates), at)
+        pc = at
+    for start, instruction in instructions.items():
+        if instruction.spec.immediates in ((LABEL,), (LABELS,)):
+            for target in _as_list(instruction.immediates[0]):
+                if target != len(program) and target not in instructions:
+                    raise AvmError("branch target is not an aligned instruction", start)
+    return instructions
+
+
+class _Finished(Exception):  # noqa: N818
+    def __init__(self, approved: bool) -> None:  # noqa: FBT001
+        super().__init__()
+        self.approved = approved
+
+
+class _Machine:
+    """AVM state of a program run: stack, scratch space, frames and inner group"""
+
+    def __init__(
+        self,
+        program: bytes,
+        context: EvalContext,
+        group_index: int,
+        budget: int,
+        trace: Mapping[str, bool] | None,
+    ) -> None:
+        self.program = program
+        self.context = context
+        self.group_index = group_index
+        self.budget = budget
+        self.trace = trace if trace and trace.get("enable") else None
+        self.stack: list[StackValue] = []
+        self.scratch: list[StackValue] = [0] * 256
+        self.int_constants: list[int] = []
+        self.byte_constants: list[bytes] = []
+        # Callsub frames: return PC, stack height and proto arguments and returns
+        self.frames: list[list[int]] = []
+        self.inner: dict[str, Any] | None = None
+        self.inner_count = 0
+        self.logs: list[bytes] = []
+        self.cost = 0
+        self.steps: list[dict[str, Any]] = []
+        self.pc = 0
+        self.next_pc = 0
+        self._pops = 0
+        self._additions: list[StackValue] = []
+        self._state_changes: list[dict[str, Any]] = []
+
+    def run(self) -> bool:
+        instructions = _disassemble(self.program)
+        self.pc = _read_uvarint(self.program, 0)[1]
+        while self.pc < len(self.program):
+            instruction = instructions[self.pc]
+            name = instruction.spec.name
+            try:
+                cost = opcode_cost(name)
+                if self.cost + cost > self.budget:
+                    raise AvmError(
+                        f"dynamic cost budget exceeded, executing {name}: local "
+                        f"program cost was {self.cost}"
+                    )
+                self.cost += cost
+                self.next_pc = instruction.next_pc
+                self._pops, self._additions, self._state_changes = 0, [], []
+                try:
+                    _HANDLERS[name](self, *instruction.immediates)
+                finally:
+                    self._trace_step()
+            except AvmError as e:
+                if e.pc is None:
+                    e.pc, e.op = self.pc, name
+                raise
+            except _Finished as finished:
+                return finished.approved
+            self.pc = self.next_pc
+        if len(self.stack) != 1:
+            raise AvmError(f"stack len is {len(self.stack)} instead of 1", self.pc)
+        return self._as_int(self.stack[0]) != 0
+
+    def _trace_step(self) -> None:
+        if self.trace is None:
+            return
+        step: dict[str, Any] = {"pc": self.pc}
+        if self.trace.get("stack-change"):
+            if self._pops:
+                step["stack-pop-count"] = self._pops
+            if self._additions:
+                step["stack-additions"] = [_avm_value(v) for v in self._additions]
+        if self.trace.get("state-change") and self._state_changes:
+            step["state-changes"] = self._state_changes
+        self.steps.append(step)
+
+    def push(self, value: StackValue) -> None:
+        if len(self.stack) >= MAX_STACK_DEPTH:
+            raise AvmError(f"stack overflow: depth {MAX_STACK_DEPTH}")
+        if isinstance(value, bytes) and len(value) > MAX_BYTES_LENGTH:
+            raise AvmError(f"byte array too long: {len(value)}")
+        self.stack.append(value)
+        self._additions.append(value)
+
+    def pop(self) -> StackValue:
+        if not self.stack:
+            raise AvmError("stack underflow")
+        self._pops += 1
+        return self.stack.pop()
+
+    def pop_int(self) -> int:
+        return self._as_int(self.pop())
+
+    def pop_bytes(self) -> bytes:
+        value = self.pop()
+        if not isinstance(value, bytes):
+            raise AvmError("wanted type []byte got uint64")
+        return value
+
+    def pop_ints(self, count: int) -> list[int]:
+        """Pops the top `count` ints, returned in stack order."""
+        return [self.pop_int() for _ in range(count)][::-1]
+
+    @staticmethod
+    def _as_int(value: StackValue) -> int:
+        if not isinstance(value, int):
+            raise AvmError("wanted type uint64 got []byte")
+        return value
+
+    def jump(self, target: int) -> None:
+        self.next_pc = target
+
+    def finish(self, approved: bool) -> None:  # noqa: FBT001
+        raise _Finished(approved)
+
+    def account(self, reference: StackValue) -> bytes:
+        """Address of an account reference: address or `Accounts` index."""
+        if isinstance(reference, bytes):
+            if len(reference) != 32:
+                raise AvmError(f"invalid Account reference {reference.hex()}")
+            return reference
+        accounts = self.context.txn_field(self.group_index, "Accounts")
+        if reference >= len(accounts):
+            raise AvmError(f"invalid Account reference {reference}")
+        return accounts[reference]
+
+    def asset(self, reference: int) -> int:
+        """ID of an asset reference: ID or (if lower than their count) `Assets` index."""
+        assets = self.context.txn_field(self.group_index, "Assets")
+        return assets[reference] if reference < len(assets) else reference
+
+    def txn_field(self, group_index: int, field: str, index: int | None) -> StackValue:
+        group_size = self.context.global_field("GroupSize")
+        if group_index >= group_size:
+            raise AvmError(
+                f"txn index {group_index}, len(group) is {group_size}",
+            )
+        value = self.context.txn_field(group_index, field)
+        if field in TXN_ARRAY_FIELDS:
+            if index is None:
+                raise AvmError(f"invalid txn field {field}: array field")
+            if index >= len(value):
+                raise AvmError(f"invalid {field} index {index}")
+            return value[index]
+        if index is not None:
+            raise AvmError(f"invalid txna field {field}: not an array")
+        return value
+
+    def write_box(self, name: bytes, value: bytes) -> None:
+        self.context.put_box(name, value)
+        self._state_changes.append(
+            {
+                "app-state-type": "b",
+                "operation": "w",
+                "key": base64.b64encode(name).decode(),
+                "new-value": _avm_value(value),
+            }
+        )
+
+    def delete_box(self, name: bytes) -> None:
+        self.context.delete_box(name)
+        self._state_changes.append(
+            {
+                "app-state-type": "b",
+                "operation": "d",
+                "key": base64.b64encode(name).decode(),
+            }
+        )
+
+    def existing_box(self, name: bytes) -> bytes:
+        value = self.context.box(name)
+        if value is None:
+            raise AvmError(f"no such box {name.hex()}")
+        return value
+
+
+def _binary(operation: Callable[[int, int], int]) -> Callable[[_Machine], None]:
+    def handler(machine: _Machine) -> None:
+        a, b = machine.pop_ints(2)
+        machine.push(operation(a, b))
+
+    return handler
+
+
+def _checked(name: str, value: int) -> int:
+    if value > MAX_UINT64:
+        raise AvmError(f"{name} overflowed")
+    if value < 0:
+        raise AvmError(f"{name} would result negative")
+    return value
+
+
+def _divide(name: str, a: int, b: int) -> int:
+    if not b:
+        raise AvmError(f"{name} 0")
+    return a // b if name == "/" else a % b
+
+
+def _equal(machine: _Machine) -> bool:
+    b, a = machine.pop(), machine.pop()
+    if type(a) is not type(b):
+        raise AvmError("cannot compare ([]byte to uint64)")
+    return a == b
+
+
+def _not_equal(machine: _Machine) -> None:
+    machine.push(int(not _equal(machine)))
+
+
+def _len(machine: _Machine) -> None:
+    machine.push(len(machine.pop_bytes()))
+
+
+def _btoi(machine: _Machine) -> None:
+    value = machine.pop_bytes()
+    if len(value) > 8:
+        raise AvmError(f"btoi arg too long, got [{len(value)}]bytes")
+    machine.push(int.from_bytes(value, "big"))
+
+
+def _concat(machine: _Machine) -> None:
+    b, a = machine.pop_bytes(), machine.pop_bytes()
+    if len(a) + len(b) > MAX_BYTES_LENGTH:
+        raise AvmError(f"concat produced a too big ({len(a) + len(b)}) byte-array")
+    machine.push(a + b)
+
+
+def _substring(value: bytes, start: int, end: int) -> bytes:
+    if end < start:
+        raise AvmError("substring end before start")
+    if end > len(value):
+        raise AvmError("substring range beyond length of string")
+    return value[start:end]
+
+
+def _extract(value: bytes, start: int, length: int) -> bytes:
+    if start > len(value):
+        raise AvmError(f"extraction start {start} is beyond length: {len(value)}")
+    if start + length > len(value):
+        raise AvmError(
+            f"extraction end {start + length} is beyond length: {len(value)}"
+        )
+    return value[start : start + length]
+
+
+def _substring3(machine: _Machine) -> None:
+    end, start = machine.pop_int(), machine.pop_int()
+    machine.push(_substring(machine.pop_bytes(), start, end))
+
+
+def _extract_immediate(machine: _Machine, start: int, length: int) -> None:
+    value = machine.pop_bytes()
+    # A zero length immediate extracts up to the end
+    if not length:
+        length = max(len(value) - start, 0)
+    machine.push(_extract(value, start, length))
+
+
+def _extract3(machine: _Machine) -> None:
+    length, start = machine.pop_int(), machine.pop_int()
+    machine.push(_extract(machine.pop_bytes(), start, length))
+
+
+def _extract_uint(size: int) -> Callable[[_Machine], None]:
+    def handler(machine: _Machine) -> None:
+        start = machine.pop_int()
+        value = machine.pop_bytes()
+        machine.push(int.from_bytes(_extract(value, start, size), "big"))
+
+    return handler
+
+
+def _replace(value: bytes, start: int, replacement: bytes) -> bytes:
+    if start + len(replacement) > len(value):
+        raise AvmError(
+            f"replacement end {start + len(replacement)} beyond original length: "
+            f"{len(value)}"
+        )
+    return value[:start] + replacement + value[start + len(replacement) :]
+
+
+def _replace2(machine: _Machine, start: int) -> None:
+    replacement = machine.pop_bytes()
+    machine.push(_replace(machine.pop_bytes(), start, replacement))
+
+
+def _replace3(machine: _Machine) -> None:
+    replacement, start = machine.pop_bytes(), machine.pop_int()
+    machine.push(_replace(machine.pop_bytes(), start, replacement))
+
+
+def _assert(machine: _Machine) -> None:
+    if not machine.pop_int():
+        raise AvmError(f"assert failed pc={machine.pc}")
+
+
+def _err(_machine: _Machine) -> None:
+    raise AvmError("err opcode executed")
+
+
+def _bury(machine: _Machine, depth: int) -> None:
+    if not depth or depth >= len(machine.stack):
+        raise AvmError(f"bury {depth} beyond stack depth {len(machine.stack)}")
+    values = [machine.pop() for _ in range(depth + 1)]
+    values[-1] = values[0]
+    for value in reversed(values[1:]):
+        machine.push(value)
+
+
+def _cover(machine: _Machine, depth: int) -> None:
+    values = [machine.pop() for _ in range(depth + 1)][::-1]
+    for value in (values[-1], *values[:-1]):
+        machine.push(value)
+
+
+def _uncover(machine: _Machine, depth: int) -> None:
+    values = [machine.pop() for _ in range(depth + 1)][::-1]
+    for value in (*values[1:], values[0]):
+        machine.push(value)
+
+
+def _dig(machine: _Machine, depth: int) -> None:
+    if depth >= len(machine.stack):
+        raise AvmError(f"dig {depth} with stack size {len(machine.stack)}")
+    machine.push(machine.stack[-1 - depth])
+
+
+def _popn(machine: _Machine, count: int) -> None:
+    for _ in range(count):
+        machine.pop()
+
+
+def _dup2(machine: _Machine) -> None:
+    for _ in range(2):
+        _dig(machine, 1)
+
+
+def _dupn(machine: _Machine, count: int) -> None:
+    value = machine.pop()
+    for _ in range(count + 1):
+        machine.push(value)
+
+
+def _swap(machine: _Machine) -> None:
+    b, a = machine.pop(), machine.pop()
+    machine.push(b)
+    machine.push(a)
+
+
+def _select(machine: _Machine) -> None:
+    condition, b, a = machine.pop_int(), machine.pop(), machine.pop()
+    machine.push(b if condition else a)
+
+
+def _constant(table: str, index: int) -> Callable[[_Machine], None]:
+    def handler(machine: _Machine) -> None:
+        _push_constant(machine, table, index)
+
+    return handler
+
+
+def _push_constant(machine: _Machine, table: str, index: int) -> None:
+    constants = getattr(machine, table)
+    if index >= len(constants):
+        raise AvmError(f"{table} index {index} beyond {len(constants)} constants")
+    machine.push(constants[index])
+
+
+def _intcblock(machine: _Machine, values: list[int]) -> None:
+    machine.int_constants = values
+
+
+def _bytecblock(machine: _Machine, values: list[bytes]) -> None:
+    machine.byte_constants = values
+
+
+def _push_all(machine: _Machine, values: list[StackValue]) -> None:
+    for value in values:
+        machine.push(value)
+
+
+def _store(machine: _Machine, index: int) -> None:
+    machine.scratch[index] = machine.pop()
+
+
+def _global(machine: _Machine, field: str) -> None:
+    if field == "OpcodeBudget":
+        machine.push(machine.budget - machine.cost)
+    else:
+        machine.push(machine.context.global_field(field))
+
+
+def _branch(condition: Callable[[int], bool]) -> Callable[[_Machine, int], None]:
+    def handler(machine: _Machine, target: int) -> None:
+        if condition(machine.pop_int()):
+            machine.jump(target)
+
+    return handler
+
+
+def _callsub(machine: _Machine, target: int) -> None:
+    machine.frames.append([machine.next_pc, len(machine.stack), 0, 0])
+    machine.jump(target)
+
+
+def _proto(machine: _Machine, arguments: int, returns: int) -> None:
+    if not machine.frames:
+        raise AvmError("proto was executed without a callsub")
+    frame = machine.frames[-1]
+    if frame[1] < arguments:
+        raise AvmError(f"callsub to proto that requires {arguments} args")
+    frame[2:] = [arguments, returns]
+
+
+def _retsub(machine: _Machine) -> None:
+    if not machine.frames:
+        raise AvmError("retsub with empty callstack")
+    return_pc, height, arguments, returns = machine.frames.pop()
+    if arguments or returns:
+        if len(machine.stack) < height + returns:
+            raise AvmError(f"retsub executed with stack below frame ({returns})")
+        values = [machine.pop() for _ in range(returns)][::-1]
+        while len(machine.stack) > height - arguments:
+            machine.pop()
+        _push_all(machine, values)
+    machine.jump(return_pc)
+
+
+def _frame_index(machine: _Machine, offset: int) -> int:
+    if not machine.frames:
+        raise AvmError("frame_dig with empty callstack")
+    index = machine.frames[-1][1] + (offset - 256 if offset > 127 else offset)
+    if not 0 <= index < len(machine.stack):
+        raise AvmError(f"frame index {offset} out of the stack")
+    return index
+
+
+def _frame_dig(machine: _Machine, offset: int) -> None:
+    machine.push(machine.stack[_frame_index(machine, offset)])
+
+
+def _frame_bury(machine: _Machine, offset: int) -> None:
+    index = _frame_index(machine, offset)
+    value = machine.pop()
+    machine.stack[index] = value
+
+
+def _switch(machine: _Machine, targets: list[int]) -> None:
+    index = machine.pop_int()
+    if index < len(targets):
+        machine.jump(targets[index])
+
+
+def _match(machine: _Machine, targets: list[int]) -> None:
+    value = machine.pop()
+    cases = [machine.pop() for _ in targets][::-1]
+    for case, target in zip(cases, targets, strict=True):
+        if type(case) is type(value) and case == value:
+            machine.jump(target)
+            return
+
+
+def _asset_holding_get(machine: _Machine, field: str) -> None:
+    asset_id = machine.asset(machine.pop_int())
+    address = machine.account(machine.pop())
+    value = machine.context.asset_holding(address, asset_id, field)
+    machine.push(0 if value is None else value)
+    machine.push(int(value is not None))
+
+
+def _asset_params_get(machine: _Machine, field: str) -> None:
+    asset_id = machine.asset(machine.pop_int())
+    value = machine.context.asset_params(asset_id, field)
+    machine.push(0 if value is None else value)
+    machine.push(int(value is not None))
+
+
+def _acct_params_get(machine: _Machine, field: str) -> None:
+    address = machine.account(machine.pop())
+    machine.push(machine.context.account_params(address, field))
+    machine.push(int(machine.context.account_params(address, "AcctBalance") > 0))
+
+
+def _log(machine: _Machine) -> None:
+    value = machine.pop_bytes()
+    if len(machine.logs) >= MAX_LOGS:
+        raise AvmError(f"too many log calls in program. up to {MAX_LOGS} is allowed")
+    if sum(map(len, machine.logs)) + len(value) > MAX_LOG_SIZE:
+        raise AvmError(f"program logs too large. {MAX_LOG_SIZE} bytes is allowed")
+    machine.logs.append(value)
+
+
+def _itxn_begin(machine: _Machine) -> None:
+    if machine.inner is not None:
+        raise AvmError("itxn_begin without itxn_submit")
+    machine.inner = {}
+
+
+def _itxn_field(machine: _Machine, field: str) -> None:
+    if machine.inner is None:
+        raise AvmError("itxn_field without itxn_begin")
+    value = machine.pop()
+    if field in TXN_ARRAY_FIELDS:
+        machine.inner.setdefault(field, []).append(value)
+    else:
+        machine.inner[field] = value
+
+
+def _itxn_submit(machine: _Machine) -> None:
+    if machine.inner is None:
+        raise AvmError("itxn_submit without itxn_begin")
+    if machine.inner_count >= MAX_INNER_TRANSACTIONS:
+        raise AvmError(f"too many inner transactions {machine.inner_count + 1}")
+    fields, machine.inner = machine.inner, None
+    machine.inner_count += 1
+    machine.context.submit_inner(fields)
+
+
+def _gtxnsas(machine: _Machine, field: str) -> None:
+    index, group_index = machine.pop_int(), machine.pop_int()
+    machine.push(machine.txn_field(group_index, field, index))
+
+
+def _box_name(machine: _Machine) -> bytes:
+    name = machine.pop_bytes()
+    if not 1 <= len(name) <= MAX_BOX_NAME_LENGTH:
+        raise AvmError(f"box names must be 1..{MAX_BOX_NAME_LENGTH} bytes long")
+    return name
+
+
+def _box_create(machine: _Machine) -> None:
+    size = machine.pop_int()
+    name = _box_name(machine)
+    if size > MAX_BOX_SIZE:
+        raise AvmError(f"box size too large: {size}, max is {MAX_BOX_SIZE}")
+    value = machine.context.box(name)
+    if value is not None:
+        if len(value) != size:
+            raise AvmError(f"box size mismatch {len(value)} {size}")
+        machine.push(0)
+        return
+    machine.write_box(name, bytes(size))
+    machine.push(1)
+
+
+def _box_extract(machine: _Machine) -> None:
+    length, start = machine.pop_int(), machine.pop_int()
+    value = machine.existing_box(_box_name(machine))
+    if start + length > len(value):
+        raise AvmError("extraction out of bounds of the box")
+    machine.push(value[start : start + length])
+
+
+def _box_replace(machine: _Machine) -> None:
+    replacement, start = machine.pop_bytes(), machine.pop_int()
+    name = _box_name(machine)
+    value = machine.existing_box(name)
+    if start + len(replacement) > len(value):
+        raise AvmError("replacement out of bounds of the box")
+    machine.write_box(name, _replace(value, start, replacement))
+
+
+def _box_del(machine: _Machine) -> None:
+    name = _box_name(machine)
+    exists = machine.context.box(name) is not None
+    if exists:
+        machine.delete_box(name)
+    machine.push(int(exists))
+
+
+def _box_read(with_value: bool) -> Callable[[_Machine], None]:  # noqa: FBT001
+    def handler(machine: _Machine) -> None:
+        value = machine.context.box(_box_name(machine))
+        if with_value:
+            machine.push(b"" if value is None else value)
+        else:
+            machine.push(0 if value is None else len(value))
+        machine.push(int(value is not None))
+
+    return handler
+
+
+def _box_put(machine: _Machine) -> None:
+    value = machine.pop_bytes()
+    name = _box_name(machine)
+    existing = machine.context.box(name)
+    if existing is not None and len(existing) != len(value):
+        raise AvmError(f"attempt to box_put wrong size {len(existing)} != {len(value)}")
+    if len(value) > MAX_BOX_SIZE:
+        raise AvmError(f"box size too large: {len(value)}, max is {MAX_BOX_SIZE}")
+    machine.write_box(name, value)
+
+
+_HANDLERS: Final[dict[str, Callable[..., None]]] = {
+    "err": _err,
+    "+": _binary(lambda a, b: _checked("+", a + b)),
+    "-": _binary(lambda a, b: _checked("-", a - b)),
+    "/": _binary(lambda a, b: _divide("/", a, b)),
+    "*": _binary(lambda a, b: _checked("*", a * b)),
+    "<": _binary(lambda a, b: int(a < b)),
+    ">": _binary(lambda a, b: int(a > b)),
+    "<=": _binary(lambda a, b: int(a <= b)),
+    ">=": _binary(lambda a, b: int(a >= b)),
+    "&&": _binary(lambda a, b: int(bool(a and b))),
+    "||": _binary(lambda a, b: int(bool(a or b))),
+    "==": lambda m: m.push(int(_equal(m))),
+    "!=": _not_equal,
+    "!": lambda m: m.push(int(not m.pop_int())),
+    "len": _len,
+    "itob": lambda m: m.push(m.pop_int().to_bytes(8, "big")),
+    "btoi": _btoi,
+    "%": _binary(lambda a, b: _divide("%", a, b)),
+    "|": _binary(lambda a, b: a | b),
+    "&": _binary(lambda a, b: a & b),
+    "^": _binary(lambda a, b: a ^ b),
+    "~": lambda m: m.push(MAX_UINT64 ^ m.pop_int()),
+    "intcblock": _intcblock,
+    "intc": lambda m, i: _push_constant(m, "int_constants", i),
+    **{f"intc_{i}": _constant("int_constants", i) for i in range(4)},
+    "bytecblock": _bytecblock,
+    "bytec": lambda m, i: _push_constant(m, "byte_constants", i),
+    **{f"bytec_{i}": _constant("byte_constants", i) for i in range(4)},
+    "txn": lambda m, f: m.push(m.txn_field(m.group_index, f, None)),
+    "global": _global,
+    "gtxn": lambda m, t, f: m.push(m.txn_field(t, f, None)),
+    "load": lambda m, i: m.push(m.scratch[i]),
+    "store": _store,
+    "txna": lambda m, f, i: m.push(m.txn_field(m.group_index, f, i)),
+    "gtxna": lambda m, t, f, i: m.push(m.txn_field(t, f, i)),
+    "gtxns": lambda m, f: m.push(m.txn_field(m.pop_int(), f, None)),
+    "gtxnsa": lambda m, f, i: m.push(m.txn_field(m.pop_int(), f, i)),
+    "bnz": _branch(bool),
+    "bz": _branch(lambda value: not value),
+    "b": lambda m, target: m.jump(target),
+    "return": lambda m: m.finish(m.pop_int() != 0),
+    "assert": _assert,
+    "bury": _bury,
+    "popn": _popn,
+    "dupn": _dupn,
+    "pop": lambda m: _popn(m, 1),
+    "dup": lambda m: _dupn(m, 1),
+    "dup2": _dup2,
+    "dig": _dig,
+    "swap": _swap,
+    "select": _select,
+    "cover": _cover,
+    "uncover": _uncover,
+    "concat": _concat,
+    "substring": lambda m, s, e: m.push(_substring(m.pop_bytes(), s, e)),
+    "substring3": _substring3,
+    "extract": _extract_immediate,
+    "extract3": _extract3,
+    "extract_uint16": _extract_uint(2),
+    "extract_uint32": _extract_uint(4),
+    "extract_uint64": _extract_uint(8),
+    "replace2": _replace2,
+    "replace3": _replace3,
+    "asset_holding_get": _asset_holding_get,
+    "asset_params_get": _asset_params_get,
+    "acct_params_get": _acct_params_get,
+    "pushbytes": lambda m, value: m.push(value),
+    "pushint": lambda m, value: m.push(value),
+    "pushbytess": _push_all,
+    "pushints": _push_all,
+    "callsub": _callsub,
+    "retsub": _retsub,
+    "proto": _proto,
+    "frame_dig": _frame_dig,
+    "frame_bury": _frame_bury,
+    "switch": _switch,
+    "match": _match,
+    "log": _log,
+    "itxn_begin": _itxn_begin,
+    "itxn_field": _itxn_field,
+    "itxn_submit": _itxn_submit,
+    "box_create": _box_create,
+    "box_extract": _box_extract,
+    "box_replace": _box_replace,
+    "box_del": _box_del,
+    "box_len": _box_read(with_value=False),
+    "box_get": _box_read(with_value=True),
+    "box_put": _box_put,
+    "txnas": lambda m, f: m.push(m.txn_field(m.group_index, f, m.pop_int())),
+    "gtxnas": lambda m, t, f: m.push(m.txn_field(t, f, m.pop_int())),
+    "gtxnsas": _gtxnsas,
+}
+
+
+def _uvarint(value: int) -> bytes:
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append(value & 0x7F | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def _read_uvarint(program: bytes, pc: int) -> tuple[int, int]:
+    """Returns the varuint at the PC and the PC after it."""
+    value = shift = 0
+    while True:
+        byte = program[pc]
+        pc += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pc
+        shift += 7
+
+
+def _length_prefixed(value: bytes) -> bytes:
+    return _uvarint(len(value)) + value
+
+
+def _read_immediate(program: bytes, pc: int, kind: str) -> tuple[Any, int]:
+    """Returns the immediate of the kind at the PC and the PC after it."""
+    if kind in (UINT8, INT8):
+        return program[pc], pc + 1
+    if kind in _FIELDS:
+        fields = _FIELDS[kind]
+        if program[pc] >= len(fields):
+            raise AvmError(f"invalid {kind} field {program[pc]}", pc - 1)
+        return fields[program[pc]], pc + 1
+    if kind == LABEL:
+        return int.from_bytes(program[pc : pc + 2], "big", signed=True), pc + 2
+    if kind == LABELS:
+        count = program[pc]
+        offsets = program[pc + 1 : pc + 1 + 2 * count]
+        if len(offsets) != 2 * count:
+            raise IndexError(pc)
+        return [
+            int.from_bytes(offsets[i : i + 2], "big", signed=True)
+            for i in range(0, len(offsets), 2)
+        ], pc + 1 + 2 * count
+    if kind == VARUINT:
+        return _read_uvarint(program, pc)
+    if kind == BYTES:
+        return _read_bytes(program, pc)
+    count, pc = _read_uvarint(program, pc)
+    values = []
+    for _ in range(count):
+        value, pc = (_read_uvarint if kind == VARUINTS else _read_bytes)(program, pc)
+        values.append(value)
+    return values, pc
+
+
+def _read_bytes(program: bytes, pc: int) -> tuple[bytes, int]:
+    length, pc = _read_uvarint(program, pc)
+    if pc + length > len(program):
+        raise IndexError(pc)
+    return program[pc : pc + length], pc + length
+
+
+def _as_list(value: int | list[int]) -> list[int]:
+    return value if isinstance(value, list) else [value]
+
+
+def _parse_int(value: str, number: int, low: int = 0, high: int = MAX_UINT64) -> int:
+    try:
+        parsed = int(value, 0)
+    except ValueError:
+        raise AssembleError(
+            f"{number + 1}: unable to parse {value!r} as integer"
+        ) from None
+    if not low <= parsed <= high:
+        raise AssembleError(f"{number + 1}: integer {value} out of range")
+    return parsed
+
+
+def _parse_bytes(value: str, number: int) -> bytes:
+    """Parses a byte constant: hex (`0x`), string (`"..."`) or `base64(...)`."""
+    if value.startswith("0x"):
+        try:
+            return bytes.fromhex(value[2:])
+        except ValueError:
+            raise AssembleError(f"{number + 1}: invalid hex constant {value}") from None
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return _parse_string(value[1:-1], number)
+    for prefix in ("base64(", "b64("):
+        if value.startswith(prefix) and value.endswith(")"):
+            return base64.b64decode(value[len(prefix) : -1])
+    raise AssembleError(f"{number + 1}: unable to parse {value!r} as bytes")
+
+
+def _parse_string(value: str, number: int) -> bytes:
+    parsed, index = bytearray(), 0
+    while index < len(value):
+        char = value[index]
+        index += 1
+        if char != "\\":
+            parsed += char.encode()
+        elif value[index : index + 1] == "x":
+            parsed.append(int(value[index + 1 : index + 3], 16))
+            index += 3
+        elif value[index : index + 1] in _STRING_ESCAPES:
+            parsed.append(_STRING_ESCAPES[value[index]])
+            index += 1
+        else:
+            raise AssembleError(f"{number + 1}: invalid escape in string {value!r}")
+    return bytes(parsed)
+
+
+def _field_index(kind: str, value: str, number: int) -> int:
+    fields = _FIELDS[kind]
+    if value in fields:
+        return fields.index(value)
+    if value.isdigit() and int(value) < len(fields):
+        return int(value)
+    raise AssembleError(f"{number + 1}: invalid {kind} field: {value}")
+
+
+def _avm_value(value: StackValue) -> dict[str, Any]:
+    """Simulate trace encoding of a stack value (zero values omitted, as in Algod)."""
+    if isinstance(value, bytes):
+        return (
+            {"type": 1, "bytes": base64.b64encode(value).decode()}
+            if value
+            else {"type": 1}
+        )
+    return {"type": 2, "uint": value} if value else {"type": 2}
+
+
+def _vlq_encode(*values: int) -> str:
+    """Base64 VLQ segment of the source map values."""
+    encoded = []
+    for value in values:
+        vlq = (-value << 1) | 1 if value < 0 else value << 1
+        while True:
+            digit, vlq = vlq & 0x1F, vlq >> 5
+            encoded.append(_BASE64_CHARS[digit | 0x20 if vlq else digit])
+            if not vlq:
+                break
+    return "".join(encoded)
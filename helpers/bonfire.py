@@ -3,9 +3,15 @@
 import json
 import os
 
-from algokit_utils import AlgorandClient, SigningAccount
+from algokit_utils import (
+    AlgoAmount,
+    AlgorandClient,
+    AppCallMethodCallParams,
+    SigningAccount,
+)
 from algosdk import abi
 from algosdk.atomic_transaction_composer import AtomicTransactionComposer
+from algosdk.constants import MIN_TXN_FEE
 
 ARC54_INTERFACE = {
     "name": "ARC54",
@@ -55,3 +61,17 @@ def arc54_asset_opt_in(
         foreign_assets=[asset_id],
     )
     atc.submit(algorand.client.algod)
+
+
+def arc54_asset_opt_in_params(
+    caller: SigningAccount, asset_id: int
+) -> AppCallMethodCallParams:
+    """Bonfire ASA opt-in call, to add to a group (extra fee for the inner opt-in)"""
+    return AppCallMethodCallParams(
+        sender=caller.address,
+        signer=caller.signer,
+        app_id=int(os.environ["BONFIRE_APP_ID"]),
+        method=iface.get_method_by_name("arc54_optIntoASA"),
+        args=[asset_id],
+        extra_fee=AlgoAmount(micro_algo=MIN_TXN_FEE),
+    )
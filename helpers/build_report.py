@@ -0,0 +1,209 @@
+# mypy: ignore-errors
+
+import base64
+import dataclasses
+import hashlib
+import json
+from collections.abc import Hashable, Mapping
+from pathlib import Path
+from typing import Any, Final, TypeVar
+
+# algosdk.constants.APP_PAGE_MAX_SIZE
+APP_PAGE_MAX_SIZE: Final[int] = 2048
+
+BUILD_REPORT_FILE: Final[str] = "build_report.json"
+
+# ARC-56 fields of the App interface (the others depend on the compilation)
+ARC56_INTERFACE_KEYS: Final[tuple[str, ...]] = (
+    "name",
+    "structs",
+    "methods",
+    "arcs",
+    "state",
+    "bareActions",
+    "events",
+    "templateVariables",
+)
+
+Variant = TypeVar("Variant", bound=Hashable)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BuildReport:
+    """
+    Built App programs size (bytes, template variables at their placeholder
+    values), extra program pages and static worst-case opcode cost of each ABI
+    method.
+    """
+
+    approval_bytes: int
+    clear_bytes: int
+    extra_pages: int
+    method_costs: dict[str, int]
+
+    @property
+    def program_bytes(self) -> int:
+        return self.approval_bytes + self.clear_bytes
+
+    def to_json(self) -> dict[str, Any]:
+        return dataclasses.asdict(self)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BuildBudget:
+    """Build limits (None for no limit); the opcode cost applies to each method"""
+
+    program_bytes: int | None = None
+    extra_pages: int | None = None
+    opcode_cost: int | None = None
+
+
+def extra_pages(program_bytes: int) -> int:
+    return max(0, (program_bytes - 1) // APP_PAGE_MAX_SIZE)
+
+
+def app_report(app_spec_path: str | Path) -> BuildReport | None:
+    """
+    Returns the report of an App built in the directory of its ARC-56 spec, None
+    if the spec has no bytecode. Method costs are estimated from the approval TEAL
+    (none if missing or not statically estimable, e.g. with loops).
+    """
+    from helpers.cost_estimator import CostEstimationError, CostEstimator
+
+    app_spec_path = Path(app_spec_path)
+    app_spec = json.loads(app_spec_path.read_text())
+    bytecode = app_spec.get("byteCode")
+    if not bytecode:
+        return None
+    approval_bytes = len(base64.b64decode(bytecode["approval"]))
+    clear_bytes = len(base64.b64decode(bytecode["clear"]))
+    approval_teal = app_spec_path.parent / f"{app_spec['name']}.approval.teal"
+    try:
+        costs = CostEstimator.from_file(approval_teal, _method_names(app_spec))
+        method_costs = {m.method: m.opcode_cost for m in costs.method_costs().values()}
+    except (OSError, CostEstimationError):
+        method_costs = {}
+    return BuildReport(
+        approval_bytes=approval_bytes,
+        clear_bytes=clear_bytes,
+        extra_pages=extra_pages(approval_bytes + clear_bytes),
+        method_costs=method_costs,
+    )
+
+
+def build_reports(output_dir: str | Path) -> dict[str, BuildReport]:
+    """Returns the reports of the Apps built in the directory, by App name."""
+    reports = {}
+    for app_spec_path in sorted(Path(output_dir).glob("*.arc56.json")):
+        report = app_report(app_spec_path)
+        if report is not None:
+            reports[app_spec_path.name.removesuffix(".arc56.json")] = report
+    return reports
+
+
+def save_build_reports(
+    output_dir: str | Path, reports: Mapping[str, BuildReport]
+) -> None:
+    (Path(output_dir) / BUILD_REPORT_FILE).write_text(
+        json.dumps({name: r.to_json() for name, r in reports.items()}, indent=2) + "\n"
+    )
+
+
+def diff_reports(
+    previous: Mapping[str, BuildReport], current: Mapping[str, BuildReport]
+) -> list[str]:
+    """Returns the changes from the previous to the current reports, one per line."""
+    lines = [f"{name}: removed" for name in previous if name not in current]
+    for name, report in current.items():
+        before = previous.get(name)
+        if before is None:
+            lines.append(
+                f"{name}: new, {report.program_bytes} program bytes, "
+                f"{report.extra_pages} extra pages"
+            )
+            continue
+        metrics = {
+            "approval bytes": (before.approval_bytes, report.approval_bytes),
+            "clear bytes": (before.clear_bytes, report.clear_bytes),
+            "extra pages": (before.extra_pages, report.extra_pages),
+        }
+        for method in {**before.method_costs, **report.method_costs}:
+            metrics[f"{method} opcode cost"] = (
+                before.method_costs.get(method),
+                report.method_costs.get(method),
+            )
+        lines.extend(
+            f"{name} {metric}: {_diff(old, new)}"
+            for metric, (old, new) in metrics.items()
+            if old != new
+        )
+    return lines
+
+
+def check_budget(reports: Mapping[str, BuildReport], budget: BuildBudget) -> list[str]:
+    """Returns the budget violations of the reports."""
+    violations = []
+    for name, report in reports.items():
+        if budget.program_bytes is not None and (
+            report.program_bytes > budget.program_bytes
+        ):
+            violations.append(
+                f"{name} program bytes: {report.program_bytes} > "
+                f"{budget.program_bytes}"
+            )
+        if budget.extra_pages is not None and report.extra_pages > budget.extra_pages:
+            violations.append(
+                f"{name} extra pages: {report.extra_pages} > {budget.extra_pages}"
+            )
+        if budget.opcode_cost is not None:
+            violations.extend(
+                f"{name} {method} opcode cost: {cost} > {budget.opcode_cost}"
+                for method, cost in report.method_costs.items()
+                if cost > budget.opcode_cost
+            )
+    return violations
+
+
+def app_interfaces(output_dir: str | Path) -> dict[str, dict[str, object]]:
+    """Returns the ARC-56 interfaces of the Apps built in the directory, by App name."""
+    interfaces = {}
+    for app_spec_path in sorted(Path(output_dir).glob("*.arc56.json")):
+        app_spec = json.loads(app_spec_path.read_text())
+        interfaces[app_spec_path.name.removesuffix(".arc56.json")] = {
+            key: app_spec.get(key) for key in ARC56_INTERFACE_KEYS
+        }
+    return interfaces
+
+
+def cheapest_variant(variants: Mapping[Variant, Mapping[str, BuildReport]]) -> Variant:
+    """
+    Returns the build variant with the lowest total (statically estimated) method
+    cost, then the smallest programs (the first one on a tie).
+    """
+    return min(
+        variants,
+        key=lambda variant: (
+            sum(sum(r.method_costs.values()) for r in variants[variant].values()),
+            sum(r.program_bytes for r in variants[variant].values()),
+        ),
+    )
+
+
+def _method_names(app_spec: Mapping[str, Any]) -> dict[bytes, str]:
+    names = {}
+    for method in app_spec.get("methods", []):
+        signature = (
+            f"{method['name']}({','.join(a['type'] for a in method['args'])})"
+            f"{method['returns']['type']}"
+        )
+        selector = hashlib.new("sha512_256", signature.encode()).digest()[:4]
+        names[selector] = method["name"]
+    return names
+
+
+def _diff(old: int | None, new: int | None) -> str:
+    if old is None:
+        return f"new, {new}"
+    if new is None:
+        return f"removed, was {old}"
+    return f"{old} -> {new} ({new - old:+d})"
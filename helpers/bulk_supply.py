@@ -0,0 +1,179 @@
+# mypy: ignore-errors
+
+import dataclasses
+from collections.abc import Iterable, Mapping
+from types import ModuleType
+from typing import TYPE_CHECKING, Final
+
+from algosdk.constants import ZERO_ADDRESS
+
+from helpers.asset_params import AssetParams
+from helpers.circulating_supply import LABEL_FIELDS, RESERVE
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyConfig,
+)
+
+# Breakdown columns, in the getter subtraction order
+LABELS: Final[tuple[str, ...]] = (RESERVE, *LABEL_FIELDS)
+
+_ADDRESS_DTYPE: Final[str] = "U58"
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclasses.dataclass(frozen=True)
+class HoldingsSnapshot:
+    """ASA holdings of opted-in accounts, as (asset, address, balance) columns"""
+
+    asset_ids: "np.ndarray"
+    addresses: "np.ndarray"
+    balances: "np.ndarray"
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple[int, str, int]]) -> "HoldingsSnapshot":
+        np = _numpy()
+        asset_ids, addresses, balances = [], [], []
+        for asset_id, address, balance in rows:
+            asset_ids.append(asset_id)
+            addresses.append(address)
+            balances.append(balance)
+        return cls(
+            asset_ids=np.asarray(asset_ids, dtype=np.uint64),
+            addresses=np.asarray(addresses, dtype=_ADDRESS_DTYPE),
+            balances=np.asarray(balances, dtype=np.uint64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.asset_ids)
+
+
+@dataclasses.dataclass(frozen=True)
+class BulkSupply:
+    """
+    Circulating supplies of many ASAs, with the non-circulating balances breakdown
+    (one column per label of `LABELS`). ASAs whose getter would fail on underflow
+    (e.g. an address set on many labels) are flagged and have zero supply.
+    """
+
+    asset_ids: "np.ndarray"
+    supplies: "np.ndarray"
+    breakdown: "np.ndarray"
+    underflow: "np.ndarray"
+
+    def to_dict(self) -> dict[int, int]:
+        """Returns the supplies by ASA, skipping the underflowing ones."""
+        valid = ~self.underflow
+        return dict(
+            zip(
+                self.asset_ids[valid].tolist(),
+                self.supplies[valid].tolist(),
+                strict=True,
+            )
+        )
+
+    def breakdown_of(self, asset_id: int) -> dict[str, int]:
+        i = int(_numpy().searchsorted(self.asset_ids, asset_id))
+        if i == len(self.asset_ids) or self.asset_ids[i] != asset_id:
+            raise KeyError(asset_id)
+        return dict(zip(LABELS, self.breakdown[i].tolist(), strict=True))
+
+
+def compute_bulk_supply(
+    holdings: HoldingsSnapshot,
+    configs: Mapping[int, CirculatingSupplyConfig],
+    params: Mapping[int, AssetParams | None],
+) -> BulkSupply:
+    """
+    Computes the circulating supply of every configured ASA from a holdings snapshot,
+    with vectorized joins. Same semantics of the ARC-62 getter: zero for deleted
+    ASAs (params None), zero balance for unset (Zero Address) or not opted-in
+    (missing from the snapshot) addresses.
+    """
+    np = _numpy()
+    asset_ids = np.asarray(sorted(configs), dtype=np.uint64)
+    missing = [a for a in configs if a not in params]
+    if missing:
+        raise LookupError(f"Missing ASA parameters for {missing}")
+
+    # Join targets: one row per set (ASA, label, address)
+    target_assets, target_labels, target_addresses = [], [], []
+    totals = np.zeros(len(asset_ids), dtype=np.uint64)
+    exists = np.zeros(len(asset_ids), dtype=bool)
+    for i, asset_id in enumerate(asset_ids.tolist()):
+        asset_params = params[asset_id]
+        if asset_params is None:
+            continue
+        totals[i] = asset_params.total
+        exists[i] = True
+        config = configs[asset_id]
+        addresses = (
+            asset_params.reserve,
+            *(getattr(config, f) for f in LABEL_FIELDS.values()),
+        )
+        for label, address in enumerate(addresses):
+            if address != ZERO_ADDRESS:
+                target_assets.append(i)
+                target_labels.append(label)
+                target_addresses.append(address)
+
+    breakdown = np.zeros((len(asset_ids), len(LABELS)), dtype=np.uint64)
+    if target_addresses:
+        target_assets = np.asarray(target_assets, dtype=np.int64)
+        target_labels = np.asarray(target_labels, dtype=np.int64)
+        vocabulary, target_address_ids = np.unique(
+            np.asarray(target_addresses, dtype=_ADDRESS_DTYPE), return_inverse=True
+        )
+        target_keys = target_assets * len(vocabulary) + target_address_ids
+
+        # Keep only the holdings of configured ASAs and target addresses
+        holding_assets = _lookup(asset_ids, holdings.asset_ids)
+        holding_address_ids = _lookup(vocabulary, holdings.addresses)
+        matched = (holding_assets >= 0) & (holding_address_ids >= 0)
+        holding_keys = (
+            holding_assets[matched] * len(vocabulary) + holding_address_ids[matched]
+        )
+        holding_balances = holdings.balances[matched]
+
+        order = np.argsort(holding_keys, kind="stable")
+        holding_keys, holding_balances = holding_keys[order], holding_balances[order]
+        found = _lookup(holding_keys, target_keys)
+        opted_in = found >= 0
+        breakdown[target_assets[opted_in], target_labels[opted_in]] = holding_balances[
+            found[opted_in]
+        ]
+
+    # Subtract label by label, as the getter does, detecting the underflows
+    supplies = totals.copy()
+    underflow = np.zeros(len(asset_ids), dtype=bool)
+    for column in breakdown.T:
+        underflow |= column > supplies
+        supplies = np.where(underflow, 0, supplies - np.minimum(column, supplies))
+    supplies[~exists] = 0
+    return BulkSupply(
+        asset_ids=asset_ids,
+        supplies=supplies.astype(np.uint64),
+        breakdown=breakdown,
+        underflow=underflow,
+    )
+
+
+def _lookup(sorted_values: "np.ndarray", values: "np.ndarray") -> "np.ndarray":
+    """Returns the positions of the values in the sorted array (-1 if missing)."""
+    np = _numpy()
+    if not len(sorted_values):
+        return np.full(len(values), -1, dtype=np.int64)
+    positions = np.searchsorted(sorted_values, values)
+    clipped = np.minimum(positions, len(sorted_values) - 1)
+    return np.where(sorted_values[clipped] == values, clipped, -1).astype(np.int64)
+
+
+def _numpy() -> ModuleType:
+    """Imports numpy on first use, as it is a dev dependency only."""
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "The bulk supply helper requires numpy (poetry install --with dev)"
+        ) from e
+    return numpy
@@ -0,0 +1,203 @@
+# mypy: ignore-errors
+
+from collections.abc import Callable, Iterable, Mapping
+from typing import Final
+
+from algokit_utils import BoxReference, CommonAppCallParams
+from algosdk.constants import ZERO_ADDRESS
+from algosdk.error import AlgodHTTPError
+
+from helpers.asset_params import AssetParams, AssetParamsCache
+from smart_contracts import errors as err
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    Arc62GetCirculatingSupplyArgs,
+    CirculatingSupplyClient,
+    CirculatingSupplyComposer,
+    CirculatingSupplyConfig,
+)
+from smart_contracts.circulating_supply import config as cfg
+
+RESERVE: Final[str] = "reserve"
+
+# Non-circulating supply labels, in the CirculatingSupplyConfig field order
+LABEL_FIELDS: Final[dict[str, str]] = {
+    cfg.BURNED: "burned_addr",
+    cfg.CUSTOM_1: "custom_1_addr",
+    cfg.CUSTOM_2: "custom_2_addr",
+    cfg.CUSTOM_3: "custom_3_addr",
+    cfg.CUSTOM_4: "custom_4_addr",
+}
+
+# AVM foreign accounts limit per App Call (the getter also references ASA and box)
+MAX_ACCOUNT_REFERENCES: Final[int] = 4
+
+
+def empty_config() -> CirculatingSupplyConfig:
+    """Returns the configuration set by `init_config`."""
+    return CirculatingSupplyConfig(*(ZERO_ADDRESS for _ in LABEL_FIELDS))
+
+
+def non_circulating_addresses(
+    params: AssetParams, config: CirculatingSupplyConfig
+) -> dict[str, str]:
+    """Returns the non-circulating addresses by label (reserve included), skipping
+    the unset ones (Zero Address)."""
+    addresses = {RESERVE: params.reserve}
+    for label, field in LABEL_FIELDS.items():
+        addresses[label] = getattr(config, field)
+    return {label: addr for label, addr in addresses.items() if addr != ZERO_ADDRESS}
+
+
+def non_circulating_balances(
+    params: AssetParams,
+    config: CirculatingSupplyConfig,
+    balances: Mapping[str, int],
+) -> dict[str, int]:
+    """
+    Returns the non-circulating balances by label. `balances` holds the ASA balances
+    of opted-in accounts: missing accounts are not opted-in and count as zero.
+    """
+    return {
+        label: balances.get(addr, 0)
+        for label, addr in non_circulating_addresses(params, config).items()
+    }
+
+
+def compute_circulating_supply(
+    params: AssetParams | None,
+    config: CirculatingSupplyConfig,
+    balances: Mapping[str, int],
+) -> int:
+    """
+    Computes the ASA circulating supply with the same semantics of the ARC-62 getter:
+    zero for deleted ASAs, zero balance for unset or not opted-in addresses.
+    """
+    if params is None:
+        return 0
+    supply = params.total - sum(
+        non_circulating_balances(params, config, balances).values()
+    )
+    if supply < 0:
+        # The getter fails on the same underflow (e.g. an address set on many labels)
+        raise ArithmeticError(f"Circulating supply underflow for ASA {params.asset_id}")
+    return supply
+
+
+def getter_resources(
+    app_id: int,
+    asset_id: int,
+    params: AssetParams | None,
+    config: CirculatingSupplyConfig,
+) -> list[CommonAppCallParams]:
+    """
+    Returns the foreign references required by `arc62_get_circulating_supply`. The
+    first item is for the getter call; the others (if any) are for `extra_resources`
+    calls in the same group, since the non-circulating accounts may exceed the
+    account references limit of a single App Call. Each call references the ASA
+    too: a shared holding is only available if the account and the ASA are
+    referenced by the same transaction.
+    """
+    accounts = (
+        list(dict.fromkeys(non_circulating_addresses(params, config).values()))
+        if params is not None
+        else []
+    )
+    resources = [
+        CommonAppCallParams(
+            asset_references=[asset_id],
+            box_references=[
+                BoxReference(app_id=app_id, name=config_box_name(asset_id))
+            ],
+            account_references=accounts[:MAX_ACCOUNT_REFERENCES],
+        )
+    ]
+    for i in range(MAX_ACCOUNT_REFERENCES, len(accounts), MAX_ACCOUNT_REFERENCES):
+        resources.append(
+            CommonAppCallParams(
+                asset_references=[asset_id],
+                account_references=accounts[i : i + MAX_ACCOUNT_REFERENCES],
+            )
+        )
+    return resources
+
+
+def config_box_name(asset_id: int) -> bytes:
+    """Returns the name of the ASA config box (8-byte big-endian ASA ID)."""
+    return asset_id.to_bytes(8, "big")
+
+
+class CirculatingSupplyReader:
+    """
+    Off-chain ARC-62 circulating supply reader: it reads the App config box, the ASA
+    parameters (from the shared cache) and the non-circulating balances from Algod,
+    with no App Call.
+
+    An optional `might_have_config` filter (e.g. `ConfiguredAssetIndex`) answers
+    locally for the ASAs that are certainly not configured.
+    """
+
+    def __init__(
+        self,
+        client: CirculatingSupplyClient,
+        *,
+        asset_params: AssetParamsCache | None = None,
+        might_have_config: Callable[[int], bool] | None = None,
+    ) -> None:
+        self.client = client
+        self.asset_params = asset_params or AssetParamsCache.from_algorand(
+            client.algorand
+        )
+        self.might_have_config = might_have_config
+
+    def get_config(self, asset_id: int) -> CirculatingSupplyConfig | None:
+        if self.might_have_config is not None and not self.might_have_config(asset_id):
+            return None
+        try:
+            return self.client.state.box.circulating_supply.get_value(asset_id)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def get_balances(self, asset_id: int, addresses: Iterable[str]) -> dict[str, int]:
+        """Returns the ASA balances of the opted-in addresses."""
+        algod = self.client.algorand.client.algod
+        balances = {}
+        for address in dict.fromkeys(addresses):
+            try:
+                holding = algod.account_asset_info(address, asset_id)
+            except AlgodHTTPError as e:
+                if e.code == 404:  # Not opted-in
+                    continue
+                raise
+            balances[address] = holding["asset-holding"]["amount"]
+        return balances
+
+    def get_circulating_supply(self, asset_id: int) -> int:
+        config = self.get_config(asset_id)
+        if config is None:
+            raise LookupError(err.CONFIG_NOT_EXISTS)
+        params = self.asset_params.get(asset_id)
+        if params is None:
+            return 0
+        addresses = non_circulating_addresses(params, config).values()
+        return compute_circulating_supply(
+            params, config, self.get_balances(asset_id, addresses)
+        )
+
+    def new_getter_group(self, asset_id: int) -> CirculatingSupplyComposer:
+        """
+        Returns a group calling the ARC-62 getter with its foreign references already
+        populated from the cached ASA parameters (no resource population simulate).
+        """
+        config = self.get_config(asset_id)
+        if config is None:
+            raise LookupError(err.CONFIG_NOT_EXISTS)
+        params = self.asset_params.get(asset_id)
+        group = self.client.new_group()
+        getter, *extra = getter_resources(self.client.app_id, asset_id, params, config)
+        for resources in extra:
+            group.extra_resources(params=resources)
+        return group.arc62_get_circulating_supply(
+            args=Arc62GetCirculatingSupplyArgs(asset_id=asset_id), params=getter
+        )
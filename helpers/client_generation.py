@@ -0,0 +1,60 @@
+# mypy: ignore-errors
+
+import re
+from pathlib import Path
+from typing import Final
+
+_EAGER_APP_SPEC: Final[str] = (
+    "APP_SPEC = algokit_utils.Arc56Contract.from_json(_APP_SPEC_JSON)\n"
+)
+_LAZY_APP_SPEC: Final[str] = '''@functools.cache
+def _app_spec() -> algokit_utils.Arc56Contract:
+    """ARC-56 spec, parsed on first use once per process"""
+    return algokit_utils.Arc56Contract.from_json(_APP_SPEC_JSON)
+
+def __getattr__(name: str) -> object:
+    if name == "APP_SPEC":
+        return _app_spec()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+'''
+_LAZY_MARKER: Final[str] = "def _app_spec() -> algokit_utils.Arc56Contract:"
+
+# Dataclasses without base class: args, structs and their decoded values
+_DATACLASS: Final = re.compile(r"^@dataclasses\.dataclass\((.*)\)\n(class \w+:)", re.M)
+
+
+class ClientGenerationError(Exception):
+    """The generated client does not have the expected layout"""
+
+
+def make_client_lazy(source: str) -> str:
+    """
+    Post-processes a Python client generated by `algokit generate client`: the
+    module-level `APP_SPEC` is parsed on first use (memoized once per process) and
+    the dataclasses without base class get `__slots__`. Idempotent.
+    """
+    if _LAZY_MARKER in source:
+        return source
+    if source.count(_EAGER_APP_SPEC) != 1 or "\nimport dataclasses\n" not in source:
+        raise ClientGenerationError("Unexpected generated client layout")
+    source = source.replace(
+        "\nimport dataclasses\n", "\nimport dataclasses\nimport functools\n", 1
+    )
+    source = source.replace(_EAGER_APP_SPEC, _LAZY_APP_SPEC)
+    source = re.sub(r"\bapp_spec=APP_SPEC\b", "app_spec=_app_spec()", source)
+    # Any other global use of APP_SPEC would not go through the module __getattr__
+    if len(re.findall(r"\bAPP_SPEC\b", source)) != 1:
+        raise ClientGenerationError("Unexpected use of APP_SPEC in generated client")
+    return _DATACLASS.sub(_add_slots, source)
+
+
+def make_client_file_lazy(path: str | Path) -> None:
+    path = Path(path)
+    path.write_text(make_client_lazy(path.read_text()))
+
+
+def _add_slots(match: re.Match) -> str:
+    options, class_line = match.groups()
+    if "slots=" not in options:
+        options = f"{options}, slots=True" if options else "slots=True"
+    return f"@dataclasses.dataclass({options})\n{class_line}"
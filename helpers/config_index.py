@@ -0,0 +1,234 @@
+# mypy: ignore-errors
+
+import hashlib
+import math
+import struct
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from helpers.app_calls import DELETE_CONFIG, INIT_CONFIG, decode_config_updates
+from helpers.circulating_supply import config_box_name
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyClient,
+)
+
+DEFAULT_CAPACITY: Final[int] = 100_000
+DEFAULT_FALSE_POSITIVE_RATE: Final[float] = 0.001
+
+# Each new layer doubles the capacity and halves the false positive rate, so that
+# the overall rate stays below the sum of the geometric series of the layer rates
+GROWTH_FACTOR: Final[int] = 2
+TIGHTENING_RATIO: Final[float] = 0.5
+
+# Serialized header: capacity, false positive rate, layers count
+_HEADER: Final = struct.Struct(">QdQ")
+# Serialized layer header: bits count, hashes count, items count
+_LAYER_HEADER: Final = struct.Struct(">QQQ")
+
+
+class _BloomLayer:
+    """Fixed-size Bloom filter, with double hashing"""
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        bits = math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2)
+        self.bits = max(8, bits)
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.count = 0
+        self.array = bytearray((self.bits + 7) // 8)
+
+    def __contains__(self, hashes: tuple[int, int]) -> bool:
+        return all(self.array[i >> 3] & (1 << (i & 7)) for i in self._positions(hashes))
+
+    def add(self, hashes: tuple[int, int]) -> None:
+        for i in self._positions(hashes):
+            self.array[i >> 3] |= 1 << (i & 7)
+        self.count += 1
+
+    @property
+    def false_positive_rate(self) -> float:
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def _positions(self, hashes: tuple[int, int]) -> list[int]:
+        h1, h2 = hashes
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+
+class BloomFilter:
+    """
+    Scalable Bloom filter of byte strings, with double hashing on a single BLAKE2b
+    digest.
+
+    The keys are not stored, so a full filter cannot be rebuilt larger: once the
+    items count passes the capacity, a new layer of `GROWTH_FACTOR` times the
+    capacity is added, and new items go there. Layer false positive rates shrink by
+    `TIGHTENING_RATIO`, so the overall rate stays within `false_positive_rate`.
+    """
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+    ) -> None:
+        if capacity <= 0 or not 0 < false_positive_rate < 1:
+            raise ValueError("Invalid Bloom filter capacity or false positive rate")
+        self.capacity = capacity
+        self.target_false_positive_rate = false_positive_rate
+        self._layers = [self._new_layer(0)]
+
+    def __len__(self) -> int:
+        """Number of added items (duplicates included)."""
+        return self.count
+
+    def __contains__(self, key: bytes) -> bool:
+        hashes = _hashes(key)
+        return any(hashes in layer for layer in self._layers)
+
+    @property
+    def count(self) -> int:
+        return sum(layer.count for layer in self._layers)
+
+    @property
+    def layers(self) -> int:
+        return len(self._layers)
+
+    def add(self, key: bytes) -> None:
+        if self.count >= self._layer_capacity(len(self._layers)):
+            self._layers.append(self._new_layer(len(self._layers)))
+        self._layers[-1].add(_hashes(key))
+
+    @property
+    def false_positive_rate(self) -> float:
+        """Expected false positive rate with the current number of items."""
+        return 1 - math.prod(1 - layer.false_positive_rate for layer in self._layers)
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            self.capacity, self.target_false_positive_rate, len(self._layers)
+        )
+        return header + b"".join(
+            _LAYER_HEADER.pack(layer.bits, layer.hashes, layer.count)
+            + bytes(layer.array)
+            for layer in self._layers
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        bloom = cls.__new__(cls)
+        bloom.capacity, bloom.target_false_positive_rate, layers = _HEADER.unpack_from(
+            data
+        )
+        bloom._layers = []
+        pos = _HEADER.size
+        for _ in range(layers):
+            layer = _BloomLayer.__new__(_BloomLayer)
+            layer.bits, layer.hashes, layer.count = _LAYER_HEADER.unpack_from(data, pos)
+            pos += _LAYER_HEADER.size
+            size = (layer.bits + 7) // 8
+            layer.array = bytearray(data[pos : pos + size])
+            pos += size
+            if len(layer.array) != size:
+                raise ValueError("Corrupted Bloom filter")
+            bloom._layers.append(layer)
+        if not bloom._layers or pos != len(data):
+            raise ValueError("Corrupted Bloom filter")
+        return bloom
+
+    def _layer_capacity(self, layers: int) -> int:
+        """Items count that the first `layers` layers can hold."""
+        return self.capacity * (GROWTH_FACTOR**layers - 1) // (GROWTH_FACTOR - 1)
+
+    def _new_layer(self, i: int) -> _BloomLayer:
+        return _BloomLayer(
+            self.capacity * GROWTH_FACTOR**i,
+            self.target_false_positive_rate
+            * (1 - TIGHTENING_RATIO)
+            * TIGHTENING_RATIO**i,
+        )
+
+
+def _hashes(key: bytes) -> tuple[int, int]:
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return (
+        int.from_bytes(digest[:8], "little"),
+        int.from_bytes(digest[8:], "little") | 1,
+    )
+
+
+class ConfiguredAssetIndex:
+    """
+    Probabilistic index of the ASAs configured in the CirculatingSupply App, built
+    from the App box names and kept current from the confirmed App Calls.
+
+    A negative lookup is exact, as long as every App Call confirmed after the build
+    is observed: the ASA has no config and no request is needed. A positive lookup
+    may be false (rate bounded by the filter, which grows with the configs, and
+    increased by deleted configs, which a Bloom filter cannot remove): rebuild the
+    index when `stale` grows.
+    """
+
+    def __init__(self, app_id: int, bloom: BloomFilter | None = None) -> None:
+        self.app_id = app_id
+        self.bloom = bloom or BloomFilter()
+        self.stale = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_box_names(
+        cls,
+        app_id: int,
+        box_names: Iterable[bytes],
+        *,
+        false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE,
+        headroom: float = 2.0,
+    ) -> "ConfiguredAssetIndex":
+        """Builds the index sized for the boxes, with headroom for new configs."""
+        box_names = list(box_names)
+        bloom = BloomFilter(
+            max(DEFAULT_CAPACITY, math.ceil(len(box_names) * headroom)),
+            false_positive_rate,
+        )
+        for name in box_names:
+            bloom.add(name)
+        return cls(app_id, bloom)
+
+    @classmethod
+    def from_client(
+        cls, client: CirculatingSupplyClient, **kwargs: Any
+    ) -> "ConfiguredAssetIndex":
+        box_names = client.algorand.app.get_box_names(client.app_id)
+        return cls.from_box_names(
+            client.app_id, (b.name_raw for b in box_names), **kwargs
+        )
+
+    def might_have_config(self, asset_id: int) -> bool:
+        """False if the ASA is certainly not configured."""
+        return config_box_name(asset_id) in self.bloom
+
+    def add(self, asset_id: int) -> None:
+        with self._lock:
+            self.bloom.add(config_box_name(asset_id))
+
+    def observe_transaction(self, txn: Mapping[str, Any]) -> None:
+        """Applies the config creations and deletions of a confirmed transaction."""
+        for update in decode_config_updates(txn, self.app_id):
+            if update.method == INIT_CONFIG:
+                self.add(update.asset_id)
+            elif update.method == DELETE_CONFIG:
+                with self._lock:
+                    self.stale += 1
+
+    def save(self, path: str | Path) -> None:
+        Path(path).write_bytes(
+            self.app_id.to_bytes(8, "big")
+            + self.stale.to_bytes(8, "big")
+            + self.bloom.to_bytes()
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ConfiguredAssetIndex":
+        data = Path(path).read_bytes()
+        index = cls(int.from_bytes(data[:8], "big"), BloomFilter.from_bytes(data[16:]))
+        index.stale = int.from_bytes(data[8:16], "big")
+        return index
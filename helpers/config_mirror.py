@@ -0,0 +1,212 @@
+# mypy: ignore-errors
+
+import dataclasses
+import logging
+import sqlite3
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from algosdk.v2client.indexer import IndexerClient
+
+from helpers.app_calls import ConfigUpdate, apply_config_update, decode_config_updates
+from helpers.circulating_supply import LABEL_FIELDS
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyClient,
+    CirculatingSupplyConfig,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEXER_PAGE_LIMIT: Final[int] = 1000
+
+_FIELDS: Final[tuple[str, ...]] = tuple(LABEL_FIELDS.values())
+
+_SCHEMA: Final[str] = f"""
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS configs (
+    asset_id INTEGER PRIMARY KEY,
+    {", ".join(f"{field} TEXT NOT NULL" for field in _FIELDS)},
+    last_round INTEGER NOT NULL
+);
+"""
+
+
+class ConfigMirror:
+    """
+    Persistent local mirror (SQLite) of the CirculatingSupply App configs, as
+    `asset_id -> (CirculatingSupplyConfig, last_round)`.
+
+    The mirror is initialized once from the App boxes, then kept current by applying
+    the confirmed App Calls after its last synced round.
+    """
+
+    def __init__(self, path: str | Path, app_id: int) -> None:
+        self.app_id = app_id
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        stored_app_id = self._get_meta("app_id")
+        if stored_app_id is None:
+            self._set_meta("app_id", app_id)
+            self._db.commit()
+        elif stored_app_id != app_id:
+            raise ValueError(
+                f"Mirror at {path} belongs to App {stored_app_id}, not {app_id}"
+            )
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "ConfigMirror":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def last_round(self) -> int:
+        """Last round the mirror is synced to (0 if never synced)."""
+        return self._get_meta("last_round") or 0
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM configs").fetchone()[0]
+
+    def __contains__(self, asset_id: int) -> bool:
+        row = self._db.execute(
+            "SELECT 1 FROM configs WHERE asset_id = ?", (asset_id,)
+        ).fetchone()
+        return row is not None
+
+    def get(self, asset_id: int) -> CirculatingSupplyConfig | None:
+        row = self._db.execute(
+            f"SELECT {', '.join(_FIELDS)} FROM configs WHERE asset_id = ?",
+            (asset_id,),
+        ).fetchone()
+        return CirculatingSupplyConfig(*row) if row is not None else None
+
+    def get_round(self, asset_id: int) -> int | None:
+        """Returns the round of the last update of the ASA config."""
+        row = self._db.execute(
+            "SELECT last_round FROM configs WHERE asset_id = ?", (asset_id,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def get_all(self) -> dict[int, CirculatingSupplyConfig]:
+        rows = self._db.execute(f"SELECT asset_id, {', '.join(_FIELDS)} FROM configs")
+        return {row[0]: CirculatingSupplyConfig(*row[1:]) for row in rows}
+
+    def reset(
+        self, configs: Mapping[int, CirculatingSupplyConfig], round_num: int
+    ) -> None:
+        """Replaces the whole mirror with the configs at the given round."""
+        with self._db:
+            self._db.execute("DELETE FROM configs")
+            self._db.executemany(
+                f"INSERT INTO configs VALUES ({', '.join('?' * (len(_FIELDS) + 2))})",
+                (
+                    (asset_id, *dataclasses.astuple(config), round_num)
+                    for asset_id, config in configs.items()
+                ),
+            )
+            self._set_meta("last_round", round_num)
+
+    def apply(self, updates: Iterable[ConfigUpdate], round_num: int) -> None:
+        """Applies the config updates confirmed in the given round, in order."""
+        if round_num < self.last_round:
+            raise ValueError(
+                f"Round {round_num} precedes the mirror round {self.last_round}"
+            )
+        with self._db:
+            for update in updates:
+                config = apply_config_update(self.get(update.asset_id), update)
+                if config is None:
+                    self._db.execute(
+                        "DELETE FROM configs WHERE asset_id = ?", (update.asset_id,)
+                    )
+                else:
+                    self._db.execute(
+                        f"INSERT OR REPLACE INTO configs VALUES "
+                        f"({', '.join('?' * (len(_FIELDS) + 2))})",
+                        (update.asset_id, *dataclasses.astuple(config), round_num),
+                    )
+            self._set_meta("last_round", round_num)
+
+    def apply_transactions(
+        self, txns: Iterable[Mapping[str, Any]], *, round_num: int | None = None
+    ) -> int:
+        """
+        Applies confirmed transactions (Indexer JSON or block format), in confirmation
+        order. Indexer transactions carry their `confirmed-round`, block transactions
+        require the block `round_num`. Returns the number of applied config updates.
+        """
+        count = 0
+        for txn in txns:
+            txn_round = txn.get("confirmed-round", round_num)
+            if txn_round is None:
+                raise ValueError("Transaction round is unknown")
+            updates = decode_config_updates(txn, self.app_id)
+            if updates:
+                self.apply(updates, txn_round)
+                count += len(updates)
+        return count
+
+    def sync_full(self, client: CirculatingSupplyClient) -> None:
+        """Initializes the mirror reading all the App config boxes."""
+        # Reading the round first: updates confirmed while reading the boxes are
+        # applied again by the next incremental sync, converging to the same state.
+        round_num = client.algorand.client.algod.status()["last-round"]
+        configs = client.state.box.circulating_supply.get_map()
+        self.reset(
+            {int(asset_id): config for asset_id, config in configs.items()}, round_num
+        )
+        logger.info(
+            f"Mirrored {len(configs)} configs of App {self.app_id} at round {round_num}"
+        )
+
+    def sync_incremental(self, indexer: IndexerClient) -> int:
+        """Applies the App Calls confirmed after the last synced round."""
+        count = 0
+        min_round = self.last_round + 1
+        next_page = None
+        current_round = None
+        while True:
+            response = indexer.search_transactions(
+                application_id=self.app_id,
+                min_round=min_round,
+                limit=INDEXER_PAGE_LIMIT,
+                next_page=next_page,
+            )
+            # Pin the sync target to the Indexer round of the first page
+            current_round = current_round or response["current-round"]
+            count += self.apply_transactions(response["transactions"])
+            next_page = response.get("next-token")
+            if not next_page or not response["transactions"]:
+                break
+        with self._db:
+            self._set_meta("last_round", max(self.last_round, current_round))
+        return count
+
+    def sync(
+        self, client: CirculatingSupplyClient, indexer: IndexerClient | None = None
+    ) -> None:
+        """Syncs the mirror: incrementally if already initialized and an Indexer is
+        available, otherwise with a full read of the App boxes."""
+        if self.last_round and indexer is not None:
+            count = self.sync_incremental(indexer)
+            logger.info(f"Applied {count} config updates up to round {self.last_round}")
+        else:
+            self.sync_full(client)
+
+    def _get_meta(self, key: str) -> int | None:
+        row = self._db.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def _set_meta(self, key: str, value: int) -> None:
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
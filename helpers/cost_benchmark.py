@@ -0,0 +1,134 @@
+# mypy: ignore-errors
+
+import base64
+import dataclasses
+import json
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from algosdk.v2client.models import SimulateTraceConfig
+
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyClient,
+    CirculatingSupplyComposer,
+)
+
+DEFAULT_THRESHOLD: Final[float] = 0.05
+
+EXEC_TRACE: Final = SimulateTraceConfig(
+    enable=True, stack_change=True, state_change=True
+)
+
+# Box opcodes pushing the read bytes on the stack
+BOX_EXTRACT: Final[int] = 0xBA
+BOX_GET: Final[int] = 0xBE
+_BOX_READS: Final[frozenset[int]] = frozenset({BOX_EXTRACT, BOX_GET})
+
+_BOX_STATE: Final[str] = "b"
+_WRITE: Final[str] = "w"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CallCost:
+    """
+    Cost of an App Call group: opcode budget consumed, box bytes read (by box_get
+    and box_extract) and written (whole box values, as in the state changes), App
+    Account MBR change and fees paid.
+    """
+
+    opcode_cost: int
+    box_read_bytes: int
+    box_write_bytes: int
+    mbr_delta: int
+    fees: int
+
+    def to_json(self) -> dict[str, int]:
+        return dataclasses.asdict(self)
+
+
+def trace_cost(
+    simulate_response: Mapping[str, Any], approval_program: bytes
+) -> tuple[int, int, int]:
+    """
+    Returns the opcode cost, box read bytes and box write bytes of a simulated
+    group, traced with `EXEC_TRACE`.
+    """
+    opcode_cost = box_read_bytes = box_write_bytes = 0
+    for group in simulate_response["txn-groups"]:
+        for txn_result in group["txn-results"]:
+            opcode_cost += txn_result.get("app-budget-consumed", 0)
+            # Inner transactions have no programs: only the App approval steps
+            trace = txn_result.get("exec-trace", {})
+            for step in trace.get("approval-program-trace", []):
+                if approval_program[step["pc"]] in _BOX_READS:
+                    box_read_bytes += sum(
+                        len(base64.b64decode(value.get("bytes", "")))
+                        for value in step.get("stack-additions", [])
+                    )
+                for change in step.get("state-changes", []):
+                    if (
+                        change.get("app-state-type") == _BOX_STATE
+                        and change.get("operation") == _WRITE
+                    ):
+                        box_write_bytes += len(
+                            base64.b64decode(change["new-value"].get("bytes", ""))
+                        )
+    return opcode_cost, box_read_bytes, box_write_bytes
+
+
+def measure_call(
+    client: CirculatingSupplyClient,
+    new_group: Callable[[], CirculatingSupplyComposer],
+) -> CallCost:
+    """
+    Measures a group of the App Calls: simulated with the execution trace, then
+    sent to measure the App Account MBR change and the fees.
+    """
+    algod = client.algorand.client.algod
+    approval_program = base64.b64decode(
+        algod.application_info(client.app_id)["params"]["approval-program"]
+    )
+    simulated = new_group().simulate(
+        allow_unnamed_resources=True, exec_trace_config=EXEC_TRACE
+    )
+    opcode_cost, box_read_bytes, box_write_bytes = trace_cost(
+        simulated.simulate_response, approval_program
+    )
+    min_balance = algod.account_info(client.app_address)["min-balance"]
+    sent = new_group().send()
+    return CallCost(
+        opcode_cost=opcode_cost,
+        box_read_bytes=box_read_bytes,
+        box_write_bytes=box_write_bytes,
+        mbr_delta=algod.account_info(client.app_address)["min-balance"] - min_balance,
+        fees=sum(c["txn"]["txn"].get("fee", 0) for c in sent.confirmations),
+    )
+
+
+def compare_costs(
+    baseline: Mapping[str, Mapping[str, int]],
+    costs: Mapping[str, CallCost],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[str]:
+    """Returns the cost regressions beyond the relative threshold of the baseline."""
+    regressions = []
+    for name, cost in costs.items():
+        for metric, value in cost.to_json().items():
+            expected = baseline.get(name, {}).get(metric)
+            if expected is not None and value > expected + abs(expected) * threshold:
+                regressions.append(f"{name} {metric}: {value} > {expected}")
+    return regressions
+
+
+def load_baseline(path: str | Path) -> dict[str, dict[str, int]]:
+    return json.loads(Path(path).read_text())
+
+
+def save_baseline(path: str | Path, costs: Mapping[str, CallCost]) -> None:
+    Path(path).write_text(
+        json.dumps(
+            {name: cost.to_json() for name, cost in sorted(costs.items())}, indent=2
+        )
+        + "\n"
+    )
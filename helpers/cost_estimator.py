@@ -0,0 +1,324 @@
+# mypy: ignore-errors
+
+import dataclasses
+import functools
+import math
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Final
+
+from algosdk.constants import MIN_TXN_FEE
+
+from helpers.cost_profiler import ARTIFACTS_DIR, method_names, opcode_cost
+
+APPROVAL_TEAL: Final[Path] = ARTIFACTS_DIR / "CirculatingSupply.approval.teal"
+
+# Opcode budget of an App Call (pooled across the App Calls of a group)
+APP_CALL_BUDGET: Final[int] = 700
+
+ENTRY: Final[str] = "main"
+
+# Resource accessing opcodes, by MethodCost usage field (an opcode accessing both an
+# account and an asset counts in both)
+RESOURCE_OPS: Final[dict[str, frozenset[str]]] = {
+    "account_ops": frozenset(
+        {"acct_params_get", "balance", "min_balance", "asset_holding_get"}
+    ),
+    "asset_ops": frozenset({"asset_params_get", "asset_holding_get"}),
+    "box_ops": frozenset(
+        {
+            "box_create",
+            "box_del",
+            "box_extract",
+            "box_get",
+            "box_len",
+            "box_put",
+            "box_replace",
+            "box_resize",
+            "box_splice",
+        }
+    ),
+    "inner_transactions": frozenset({"itxn_begin", "itxn_next"}),
+}
+
+_JUMPS: Final[frozenset[str]] = frozenset({"b", "bz", "bnz", "match", "switch"})
+_FALLTHROUGH: Final[frozenset[str]] = frozenset(
+    {"bz", "bnz", "match", "switch", "callsub"}
+)
+_EXITS: Final[frozenset[str]] = frozenset({"return", "retsub"})
+_REJECT: Final[str] = "err"
+_TERMINATORS: Final[frozenset[str]] = _JUMPS | _FALLTHROUGH | _EXITS | {_REJECT}
+
+
+class CostEstimationError(Exception):
+    """The TEAL program can not be statically estimated"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class MethodCost:
+    """
+    Worst-case opcode cost and resource usage of an ABI method, on the program
+    paths not rejecting with `err`. Each field is the maximum over the paths on
+    its own. The `*_ops` fields count the executed resource accessing opcodes,
+    not the distinct resources they reference (several opcodes may access the
+    same account, ASA or box).
+    """
+
+    method: str
+    opcode_cost: int
+    account_ops: int
+    asset_ops: int
+    box_ops: int
+    inner_transactions: int
+
+    @property
+    def app_calls(self) -> int:
+        """App Calls in the group to pool the opcode budget"""
+        return max(1, math.ceil(self.opcode_cost / APP_CALL_BUDGET))
+
+    def min_fee(self, min_txn_fee: int = MIN_TXN_FEE) -> int:
+        """Fee covering the App Calls and their inner transactions"""
+        return (self.app_calls + self.inner_transactions) * min_txn_fee
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class _Block:
+    label: str
+    ops: list[str]
+    successors: list[str]
+    rejects: bool
+
+    @property
+    def usage(self) -> tuple[int, ...]:
+        return (
+            sum(opcode_cost(op) for op in self.ops),
+            *(
+                sum(op.split(maxsplit=1)[0] in ops for op in self.ops)
+                for ops in RESOURCE_OPS.values()
+            ),
+        )
+
+
+class CostEstimator:
+    """
+    Static worst-case cost of the ABI methods of an approval program, from the
+    control-flow graph of its TEAL: the ARC-4 router `match` in the entry block
+    dispatches the method selectors to their routing blocks (methods named by
+    `method_names`, else by selector hex). Loops are not supported, subroutines
+    are inlined at their call sites.
+    """
+
+    def __init__(
+        self, teal: str, method_names: Mapping[bytes, str] | None = None
+    ) -> None:
+        self.method_names = method_names or {}
+        self.blocks = _parse_blocks(teal)
+        self._order = self._topological_order()
+        self._routes = self._method_routes()
+        self._worst: dict[str, tuple[int, ...] | None] = {}
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | Path = APPROVAL_TEAL,
+        method_names: Mapping[bytes, str] | None = None,
+    ) -> "CostEstimator":
+        return cls(Path(path).read_text(), method_names)
+
+    def method_cost(self, method: str) -> MethodCost:
+        if method not in self._routes:
+            raise CostEstimationError(f"Unknown ABI method: {method}")
+        router, route = self._routes[method]
+        usage = _add(self._worst_to(router), self._worst_from(route))
+        return MethodCost(method, *usage)
+
+    def method_costs(self) -> dict[str, MethodCost]:
+        return {method: self.method_cost(method) for method in self._routes}
+
+    def _method_routes(self) -> dict[str, tuple[str, str]]:
+        for label, block in self.blocks.items():
+            selectors, match = _router(block.ops)
+            if match is not None:
+                return {
+                    self.method_names.get(selector, selector.hex()): (label, route)
+                    for selector, route in zip(
+                        selectors, match.split()[1:], strict=True
+                    )
+                }
+        raise CostEstimationError("ARC-4 router not found")
+
+    def _worst_to(self, target: str) -> tuple[int, ...]:
+        """Worst-case usage from the entry block up to the target block included"""
+        worst = {ENTRY: self.blocks[ENTRY].usage}
+        for label in self._order:
+            if label not in worst:
+                continue
+            for successor in self.blocks[label].successors:
+                usage = _add(worst[label], self.blocks[successor].usage)
+                worst[successor] = _max(worst.get(successor), usage)
+        if target not in worst:
+            raise CostEstimationError(f"Unreachable block: {target}")
+        return worst[target]
+
+    def _worst_from(self, label: str) -> tuple[int, ...]:
+        """Worst-case usage from the block (included) to the program exit"""
+        worst = self._worst_path(label)
+        if worst is None:
+            raise CostEstimationError(f"Block always rejects: {label}")
+        return worst
+
+    def _worst_path(self, label: str) -> tuple[int, ...] | None:
+        """Worst-case usage from the block to the program exit, None if rejecting"""
+        if label not in self._worst:
+            block = self.blocks[label]
+            worst = None
+            if not block.rejects and not block.successors:
+                worst = block.usage
+            elif not block.rejects:
+                for successor in block.successors:
+                    usage = self._worst_path(successor)
+                    if usage is not None:
+                        worst = _max(worst, _add(block.usage, usage))
+            self._worst[label] = worst
+        return self._worst[label]
+
+    def _topological_order(self) -> list[str]:
+        order, visited = [], set()
+
+        def visit(label: str, visiting: frozenset[str]) -> None:
+            if label in visiting:
+                raise CostEstimationError(f"Unbounded loop at: {label}")
+            if label in visited:
+                return
+            for successor in self.blocks[label].successors:
+                visit(successor, visiting | {label})
+            visited.add(label)
+            order.append(label)
+
+        visit(ENTRY, frozenset())
+        return order[::-1]
+
+
+@functools.cache
+def method_costs(path: str | Path = APPROVAL_TEAL) -> dict[str, MethodCost]:
+    """Worst-case costs of the ABI methods of the (built) approval program."""
+    return CostEstimator.from_file(path, method_names()).method_costs()
+
+
+def _parse_blocks(teal: str) -> dict[str, _Block]:
+    """
+    Splits the TEAL ops into basic blocks, by label. A `callsub` is expanded into
+    the subroutine ops (inlined), the subroutine `retsub` going to the next op.
+    """
+    labelled = _labelled_ops(teal)
+    blocks = {}
+    for index, (label, ops) in enumerate(labelled):
+        next_label = labelled[index + 1][0] if index + 1 < len(labelled) else None
+        blocks.update(_split_block(label, ops, next_label))
+    for block in blocks.values():
+        for successor in block.successors:
+            if successor.split(">", 1)[0] not in blocks:
+                raise CostEstimationError(f"Unknown label: {successor}")
+    return _inline_subroutines(blocks)
+
+
+def _labelled_ops(teal: str) -> list[tuple[str, list[str]]]:
+    labelled = [(ENTRY, [])]
+    for line in teal.splitlines():
+        line = _strip_comment(line).strip()
+        if not line or line.startswith("#pragma"):
+            continue
+        if line.endswith(":"):
+            label = line[:-1]
+            if label == ENTRY and not labelled[0][1]:
+                continue
+            labelled.append((label, []))
+        else:
+            labelled[-1][1].append(line)
+    return labelled
+
+
+def _split_block(
+    label: str, ops: list[str], next_label: str | None
+) -> dict[str, _Block]:
+    """Splits the ops after each branch into blocks named `label#n`."""
+    blocks, start, name = {}, 0, label
+    for index, op in enumerate(ops):
+        opcode, *args = op.split()
+        if opcode not in _TERMINATORS:
+            continue
+        following = f"{label}#{len(blocks) + 1}" if index + 1 < len(ops) else next_label
+        successors = args if opcode in _JUMPS else []
+        if opcode == "callsub":
+            successors = [f"{args[0]}>{following}"]
+        elif opcode in _FALLTHROUGH and following is not None:
+            successors = [*successors, following]
+        blocks[name] = _Block(
+            name, ops[start : index + 1], successors, rejects=opcode == _REJECT
+        )
+        start, name = index + 1, following
+    if start < len(ops) or name == label:
+        successors = [next_label] if next_label is not None else []
+        blocks[name] = _Block(name, ops[start:], successors, rejects=False)
+    return blocks
+
+
+def _inline_subroutines(blocks: dict[str, _Block]) -> dict[str, _Block]:
+    """
+    Replaces `callsub` edges (`subroutine>return_label`) with copies of the
+    subroutine blocks whose `retsub` goes to the return label.
+    """
+    inlined = dict(blocks)
+    pending = [s for block in blocks.values() for s in block.successors if ">" in s]
+    while pending:
+        name = pending.pop()
+        if name not in inlined:
+            inlined[name] = block = _subroutine_block(blocks, name)
+            pending.extend(s for s in block.successors if ">" in s)
+    return inlined
+
+
+def _subroutine_block(blocks: dict[str, _Block], name: str) -> _Block:
+    label, return_label = name.split(">", 1)
+    if return_label.count(">") > len(blocks):
+        raise CostEstimationError(f"Unbounded recursion at: {label}")
+    block = blocks[label]
+    successors = [f"{s}>{return_label}" for s in block.successors]
+    if block.ops and block.ops[-1].split()[0] == "retsub":
+        successors = [return_label]
+    return _Block(name, block.ops, successors, block.rejects)
+
+
+def _router(ops: Iterable[str]) -> tuple[list[bytes], str | None]:
+    """
+    Returns the selectors pushed before the router `match` (with `pushbytess`, or
+    one `pushbytes` each without optimization), and the `match` op.
+    """
+    selectors = []
+    for op in ops:
+        opcode, *args = op.split()
+        if opcode in {"pushbytes", "pushbytess"} and all(
+            arg.startswith("0x") for arg in args
+        ):
+            selectors.extend(bytes.fromhex(arg.removeprefix("0x")) for arg in args)
+        elif opcode == "match":
+            return selectors[len(selectors) - len(args) :], op
+    return selectors, None
+
+
+def _strip_comment(line: str) -> str:
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"' and (index == 0 or line[index - 1] != "\\"):
+            quoted = not quoted
+        elif not quoted and line.startswith("//", index):
+            return line[:index]
+    return line
+
+
+def _add(a: tuple[int, ...], b: tuple[int, ...]) -> tuple[int, ...]:
+    return tuple(x + y for x, y in zip(a, b, strict=True))
+
+
+def _max(a: tuple[int, ...] | None, b: tuple[int, ...]) -> tuple[int, ...]:
+    return b if a is None else tuple(max(x, y) for x, y in zip(a, b, strict=True))
@@ -0,0 +1,259 @@
+# mypy: ignore-errors
+
+import base64
+import dataclasses
+import functools
+import json
+from collections import Counter
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from algokit_utils.applications.app_client import get_constant_block_offset
+
+ARTIFACTS_DIR: Final[Path] = (
+    Path(__file__).parents[1] / "smart_contracts" / "artifacts" / "circulating_supply"
+)
+APPROVAL_MAP: Final[Path] = ARTIFACTS_DIR / "CirculatingSupply.approval.puya.map"
+
+# Opcodes costing more than 1, from the AVM opcodes spec (v12). Costs depending on
+# the curve or hash immediate are keyed by the op and its immediate; dynamic costs
+# (per bytes of an argument) are at their base cost.
+OPCODE_COSTS: Final[dict[str, int]] = {
+    "sha256": 35,
+    "keccak256": 130,
+    "sha512_256": 45,
+    "sha3_256": 130,
+    "sumhash512": 150,
+    "falcon_verify": 1_700,
+    "ed25519verify": 1_900,
+    "ed25519verify_bare": 1_900,
+    "ecdsa_verify Secp256k1": 1_700,
+    "ecdsa_verify Secp256r1": 2_500,
+    "ecdsa_pk_decompress Secp256k1": 650,
+    "ecdsa_pk_decompress Secp256r1": 2_400,
+    "ecdsa_pk_recover Secp256k1": 2_000,
+    "vrf_verify": 5_700,
+    "ec_add BN254g1": 125,
+    "ec_add BN254g2": 170,
+    "ec_add BLS12_381g1": 205,
+    "ec_add BLS12_381g2": 290,
+    "ec_scalar_mul BN254g1": 1_810,
+    "ec_scalar_mul BN254g2": 3_430,
+    "ec_scalar_mul BLS12_381g1": 2_950,
+    "ec_scalar_mul BLS12_381g2": 6_530,
+    "ec_pairing_check BN254g1": 8_000,
+    "ec_pairing_check BN254g2": 8_000,
+    "ec_pairing_check BLS12_381g1": 13_000,
+    "ec_pairing_check BLS12_381g2": 13_000,
+    "ec_multi_scalar_mul BN254g1": 3_600,
+    "ec_multi_scalar_mul BN254g2": 7_200,
+    "ec_multi_scalar_mul BLS12_381g1": 6_500,
+    "ec_multi_scalar_mul BLS12_381g2": 14_850,
+    "ec_subgroup_check BN254g1": 20,
+    "ec_subgroup_check BN254g2": 3_100,
+    "ec_subgroup_check BLS12_381g1": 1_850,
+    "ec_subgroup_check BLS12_381g2": 2_340,
+    "ec_map_to BN254g1": 630,
+    "ec_map_to BN254g2": 3_300,
+    "ec_map_to BLS12_381g1": 1_950,
+    "ec_map_to BLS12_381g2": 8_150,
+    "mimc BN254Mp110": 10,
+    "mimc BLS12_381Mp111": 10,
+    "json_ref": 25,
+    "divmodw": 20,
+    "expw": 10,
+    "sqrt": 4,
+    "b+": 10,
+    "b-": 10,
+    "b*": 20,
+    "b/": 20,
+    "b%": 20,
+    "b|": 6,
+    "b&": 6,
+    "b^": 6,
+    "b~": 4,
+    "bsqrt": 40,
+}
+
+BARE_CALL: Final[str] = "<bare>"
+
+_BASE64_CHARS: Final[str] = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+)
+_VLQ_CONTINUATION: Final[int] = 0x20
+
+
+def opcode_cost(op: str) -> int:
+    """Static cost of a TEAL op (with its immediates), 1 if not in `OPCODE_COSTS`."""
+    fields = op.split()
+    if not fields:
+        return 1
+    return OPCODE_COSTS.get(" ".join(fields[:2]), OPCODE_COSTS.get(fields[0], 1))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PuyaSourceMap:
+    """
+    Puya source map (`*.puya.map`): program counters, relative to the end of the
+    constant blocks, mapped to the source lines (1-based) and to the TEAL ops.
+    """
+
+    sources: list[Path]
+    lines: dict[int, tuple[int, int]]
+    ops: dict[int, str]
+
+    @classmethod
+    def from_file(cls, path: str | Path = APPROVAL_MAP) -> "PuyaSourceMap":
+        path = Path(path)
+        data = json.loads(path.read_text())
+        lines, source, line = {}, 0, 0
+        for pc, segment in enumerate(data["mappings"].split(";")):
+            if not segment:
+                continue
+            fields = _decode_vlq(segment.split(",")[0])
+            if len(fields) >= 3:
+                source += fields[1]
+                line += fields[2]
+                lines[pc] = (source, line + 1)
+        return cls(
+            sources=[(path.parent / s).resolve() for s in data["sources"]],
+            lines=lines,
+            ops={
+                int(pc): event.get("op", "") for pc, event in data["pc_events"].items()
+            },
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class LineCost:
+    """Opcodes executed and their cost for a source line of a method"""
+
+    method: str
+    source: Path
+    line: int
+    opcodes: int
+    cost: int
+
+
+class CostProfiler:
+    """
+    Attributes the opcodes executed in simulated App Calls (traced with
+    `SimulateTraceConfig(enable=True)`) to the contract source lines, per method.
+    Ops without source line (e.g. the constant blocks) are attributed to line 0.
+    """
+
+    def __init__(self, source_map: PuyaSourceMap | None = None) -> None:
+        self.source_map = source_map or PuyaSourceMap.from_file()
+        self.budget_consumed = 0
+        self._opcodes: Counter[tuple[str, int, int]] = Counter()
+        self._costs: Counter[tuple[str, int, int]] = Counter()
+
+    def add_simulation(
+        self, simulate_response: Mapping[str, Any], approval_program: bytes
+    ) -> None:
+        offset = get_constant_block_offset(approval_program)
+        for group in simulate_response["txn-groups"]:
+            for txn_result in group["txn-results"]:
+                trace = txn_result.get("exec-trace", {})
+                steps = trace.get("approval-program-trace", [])
+                if not steps:
+                    continue
+                self.budget_consumed += txn_result.get("app-budget-consumed", 0)
+                method = _method_name(txn_result["txn-result"]["txn"]["txn"])
+                for step in steps:
+                    pc = step["pc"] - offset
+                    source, line = self.source_map.lines.get(pc, (0, 0))
+                    key = (method, source, line)
+                    self._opcodes[key] += 1
+                    self._costs[key] += opcode_cost(self.source_map.ops.get(pc, ""))
+
+    def line_costs(self) -> list[LineCost]:
+        """Line costs by method and line order."""
+        return [
+            LineCost(
+                method=method,
+                source=self.source_map.sources[source],
+                line=line,
+                opcodes=self._opcodes[method, source, line],
+                cost=self._costs[method, source, line],
+            )
+            for method, source, line in sorted(self._opcodes)
+        ]
+
+    def folded_stacks(self) -> str:
+        """
+        Report in the folded stacks format (`method;file:line source cost` lines),
+        input of `flamegraph.pl`, speedscope or inferno.
+        """
+        return "".join(
+            f"{c.method};{c.source.name}:{c.line} "
+            f"{_source_line(c.source, c.line).replace(';', ',')} {c.cost}\n"
+            for c in self.line_costs()
+        )
+
+    def annotated_source(self, method: str | None = None) -> str:
+        """
+        Report of the source files with the cost and opcodes executed on each line
+        (of a method, or of all the methods).
+        """
+        costs: dict[tuple[Path, int], tuple[int, int]] = {}
+        for c in self.line_costs():
+            if method is None or c.method == method:
+                cost, opcodes = costs.get((c.source, c.line), (0, 0))
+                costs[c.source, c.line] = (cost + c.cost, opcodes + c.opcodes)
+        total = sum(cost for cost, _ in costs.values())
+        report = [f"{'cost':>6} {'ops':>6} {'%':>6}  (total cost {total})"]
+        for source in sorted({source for source, _ in costs}):
+            report.append(f"--- {source.name}")
+            for line, text in enumerate(_read_lines(source), start=1):
+                cost, opcodes = costs.get((source, line), (0, 0))
+                if cost:
+                    share = f"{100 * cost / total:.1f}"
+                    report.append(f"{cost:>6} {opcodes:>6} {share:>6}  {text}")
+                else:
+                    report.append(f"{'':>6} {'':>6} {'':>6}  {text}")
+        return "\n".join(report) + "\n"
+
+
+@functools.cache
+def method_names() -> dict[bytes, str]:
+    """ABI method names of the App by selector, from its generated client."""
+    # Imported on first use: the build reports use the opcode costs before the
+    # client is generated
+    from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+        APP_SPEC,
+    )
+
+    return {m.to_abi_method().get_selector(): m.name for m in APP_SPEC.methods}
+
+
+def _method_name(txn: Mapping[str, Any]) -> str:
+    app_args = txn.get("apaa", [])
+    if not app_args:
+        return BARE_CALL
+    selector = base64.b64decode(app_args[0])
+    return method_names().get(selector, selector.hex())
+
+
+@functools.cache
+def _read_lines(path: Path) -> list[str]:
+    return path.read_text().splitlines() if path.is_file() else []
+
+
+def _source_line(path: Path, line: int) -> str:
+    lines = _read_lines(path)
+    return lines[line - 1].strip() if 0 < line <= len(lines) else ""
+
+
+def _decode_vlq(segment: str) -> list[int]:
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = _BASE64_CHARS.index(char)
+        value += (digit & (_VLQ_CONTINUATION - 1)) << shift
+        if digit & _VLQ_CONTINUATION:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value, shift = 0, 0
+    return values
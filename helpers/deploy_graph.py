@@ -0,0 +1,52 @@
+# mypy: ignore-errors
+
+import dataclasses
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+
+class DeployGraphError(Exception):
+    """The deploy steps do not form an acyclic graph"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class DeployStep:
+    """
+    Deploy step, run with the results (by step name) of the steps it depends on.
+    Steps typically send an atomic group and wait for its confirmation.
+    """
+
+    name: str
+    run: Callable[[Mapping[str, Any]], Any]
+    after: tuple[str, ...] = ()
+
+
+def run_steps(
+    steps: Iterable[DeployStep], max_workers: int | None = None
+) -> dict[str, Any]:
+    """
+    Runs the deploy steps concurrently in a thread pool, each as soon as the steps
+    it depends on are done, so that the independent groups are in flight in the
+    same rounds. Returns the step results by name. A failing step raises once the
+    running steps are done, the pending ones are not run.
+    """
+    pending = {step.name: step for step in steps}
+    for step in pending.values():
+        unknown = [name for name in step.after if name not in pending]
+        if unknown:
+            raise DeployGraphError(f"Unknown steps before {step.name}: {unknown}")
+    results: dict[str, Any] = {}
+    running: dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, step in list(pending.items()):
+                if all(dependency in results for dependency in step.after):
+                    running[pool.submit(step.run, dict(results))] = name
+                    del pending[name]
+            if not running:
+                raise DeployGraphError(f"Cyclic steps: {sorted(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+    return results
@@ -0,0 +1,1009 @@
+# mypy: ignore-errors
+
+import base64
+import copy
+import dataclasses
+import os
+import re
+import threading
+from collections.abc import Callable, Mapping
+from typing import Any, Final
+from urllib.parse import unquote
+
+import msgpack
+from algokit_utils import AlgorandClient, SigningAccount
+from algosdk import account, constants, encoding, mnemonic, transaction
+from algosdk.error import AlgodHTTPError
+from algosdk.logic import get_application_address
+from algosdk.v2client.algod import AlgodClient
+
+from helpers.avm import (
+    APP_CALL_BUDGET,
+    AssembleError,
+    AvmError,
+    StackValue,
+    assemble,
+    evaluate,
+)
+
+GENESIS_ID: Final[str] = "fakenet-v1"
+GENESIS_HASH: Final[str] = base64.b64encode(encoding.checksum(b"fakenet-v1")).decode()
+CONSENSUS_VERSION: Final[str] = "fake"
+
+MIN_FEE: Final[int] = 1_000
+MIN_BALANCE: Final[int] = 100_000
+ASSET_MBR: Final[int] = 100_000
+APP_PAGE_MBR: Final[int] = 100_000
+SCHEMA_UINT_MBR: Final[int] = 28_500
+SCHEMA_BYTES_MBR: Final[int] = 50_000
+BOX_FLAT_MBR: Final[int] = 2_500
+BOX_BYTE_MBR: Final[int] = 400
+
+DISPENSER_FUNDS: Final[int] = 10**15
+FIRST_INDEX: Final[int] = 1_001
+
+MAX_TXN_LIFE: Final[int] = 1_000
+
+TYPE_ENUMS: Final[dict[str, int]] = {
+    constants.PAYMENT_TXN: 1,
+    constants.KEYREG_TXN: 2,
+    constants.ASSETCONFIG_TXN: 3,
+    constants.ASSETTRANSFER_TXN: 4,
+    constants.ASSETFREEZE_TXN: 5,
+    constants.APPCALL_TXN: 6,
+}
+# Asset params keys of the `asset_params_get` fields, and those holding addresses
+ASSET_PARAMS_KEYS: Final[dict[str, str]] = {
+    "AssetTotal": "total",
+    "AssetDecimals": "decimals",
+    "AssetDefaultFrozen": "default-frozen",
+    "AssetUnitName": "unit-name",
+    "AssetName": "name",
+    "AssetURL": "url",
+    "AssetMetadataHash": "metadata-hash",
+    "AssetManager": "manager",
+    "AssetReserve": "reserve",
+    "AssetFreeze": "freeze",
+    "AssetClawback": "clawback",
+    "AssetCreator": "creator",
+}
+_ADDRESS_PARAMS: Final[frozenset[str]] = frozenset(
+    ("manager", "reserve", "freeze", "clawback", "creator")
+)
+
+# JSON encoding of the transaction fields holding addresses
+_ADDRESS_FIELDS: Final[frozenset[str]] = frozenset(
+    ("snd", "rcv", "close", "asnd", "arcv", "aclose", "rekey", "m", "r", "f", "c")
+)
+
+
+class _TransactionError(Exception):
+    """Transaction rejected by the ledger"""
+
+
+class _GroupError(Exception):
+    """Transaction group rejected at the `failed_at` transaction"""
+
+    def __init__(self, failed_at: int, message: str) -> None:
+        super().__init__(message)
+        self.failed_at = failed_at
+
+
+def _to_json(value: Any, key: str | None = None) -> Any:  # noqa: ANN401
+    """Encodes msgpack transaction fields as Algod JSON (base32 addresses, base64)."""
+    if isinstance(value, Mapping):
+        return {k: _to_json(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_json(v, key) for v in value]
+    if isinstance(value, bytes):
+        if key in _ADDRESS_FIELDS or key == "apat":
+            return encoding.encode_address(value)
+        return base64.b64encode(value).decode()
+    return value
+
+
+@dataclasses.dataclass
+class _Account:
+    amount: int = 0
+    holdings: dict[int, int] = dataclasses.field(default_factory=dict)
+    created_assets: set[int] = dataclasses.field(default_factory=set)
+    created_apps: set[int] = dataclasses.field(default_factory=set)
+    apps_mbr: int = 0
+    total_boxes: int = 0
+    total_box_bytes: int = 0
+
+    def min_balance(self) -> int:
+        return (
+            MIN_BALANCE
+            + ASSET_MBR * len(self.holdings)
+            + self.apps_mbr
+            + BOX_FLAT_MBR * self.total_boxes
+            + BOX_BYTE_MBR * self.total_box_bytes
+        )
+
+
+@dataclasses.dataclass
+class _App:
+    creator: str
+    approval_program: bytes
+    clear_program: bytes
+    global_schema: tuple[int, int] = (0, 0)
+    local_schema: tuple[int, int] = (0, 0)
+    extra_pages: int = 0
+    boxes: dict[bytes, bytes] = dataclasses.field(default_factory=dict)
+
+    def min_balance(self) -> int:
+        """MBR of the App on its creator account."""
+        return (
+            APP_PAGE_MBR * (1 + self.extra_pages)
+            + SCHEMA_UINT_MBR * self.global_schema[0]
+            + SCHEMA_BYTES_MBR * self.global_schema[1]
+        )
+
+
+@dataclasses.dataclass
+class _State:
+    accounts: dict[str, _Account] = dataclasses.field(default_factory=dict)
+    assets: dict[int, dict[str, Any]] = dataclasses.field(default_factory=dict)
+    apps: dict[int, _App] = dataclasses.field(default_factory=dict)
+    next_index: int = FIRST_INDEX
+    round: int = 1
+
+    def account(self, address: str) -> _Account:
+        return self.accounts.setdefault(address, _Account())
+
+
+class _GroupEvaluator:
+    """
+    Applies a transaction group to a copy of the ledger state, evaluating the App
+    programs with the pooled opcode budget of the group. The App Calls costs and
+    execution traces (if `trace` is set, as the simulate `exec-trace-config`) are
+    kept by group index.
+    """
+
+    def __init__(
+        self,
+        state: _State,
+        trace: Mapping[str, bool] | None = None,
+        extra_budget: int = 0,
+    ) -> None:
+        self.state = copy.deepcopy(state)
+        self.trace = trace
+        self.extra_budget = extra_budget
+        self.budget = 0
+        self.costs: dict[int, int] = {}
+        self.traces: dict[int, dict[str, Any]] = {}
+        self.fees = 0
+        self.inner_count = 0
+        self.touched: set[str] = set()
+
+    @property
+    def budget_added(self) -> int:
+        return APP_CALL_BUDGET * len(self.costs) + self.extra_budget
+
+    def run(self, group: list[transaction.SignedTransaction]) -> list[dict[str, Any]]:
+        app_calls = sum(
+            isinstance(stxn.transaction, transaction.ApplicationCallTxn)
+            for stxn in group
+        )
+        self.budget = APP_CALL_BUDGET * app_calls + self.extra_budget
+        results = []
+        for index, stxn in enumerate(group):
+            txn = stxn.transaction
+            try:
+                _assert_valid_round(txn, self.state.round + 1)
+                results.append(self._apply(group, index))
+                self._check_min_balances()
+            except _TransactionError as e:
+                message = f"transaction {txn.get_txid()}: {e}"
+                raise _GroupError(index, message) from None
+            self.fees += txn.fee
+        if self.fees < MIN_FEE * (len(group) + self.inner_count):
+            txid = group[0].transaction.get_txid()
+            raise _GroupError(0, f"transaction {txid}: fee too small")
+        return results
+
+    def _apply(
+        self, group: list[transaction.SignedTransaction], index: int
+    ) -> dict[str, Any]:
+        txn = group[index].transaction
+        self._pay(txn.sender, txn.sender, 0, fee=txn.fee)
+        result: dict[str, Any] = {
+            "pool-error": "",
+            "txn": _to_json(group[index].dictify()),
+        }
+        if isinstance(txn, transaction.PaymentTxn):
+            self._pay(txn.sender, txn.receiver, txn.amt)
+            if txn.close_remainder_to:
+                sender = self.state.account(txn.sender)
+                if sender.holdings or sender.created_apps:
+                    raise _TransactionError("cannot close account with assets or apps")
+                self._pay(txn.sender, txn.close_remainder_to, sender.amount)
+                del self.state.accounts[txn.sender]
+        elif isinstance(txn, transaction.AssetTransferTxn):
+            self._asset_transfer(
+                txn.sender,
+                txn.index,
+                txn.amount,
+                txn.receiver,
+                revocation_target=txn.revocation_target,
+                close_to=txn.close_assets_to,
+            )
+        elif isinstance(txn, transaction.AssetConfigTxn):
+            asset_id = self._asset_config(txn)
+            if asset_id is not None:
+                result["asset-index"] = asset_id
+        elif isinstance(txn, transaction.ApplicationCallTxn):
+            result.update(self._app_call(group, index))
+        else:
+            raise _TransactionError(f"unsupported transaction type {txn.type}")
+        return result
+
+    def _pay(self, sender: str, receiver: str, amount: int, fee: int = 0) -> None:
+        source = self.state.account(sender)
+        if source.amount < amount + fee:
+            raise _TransactionError(
+                f"overspend (account {sender}, tried to spend {amount + fee})"
+            )
+        source.amount -= amount + fee
+        self.state.account(receiver).amount += amount
+        self.touched.update((sender, receiver))
+
+    def _asset_transfer(
+        self,
+        sender: str,
+        asset_id: int,
+        amount: int,
+        receiver: str,
+        revocation_target: str | None = None,
+        close_to: str | None = None,
+    ) -> None:
+        params = self._asset(asset_id)
+        source = sender
+        if revocation_target:
+            if sender != params.get("clawback"):
+                raise _TransactionError("clawback called by non-clawback account")
+            source = revocation_target
+        receiver_account = self.state.account(receiver)
+        if (
+            source == receiver
+            and not amount
+            and asset_id not in receiver_account.holdings
+        ):
+            receiver_account.holdings[asset_id] = 0
+            self.touched.add(receiver)
+            return
+        holder = self.state.account(source)
+        for address, account_ in ((source, holder), (receiver, receiver_account)):
+            if asset_id not in account_.holdings:
+                raise _TransactionError(f"asset {asset_id} missing from {address}")
+        if holder.holdings[asset_id] < amount:
+            raise _TransactionError(f"underflow on subtracting {amount} from {source}")
+        holder.holdings[asset_id] -= amount
+        receiver_account.holdings[asset_id] += amount
+        if close_to:
+            if source == params["creator"]:
+                raise _TransactionError(f"cannot close asset ID {asset_id} in creator")
+            close_account = self.state.account(close_to)
+            if asset_id not in close_account.holdings:
+                raise _TransactionError(f"asset {asset_id} missing from {close_to}")
+            close_account.holdings[asset_id] += holder.holdings.pop(asset_id)
+        self.touched.update((source, receiver))
+
+    def _asset_config(self, txn: transaction.AssetConfigTxn) -> int | None:
+        creator = self.state.account(txn.sender)
+        if not txn.index:
+            asset_id = self._new_index()
+            self.state.assets[asset_id] = {
+                "creator": txn.sender,
+                "total": txn.total,
+                "decimals": txn.decimals,
+                "default-frozen": bool(txn.default_frozen),
+                "unit-name": txn.unit_name,
+                "name": txn.asset_name,
+                "url": txn.url,
+                "metadata-hash": txn.metadata_hash,
+                "manager": txn.manager,
+                "reserve": txn.reserve,
+                "freeze": txn.freeze,
+                "clawback": txn.clawback,
+            }
+            creator.holdings[asset_id] = txn.total
+            creator.created_assets.add(asset_id)
+            return asset_id
+
+        params = self._asset(txn.index)
+        if txn.sender != params.get("manager"):
+            raise _TransactionError("this transaction should be issued by the manager")
+        if "apar" in txn.dictify():
+            for field in ("manager", "reserve", "freeze", "clawback"):
+                params[field] = getattr(txn, field)
+            return None
+        # Destroy
+        owner = self.state.account(params["creator"])
+        if owner.holdings.get(txn.index) != params["total"]:
+            raise _TransactionError(
+                f"cannot destroy asset {txn.index}: creator is not the holder"
+            )
+        del owner.holdings[txn.index]
+        owner.created_assets.discard(txn.index)
+        del self.state.assets[txn.index]
+        self.touched.add(params["creator"])
+        return None
+
+    def _app_call(
+        self, group: list[transaction.SignedTransaction], index: int
+    ) -> dict[str, Any]:
+        txn = group[index].transaction
+        result: dict[str, Any] = {}
+        app_id = txn.index
+        if not app_id:
+            app_id = self._app_create(txn)
+            result["application-index"] = app_id
+        app = self.state.apps.get(app_id)
+        if app is None:
+            raise _TransactionError(f"application {app_id} does not exist")
+        clear_state = txn.on_complete == transaction.OnComplete.ClearStateOC
+        context = _AppContext(self, group, app_id)
+        try:
+            evaluation = evaluate(
+                app.clear_program if clear_state else app.approval_program,
+                context,
+                index,
+                budget=self.budget,
+                trace=self.trace,
+            )
+        except AvmError as e:
+            raise _TransactionError(
+                f"logic eval error: {e}. Details: app={app_id}, pc={e.pc}, "
+                f"opcodes={e.op}"
+            ) from None
+        self.budget -= evaluation.cost
+        self.costs[index] = evaluation.cost
+        if evaluation.trace:
+            program_trace = (
+                "clear-state-program-trace" if clear_state else "approval-program-trace"
+            )
+            self.traces[index] = {program_trace: evaluation.trace}
+        if not evaluation.approved and not clear_state:
+            raise _TransactionError("rejected by ApprovalProgram")
+        if txn.on_complete == transaction.OnComplete.DeleteApplicationOC:
+            self._app_delete(app_id)
+        elif txn.on_complete == transaction.OnComplete.UpdateApplicationOC:
+            app.approval_program = txn.approval_program
+            app.clear_program = txn.clear_program
+        if evaluation.logs:
+            result["logs"] = [base64.b64encode(log).decode() for log in evaluation.logs]
+        if context.inner_txns:
+            result["inner-txns"] = context.inner_txns
+        return result
+
+    def _app_create(self, txn: transaction.ApplicationCallTxn) -> int:
+        app_id = self._new_index()
+        global_schema = (
+            (txn.global_schema.num_uints, txn.global_schema.num_byte_slices)
+            if txn.global_schema
+            else (0, 0)
+        )
+        local_schema = (
+            (txn.local_schema.num_uints, txn.local_schema.num_byte_slices)
+            if txn.local_schema
+            else (0, 0)
+        )
+        app = _App(
+            creator=txn.sender,
+            approval_program=txn.approval_program,
+            clear_program=txn.clear_program,
+            global_schema=global_schema,
+            local_schema=local_schema,
+            extra_pages=txn.extra_pages or 0,
+        )
+        self.state.apps[app_id] = app
+        creator = self.state.account(txn.sender)
+        creator.created_apps.add(app_id)
+        creator.apps_mbr += app.min_balance()
+        return app_id
+
+    def _app_delete(self, app_id: int) -> None:
+        app = self.state.apps.pop(app_id)
+        creator = self.state.account(app.creator)
+        creator.created_apps.discard(app_id)
+        creator.apps_mbr -= app.min_balance()
+
+    def inner_transaction(
+        self, app_id: int, fields: Mapping[str, StackValue]
+    ) -> dict[str, Any]:
+        """Applies an inner payment or asset transfer of the App."""
+        sender = get_application_address(app_id)
+        if fields.get("Sender", encoding.decode_address(sender)) != (
+            encoding.decode_address(sender)
+        ):
+            raise _TransactionError("unauthorized inner transaction sender")
+        type_enum = fields.get("TypeEnum") or TYPE_ENUMS.get(
+            bytes(fields.get("Type", b"")).decode(), 0
+        )
+        fee = fields.get("Fee", MIN_FEE)
+        self._pay(sender, sender, 0, fee=fee)
+        self.fees += fee
+        self.inner_count += 1
+        if type_enum == TYPE_ENUMS[constants.PAYMENT_TXN]:
+            receiver = _address(fields.get("Receiver"))
+            amount = fields.get("Amount", 0)
+            self._pay(sender, receiver, amount)
+            txn = {"amt": amount, "fee": fee, "rcv": receiver, "type": "pay"}
+        elif type_enum == TYPE_ENUMS[constants.ASSETTRANSFER_TXN]:
+            asset_id = fields.get("XferAsset", 0)
+            amount = fields.get("AssetAmount", 0)
+            receiver = _address(fields.get("AssetReceiver"))
+            self._asset_transfer(sender, asset_id, amount, receiver)
+            txn = {
+                "aamt": amount,
+                "arcv": receiver,
+                "fee": fee,
+                "type": "axfer",
+                "xaid": asset_id,
+            }
+        else:
+            raise _TransactionError(f"unsupported inner transaction type {type_enum}")
+        txn["snd"] = sender
+        return {"pool-error": "", "txn": {"txn": {k: v for k, v in txn.items() if v}}}
+
+    def _asset(self, asset_id: int) -> dict[str, Any]:
+        params = self.state.assets.get(asset_id)
+        if params is None:
+            raise _TransactionError(
+                f"asset {asset_id} does not exist or has been deleted"
+            )
+        return params
+
+    def _new_index(self) -> int:
+        index = self.state.next_index
+        self.state.next_index += 1
+        return index
+
+    def _check_min_balances(self) -> None:
+        for address in self.touched:
+            account_ = self.state.accounts.get(address)
+            if account_ is None:
+                continue
+            min_balance = account_.min_balance()
+            closed = not account_.amount and min_balance == MIN_BALANCE
+            if account_.amount < min_balance and not closed:
+                raise _TransactionError(
+                    f"account {address} balance {account_.amount} below min "
+                    f"{min_balance}"
+                )
+        self.touched.clear()
+
+
+class _AppContext:
+    """Ledger and transaction group seen by the programs of an App Call"""
+
+    def __init__(
+        self,
+        evaluator: _GroupEvaluator,
+        group: list[transaction.SignedTransaction],
+        app_id: int,
+    ) -> None:
+        self.evaluator = evaluator
+        self.state = evaluator.state
+        self.group = [stxn.transaction for stxn in group]
+        self.app_id = app_id
+        self.app = evaluator.state.apps[app_id]
+        self.address = get_application_address(app_id)
+        self.inner_txns: list[dict[str, Any]] = []
+
+    def txn_field(self, group_index: int, field: str) -> Any:  # noqa: ANN401
+        getter = _TXN_FIELDS.get(field)
+        if getter is None:
+            raise AvmError(f"unsupported txn field {field}")
+        return getter(self.group[group_index], group_index)
+
+    def global_field(self, field: str) -> StackValue:
+        group_id = self.group[0].group
+        values: dict[str, StackValue] = {
+            "MinTxnFee": MIN_FEE,
+            "MinBalance": MIN_BALANCE,
+            "MaxTxnLife": MAX_TXN_LIFE,
+            "ZeroAddress": bytes(32),
+            "GroupSize": len(self.group),
+            "Round": self.state.round + 1,
+            "CurrentApplicationID": self.app_id,
+            "CreatorAddress": encoding.decode_address(self.app.creator),
+            "CurrentApplicationAddress": encoding.decode_address(self.address),
+            "GroupID": group_id or bytes(32),
+            "CallerApplicationID": 0,
+            "CallerApplicationAddress": bytes(32),
+            "AssetCreateMinBalance": ASSET_MBR,
+            "AssetOptInMinBalance": ASSET_MBR,
+            "GenesisHash": base64.b64decode(GENESIS_HASH),
+        }
+        if field not in values:
+            raise AvmError(f"unsupported global field {field}")
+        return values[field]
+
+    def asset_holding(
+        self, address: bytes, asset_id: int, field: str
+    ) -> StackValue | None:
+        account_ = self.state.accounts.get(encoding.encode_address(address))
+        if account_ is None or asset_id not in account_.holdings:
+            return None
+        # Holdings are never frozen
+        return account_.holdings[asset_id] if field == "AssetBalance" else 0
+
+    def asset_params(self, asset_id: int, field: str) -> StackValue | None:
+        params = self.state.assets.get(asset_id)
+        if params is None:
+            return None
+        key = ASSET_PARAMS_KEYS[field]
+        value = params.get(key)
+        if key in _ADDRESS_PARAMS:
+            return _address_bytes(value)
+        if isinstance(value, str):
+            return value.encode()
+        if value is None:
+            return b""
+        return int(value)
+
+    def account_params(self, address: bytes, field: str) -> StackValue:
+        account_ = self.state.accounts.get(encoding.encode_address(address))
+        if account_ is None:
+            return bytes(32) if field == "AcctAuthAddr" else 0
+        values: dict[str, StackValue] = {
+            "AcctBalance": account_.amount,
+            "AcctMinBalance": account_.min_balance(),
+            "AcctAuthAddr": bytes(32),
+            "AcctTotalNumUint": 0,
+            "AcctTotalNumByteSlice": 0,
+            "AcctTotalExtraAppPages": 0,
+            "AcctTotalAppsCreated": len(account_.created_apps),
+            "AcctTotalAppsOptedIn": 0,
+            "AcctTotalAssetsCreated": len(account_.created_assets),
+            "AcctTotalAssets": len(account_.holdings),
+            "AcctTotalBoxes": account_.total_boxes,
+            "AcctTotalBoxBytes": account_.total_box_bytes,
+        }
+        return values[field]
+
+    def box(self, name: bytes) -> bytes | None:
+        return self.app.boxes.get(name)
+
+    def put_box(self, name: bytes, value: bytes) -> None:
+        app_account = self.state.account(self.address)
+        previous = self.app.boxes.get(name)
+        if previous is None:
+            app_account.total_boxes += 1
+            app_account.total_box_bytes += len(name) + len(value)
+        self.app.boxes[name] = value
+        self.evaluator.touched.add(self.address)
+
+    def delete_box(self, name: bytes) -> None:
+        value = self.app.boxes.pop(name)
+        app_account = self.state.account(self.address)
+        app_account.total_boxes -= 1
+        app_account.total_box_bytes -= len(name) + len(value)
+
+    def submit_inner(self, fields: Mapping[str, Any]) -> None:
+        try:
+            self.inner_txns.append(
+                self.evaluator.inner_transaction(self.app_id, fields)
+            )
+        except _TransactionError as e:
+            raise AvmError(f"inner tx {len(self.inner_txns)} failed: {e}") from None
+
+
+def _address(value: bytes | None) -> str:
+    return encoding.encode_address(value or bytes(32))
+
+
+def _address_bytes(address: str | None) -> bytes:
+    return encoding.decode_address(address) if address else bytes(32)
+
+
+def _txn_attribute(
+    txn_type: type[transaction.Transaction],
+    attribute: str,
+    default: Any,  # noqa: ANN401
+) -> Callable[[transaction.Transaction, int], Any]:
+    """Field getter of a transaction attribute, `default` for other types."""
+
+    def getter(txn: transaction.Transaction, _group_index: int) -> Any:  # noqa: ANN401
+        if not isinstance(txn, txn_type):
+            return default
+        value = getattr(txn, attribute)
+        return default if value is None else value
+
+    return getter
+
+
+def _address_attribute(
+    txn_type: type[transaction.Transaction], attribute: str
+) -> Callable[[transaction.Transaction, int], bytes]:
+    getter = _txn_attribute(txn_type, attribute, None)
+    return lambda txn, group_index: _address_bytes(getter(txn, group_index))
+
+
+def _app_call_array(txn: transaction.Transaction, attribute: str) -> list[Any]:
+    if not isinstance(txn, transaction.ApplicationCallTxn):
+        return []
+    return list(getattr(txn, attribute) or [])
+
+
+_TXN_FIELDS: Final[dict[str, Callable[[transaction.Transaction, int], Any]]] = {
+    "Sender": lambda txn, _: encoding.decode_address(txn.sender),
+    "Fee": lambda txn, _: txn.fee,
+    "FirstValid": lambda txn, _: txn.first_valid_round,
+    "LastValid": lambda txn, _: txn.last_valid_round,
+    "Note": lambda txn, _: txn.note or b"",
+    "Lease": lambda txn, _: txn.lease or bytes(32),
+    "Receiver": _address_attribute(transaction.PaymentTxn, "receiver"),
+    "Amount": _txn_attribute(transaction.PaymentTxn, "amt", 0),
+    "CloseRemainderTo": _address_attribute(
+        transaction.PaymentTxn, "close_remainder_to"
+    ),
+    "Type": lambda txn, _: txn.type.encode(),
+    "TypeEnum": lambda txn, _: TYPE_ENUMS[txn.type],
+    "XferAsset": _txn_attribute(transaction.AssetTransferTxn, "index", 0),
+    "AssetAmount": _txn_attribute(transaction.AssetTransferTxn, "amount", 0),
+    "AssetSender": _address_attribute(
+        transaction.AssetTransferTxn, "revocation_target"
+    ),
+    "AssetReceiver": _address_attribute(transaction.AssetTransferTxn, "receiver"),
+    "AssetCloseTo": _address_attribute(transaction.AssetTransferTxn, "close_assets_to"),
+    "GroupIndex": lambda _, group_index: group_index,
+    "TxID": lambda txn, _: base64.b32decode(txn.get_txid() + "===="),
+    "ApplicationID": _txn_attribute(transaction.ApplicationCallTxn, "index", 0),
+    "OnCompletion": lambda txn, _: int(getattr(txn, "on_complete", 0)),
+    "ApplicationArgs": lambda txn, _: _app_call_array(txn, "app_args"),
+    "NumAppArgs": lambda txn, _: len(_app_call_array(txn, "app_args")),
+    # The sender is account 0, the called App is App 0
+    "Accounts": lambda txn, _: [
+        encoding.decode_address(a)
+        for a in (txn.sender, *_app_call_array(txn, "accounts"))
+    ],
+    "NumAccounts": lambda txn, _: len(_app_call_array(txn, "accounts")),
+    "Assets": lambda txn, _: _app_call_array(txn, "foreign_assets"),
+    "NumAssets": lambda txn, _: len(_app_call_array(txn, "foreign_assets")),
+    "Applications": lambda txn, group_index: [
+        _TXN_FIELDS["ApplicationID"](txn, group_index),
+        *_app_call_array(txn, "foreign_apps"),
+    ],
+    "NumApplications": lambda txn, _: len(_app_call_array(txn, "foreign_apps")),
+    "ApprovalProgram": _txn_attribute(
+        transaction.ApplicationCallTxn, "approval_program", b""
+    ),
+    "ClearStateProgram": _txn_attribute(
+        transaction.ApplicationCallTxn, "clear_program", b""
+    ),
+    "RekeyTo": lambda txn, _: _address_bytes(txn.rekey_to),
+    "ConfigAsset": _txn_attribute(transaction.AssetConfigTxn, "index", 0),
+}
+
+
+def _assert_valid_round(txn: transaction.Transaction, round_num: int) -> None:
+    if not txn.first_valid_round <= round_num <= txn.last_valid_round:
+        raise _TransactionError(
+            f"txn dead: round {round_num} outside of "
+            f"{txn.first_valid_round}--{txn.last_valid_round}"
+        )
+
+
+class FakeAlgodClient(AlgodClient):
+    """
+    In-process Algod stand-in for offline tests and benchmarks, backed by an emulated
+    ledger evaluating the App programs (`helpers.avm`).
+
+    It serves the Algod endpoints used by the AlgoKit clients: suggested params, TEAL
+    compile, send, simulate (with the opcode budget consumed and the execution trace),
+    pending transaction, status, accounts, assets, Apps and boxes. Every transaction
+    group is applied atomically in its own round.
+
+    Emulation limits: signatures and resource availability are not checked. Only
+    payments, asset transactions and App Calls (with inner payments and asset
+    transfers) are supported, for the AVM opcodes of `helpers.avm.OP_SPECS`: no
+    global or local App state.
+
+    The `dispenser` account (from the `DISPENSER_MNEMONIC` environment variable, if
+    set) is funded at genesis.
+    """
+
+    def __init__(
+        self,
+        *,
+        dispenser: SigningAccount | None = None,
+        dispenser_funds: int = DISPENSER_FUNDS,
+    ) -> None:
+        super().__init__(algod_token="", algod_address="http://fake-algod")
+        if dispenser is None:
+            dispenser_mnemonic = os.environ.get("DISPENSER_MNEMONIC")
+            private_key = (
+                mnemonic.to_private_key(dispenser_mnemonic)
+                if dispenser_mnemonic
+                else account.generate_account()[0]
+            )
+            dispenser = SigningAccount(private_key=private_key)
+        self.dispenser = dispenser
+        self._state = _State()
+        self._state.account(dispenser.address).amount = dispenser_funds
+        self._confirmed: dict[str, dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._routes: list[tuple[str, re.Pattern, Callable[..., Any]]] = [
+            ("GET", re.compile(r"/versions"), self._versions),
+            ("GET", re.compile(r"/health"), lambda **_: {}),
+            ("GET", re.compile(r"/status"), self._status),
+            ("GET", re.compile(r"/status/wait-for-block-after/\d+"), self._status),
+            ("GET", re.compile(r"/transactions/params"), self._suggested_params),
+            ("POST", re.compile(r"/teal/compile"), self._compile),
+            ("POST", re.compile(r"/transactions"), self._send),
+            ("POST", re.compile(r"/transactions/simulate"), self._simulate),
+            (
+                "GET",
+                re.compile(r"/transactions/pending/(?P<txid>\w+)"),
+                self._pending_transaction,
+            ),
+            ("GET", re.compile(r"/accounts/(?P<address>\w+)"), self._account),
+            (
+                "GET",
+                re.compile(r"/accounts/(?P<address>\w+)/assets/(?P<asset_id>\d+)"),
+                self._account_asset,
+            ),
+            ("GET", re.compile(r"/assets/(?P<asset_id>\d+)"), self._asset),
+            ("GET", re.compile(r"/applications/(?P<app_id>\d+)"), self._application),
+            (
+                "GET",
+                re.compile(r"/applications/(?P<app_id>\d+)/boxes"),
+                self._boxes,
+            ),
+            ("GET", re.compile(r"/applications/(?P<app_id>\d+)/box"), self._box),
+        ]
+
+    @property
+    def last_round(self) -> int:
+        return self._state.round
+
+    def algod_request(
+        self,
+        method: str,
+        requrl: str,
+        params: Mapping[str, Any] | None = None,
+        data: bytes | None = None,
+        headers: Mapping[str, str] | None = None,
+        response_format: str | None = "json",
+        timeout: int | None = 30,
+    ) -> Any:  # noqa: ANN401
+        if response_format != "json":
+            raise AlgodHTTPError("Only JSON responses are supported", 400)
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(requrl)
+            if match is not None and route_method == method:
+                with self._lock:
+                    return handler(params=params or {}, data=data, **match.groupdict())
+        raise AlgodHTTPError(f"Unsupported endpoint: {method} {requrl}", 404)
+
+    def _versions(self, **_: Any) -> dict[str, Any]:
+        return {
+            "genesis_id": GENESIS_ID,
+            "genesis_hash_b64": GENESIS_HASH,
+            "versions": ["v2"],
+            "build": {"major": 0, "minor": 0, "build_number": 0, "channel": "fake"},
+        }
+
+    def _status(self, **_: Any) -> dict[str, Any]:
+        return {
+            "last-round": self._state.round,
+            "last-version": CONSENSUS_VERSION,
+            "time-since-last-round": 0,
+            "catchup-time": 0,
+        }
+
+    def _suggested_params(self, **_: Any) -> dict[str, Any]:
+        return {
+            "consensus-version": CONSENSUS_VERSION,
+            "fee": 0,
+            "genesis-hash": GENESIS_HASH,
+            "genesis-id": GENESIS_ID,
+            "last-round": self._state.round,
+            "min-fee": MIN_FEE,
+        }
+
+    def _compile(self, data: bytes, **_: Any) -> dict[str, Any]:
+        try:
+            program = assemble(data.decode())
+        except AssembleError as e:
+            raise AlgodHTTPError(str(e), 400) from None
+        return {
+            "hash": encoding.encode_address(
+                encoding.checksum(b"Program" + program.bytecode)
+            ),
+            "result": base64.b64encode(program.bytecode).decode(),
+            "sourcemap": program.source_map(),
+        }
+
+    def _evaluate(
+        self,
+        group: list[transaction.SignedTransaction],
+        trace: Mapping[str, bool] | None = None,
+        extra_budget: int = 0,
+    ) -> tuple[_GroupEvaluator, list[dict[str, Any]]]:
+        evaluator = _GroupEvaluator(self._state, trace, extra_budget)
+        return evaluator, evaluator.run(group)
+
+    def _send(self, data: bytes, **_: Any) -> dict[str, str]:
+        group = _decode_signed_transactions(data)
+        txids = [stxn.transaction.get_txid() for stxn in group]
+        for txid in txids:
+            if txid in self._confirmed:
+                raise AlgodHTTPError(
+                    f"TransactionPool.Remember: transaction already in ledger: {txid}",
+                    400,
+                )
+        try:
+            evaluator, results = self._evaluate(group)
+        except _GroupError as e:
+            raise AlgodHTTPError(f"TransactionPool.Remember: {e}", 400) from None
+        evaluator.state.round += 1
+        self._state = evaluator.state
+        for txid, result in zip(txids, results, strict=True):
+            self._confirmed[txid] = result | {"confirmed-round": self._state.round}
+        return {"txId": txids[0]}
+
+    def _simulate(self, data: bytes, **_: Any) -> dict[str, Any]:
+        request = msgpack.unpackb(data, raw=False)
+        group = [
+            transaction.SignedTransaction.undictify(stxn)
+            for stxn in request["txn-groups"][0]["txns"]
+        ]
+        trace = request.get("exec-trace-config")
+        txn_group: dict[str, Any]
+        try:
+            evaluator, results = self._evaluate(
+                group, trace, request.get("extra-opcode-budget", 0)
+            )
+            txn_group = {
+                "txn-results": [
+                    {"txn-result": result}
+                    | (
+                        {"app-budget-consumed": evaluator.costs[index]}
+                        if index in evaluator.costs
+                        else {}
+                    )
+                    | (
+                        {"exec-trace": evaluator.traces[index]}
+                        if index in evaluator.traces
+                        else {}
+                    )
+                    for index, result in enumerate(results)
+                ],
+            }
+            if evaluator.costs:
+                txn_group["app-budget-added"] = evaluator.budget_added
+                txn_group["app-budget-consumed"] = sum(evaluator.costs.values())
+        except _GroupError as e:
+            txn_group = {
+                "txn-results": [{"txn-result": {}} for _ in group],
+                "failure-message": str(e),
+                "failed-at": [e.failed_at],
+            }
+        response = {
+            "version": 2,
+            "last-round": self._state.round,
+            "txn-groups": [txn_group],
+            "eval-overrides": {
+                k: v
+                for k, v in request.items()
+                if k
+                in (
+                    "allow-empty-signatures",
+                    "allow-unnamed-resources",
+                    "extra-opcode-budget",
+                )
+            },
+        }
+        if trace:
+            response["exec-trace-config"] = trace
+        return response
+
+    def _pending_transaction(self, txid: str, **_: Any) -> dict[str, Any]:
+        confirmed = self._confirmed.get(txid)
+        if confirmed is None:
+            raise AlgodHTTPError("txn does not exist", 404)
+        return confirmed
+
+    def _account(self, address: str, **_: Any) -> dict[str, Any]:
+        account_ = self._state.accounts.get(address, _Account())
+        return {
+            "address": address,
+            "amount": account_.amount,
+            "amount-without-pending-rewards": account_.amount,
+            "min-balance": account_.min_balance(),
+            "pending-rewards": 0,
+            "rewards": 0,
+            "round": self._state.round,
+            "status": "Offline",
+            "total-apps-opted-in": 0,
+            "total-assets-opted-in": len(account_.holdings),
+            "total-created-apps": len(account_.created_apps),
+            "total-created-assets": len(account_.created_assets),
+            "total-boxes": account_.total_boxes,
+            "total-box-bytes": account_.total_box_bytes,
+        }
+
+    def _account_asset(self, address: str, asset_id: str, **_: Any) -> dict[str, Any]:
+        account_ = self._state.accounts.get(address)
+        if account_ is None or int(asset_id) not in account_.holdings:
+            raise AlgodHTTPError("account asset info not found", 404)
+        return {
+            "asset-holding": {
+                "amount": account_.holdings[int(asset_id)],
+                "asset-id": int(asset_id),
+                "is-frozen": False,
+            },
+            "round": self._state.round,
+        }
+
+    def _asset(self, asset_id: str, **_: Any) -> dict[str, Any]:
+        params = self._state.assets.get(int(asset_id))
+        if params is None:
+            raise AlgodHTTPError("asset does not exist", 404)
+        return {
+            "index": int(asset_id),
+            "params": _to_json({k: v for k, v in params.items() if v is not None}),
+        }
+
+    def _application(self, app_id: str, **_: Any) -> dict[str, Any]:
+        app = self._state.apps.get(int(app_id))
+        if app is None:
+            raise AlgodHTTPError("application does not exist", 404)
+        return {
+            "id": int(app_id),
+            "params": {
+                "approval-program": base64.b64encode(app.approval_program).decode(),
+                "clear-state-program": base64.b64encode(app.clear_program).decode(),
+                "creator": app.creator,
+                "extra-program-pages": app.extra_pages,
+                "global-state-schema": {
+                    "num-uint": app.global_schema[0],
+                    "num-byte-slice": app.global_schema[1],
+                },
+                "local-state-schema": {
+                    "num-uint": app.local_schema[0],
+                    "num-byte-slice": app.local_schema[1],
+                },
+            },
+        }
+
+    def _boxes(self, app_id: str, **_: Any) -> dict[str, Any]:
+        app = self._state.apps.get(int(app_id))
+        if app is None:
+            raise AlgodHTTPError("application does not exist", 404)
+        return {"boxes": [{"name": base64.b64encode(n).decode()} for n in app.boxes]}
+
+    def _box(self, app_id: str, params: Mapping[str, Any], **_: Any) -> dict[str, Any]:
+        app = self._state.apps.get(int(app_id))
+        encoding_, _sep, value = unquote(params["name"]).partition(":")
+        name = base64.b64decode(value) if encoding_ == "b64" else value.encode()
+        if app is None or name not in app.boxes:
+            raise AlgodHTTPError("box not found", 404)
+        return {
+            "name": base64.b64encode(name).decode(),
+            "value": base64.b64encode(app.boxes[name]).decode(),
+            "round": self._state.round,
+        }
+
+
+def _decode_signed_transactions(data: bytes) -> list[transaction.SignedTransaction]:
+    unpacker = msgpack.Unpacker(raw=False)
+    unpacker.feed(data)
+    return [transaction.SignedTransaction.undictify(stxn) for stxn in unpacker]
+
+
+def fake_algorand_client(algod: FakeAlgodClient | None = None) -> AlgorandClient:
+    """
+    Returns an AlgorandClient on a fake Algod, with its dispenser signer set and no
+    suggested params cache (each group is confirmed in a new round, as on LocalNet).
+    """
+    algod = algod or FakeAlgodClient()
+    algorand = AlgorandClient.from_clients(algod=algod)
+    algorand.set_suggested_params_cache_timeout(0)
+    algorand.account.set_signer_from_account(algod.dispenser)
+    return algorand
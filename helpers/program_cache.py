@@ -0,0 +1,213 @@
+# mypy: ignore-errors
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from algokit_utils import AppManager
+from algokit_utils.models.application import CompiledTeal
+from algosdk import logic
+from algosdk.source_map import SourceMap
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR: Final[str] = ".program_cache"
+
+INT: Final[str] = "int"
+BYTES: Final[str] = "bytes"
+
+# Template values: name -> (kind, value), bytes values hex encoded
+TemplateValues = dict[str, tuple[str, int | str]]
+
+
+class ProgramCache:
+    """
+    On-disk cache of the programs compiled by Algod, keyed by the TEAL template hash
+    and the template values, one directory per template.
+
+    A template compiled once is assembled offline for other template values: bytes
+    values are patched in the cached bytecode, if of the same size and occurring
+    exactly once in it. Int values change the bytecode size, so a new int value is
+    compiled by Algod.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_DIR) -> None:
+        self.path = Path(path)
+        self.hits = 0
+        self.assembled = 0
+        self.compiled = 0
+
+    def install(self, app_manager: AppManager) -> AppManager:
+        """Serves the App Manager template compilations from the cache."""
+        compile_template = app_manager.compile_teal_template
+
+        def compile_teal_template(
+            teal_template_code: str,
+            template_params: Mapping[str, int | str | bytes] | None = None,
+            deployment_metadata: Mapping[str, bool | None] | None = None,
+        ) -> CompiledTeal:
+            teal_code = AppManager.replace_template_variables(
+                AppManager.strip_teal_comments(teal_template_code),
+                template_params or {},
+            )
+            if deployment_metadata:
+                teal_code = AppManager.replace_teal_template_deploy_time_control_params(
+                    teal_code, deployment_metadata
+                )
+            if app_manager.get_compilation_result(teal_code) is None:
+                values = template_values(template_params, deployment_metadata)
+                compiled = self.get(teal_template_code, values, teal_code)
+                if compiled is None:
+                    compiled = app_manager.compile_teal(teal_code)
+                    self.compiled += 1
+                    self.put(teal_template_code, values, compiled)
+                else:
+                    # AppManager has no public setter of its compilation results
+                    app_manager._compilation_results[teal_code] = compiled
+            return compile_template(
+                teal_template_code, template_params, deployment_metadata
+            )
+
+        app_manager.compile_teal_template = compile_teal_template
+        return app_manager
+
+    def get(
+        self, teal_template_code: str, values: TemplateValues, teal_code: str
+    ) -> CompiledTeal | None:
+        template_dir = self.path / _sha256(teal_template_code.encode())
+        entry = _read_entry(template_dir / f"{_values_key(values)}.json")
+        if entry is not None:
+            self.hits += 1
+            return _compiled_teal(teal_code, entry)
+        if not template_dir.is_dir():
+            return None
+        for path in sorted(template_dir.glob("*.json")):
+            cached = _read_entry(path)
+            if cached is None:
+                continue
+            program = _patch_program(
+                base64.b64decode(cached["program"]), _values(cached), values
+            )
+            if program is not None:
+                self.assembled += 1
+                entry = cached | {
+                    "values": values,
+                    "program": base64.b64encode(program).decode(),
+                }
+                _write_entry(template_dir / f"{_values_key(values)}.json", entry)
+                return _compiled_teal(teal_code, entry)
+        return None
+
+    def put(
+        self, teal_template_code: str, values: TemplateValues, compiled: CompiledTeal
+    ) -> None:
+        source_map = compiled.source_map
+        entry = {
+            "values": values,
+            "program": compiled.compiled,
+            "sourcemap": (
+                {
+                    "version": source_map.version,
+                    "sources": source_map.sources,
+                    "names": [],
+                    "mappings": source_map.mappings,
+                }
+                if source_map is not None
+                else None
+            ),
+        }
+        template_dir = self.path / _sha256(teal_template_code.encode())
+        _write_entry(template_dir / f"{_values_key(values)}.json", entry)
+
+
+def template_values(
+    template_params: Mapping[str, int | str | bytes] | None,
+    deployment_metadata: Mapping[str, bool | None] | None = None,
+) -> TemplateValues:
+    """Normalizes the template values as in the TEAL substitution."""
+    values = {}
+    for name, value in (template_params or {}).items():
+        match value:
+            case int():
+                values[name] = (INT, value)
+            case str():
+                values[name] = (BYTES, value.encode().hex())
+            case bytes():
+                values[name] = (BYTES, value.hex())
+            case _:
+                raise ValueError(f"Unexpected template value type {name}: {value}")
+    for name, flag in (deployment_metadata or {}).items():
+        if flag is not None:
+            values[name] = (INT, int(flag))
+    return values
+
+
+def _patch_program(
+    program: bytes, cached: TemplateValues, values: TemplateValues
+) -> bytes | None:
+    """Returns the program for the template values, None if it must be compiled."""
+    if cached.keys() != values.keys():
+        return None
+    patched = bytearray(program)
+    for name, (kind, value) in values.items():
+        cached_kind, cached_value = cached[name]
+        if kind != cached_kind or (kind == INT and value != cached_value):
+            return None
+        if kind == INT:
+            continue
+        old, new = bytes.fromhex(cached_value), bytes.fromhex(value)
+        if old == new:
+            continue
+        # The template value is in the constants: a single occurrence is the value
+        if len(old) != len(new) or program.count(old) != 1:
+            return None
+        offset = program.find(old)
+        patched[offset : offset + len(new)] = new
+    return bytes(patched)
+
+
+def _compiled_teal(teal_code: str, entry: Mapping[str, Any]) -> CompiledTeal:
+    program = base64.b64decode(entry["program"])
+    source_map = entry.get("sourcemap")
+    return CompiledTeal(
+        teal=teal_code,
+        compiled=entry["program"],
+        compiled_hash=logic.address(program),
+        compiled_base64_to_bytes=program,
+        source_map=SourceMap(source_map) if source_map is not None else None,
+    )
+
+
+def _values(entry: Mapping[str, Any]) -> TemplateValues:
+    return {name: tuple(value) for name, value in entry["values"].items()}
+
+
+def _values_key(values: TemplateValues) -> str:
+    return _sha256(json.dumps(values, sort_keys=True).encode())
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _read_entry(path: Path) -> dict[str, Any] | None:
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring corrupted program cache entry {path}: {e}")
+        return None
+
+
+def _write_entry(path: Path, entry: Mapping[str, Any]) -> None:
+    # Atomic replace: concurrent test workers may share the cache
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(entry))
+    tmp.replace(path)
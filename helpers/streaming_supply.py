@@ -0,0 +1,127 @@
+# mypy: ignore-errors
+
+import gzip
+import json
+import logging
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+from algosdk.constants import ZERO_ADDRESS
+
+from helpers.asset_params import AssetParams
+from helpers.circulating_supply import (
+    compute_circulating_supply,
+    non_circulating_addresses,
+)
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyConfig,
+)
+
+logger = logging.getLogger(__name__)
+
+_NO_ASSETS: Final[frozenset[int]] = frozenset()
+
+
+def iter_json_lines(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yields the records of a JSON-lines dump (gzip compressed if `.gz`)."""
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def parse_asset_params(record: Mapping[str, Any]) -> tuple[int, AssetParams | None]:
+    """
+    Parses an ASA record of the params dump, in the Algod/Indexer asset format
+    (`index` and `params`); deleted ASAs have None parameters.
+    """
+    asset_id = record["index"]
+    if record.get("deleted", False):
+        return asset_id, None
+    params = record["params"]
+    return asset_id, AssetParams(
+        asset_id=asset_id,
+        total=params["total"],
+        manager=params.get("manager") or ZERO_ADDRESS,
+        reserve=params.get("reserve") or ZERO_ADDRESS,
+        clawback=params.get("clawback") or ZERO_ADDRESS,
+    )
+
+
+def parse_holding(record: Mapping[str, Any]) -> tuple[str, int, int] | None:
+    """
+    Parses a record of the holdings dump, in the Indexer asset holding format with
+    the holder `address`; closed-out (deleted) holdings are None.
+    """
+    if record.get("deleted", False):
+        return None
+    return record["address"], record["asset-id"], record["amount"]
+
+
+class AddressIndex:
+    """Non-circulating addresses (reserve included) to the ASAs they are set for"""
+
+    def __init__(
+        self,
+        configs: Mapping[int, CirculatingSupplyConfig],
+        params: Mapping[int, AssetParams | None],
+    ) -> None:
+        self._assets: dict[str, set[int]] = defaultdict(set)
+        for asset_id, config in configs.items():
+            asset_params = params.get(asset_id)
+            if asset_params is None:
+                continue
+            for address in non_circulating_addresses(asset_params, config).values():
+                self._assets[address].add(asset_id)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    def assets_of(self, address: str) -> set[int] | frozenset[int]:
+        return self._assets.get(address, _NO_ASSETS)
+
+
+def stream_circulating_supply(
+    configs: Mapping[int, CirculatingSupplyConfig],
+    asset_params: Iterable[Mapping[str, Any]],
+    holdings: Iterable[Mapping[str, Any]],
+) -> Iterator[tuple[int, int | None]]:
+    """
+    Yields the (ASA, circulating supply) of every configured ASA, in ASA order,
+    from the params and holdings dump records, in a single pass over each. The
+    supply is None for the ASAs whose getter fails on underflow (e.g. an address
+    set on many labels).
+
+    Memory is bounded by the configs: only the parameters of configured ASAs and the
+    balances of their non-circulating addresses are kept. ASAs missing from the
+    params dump do not exist and have zero supply, as for the ARC-62 getter.
+    """
+    params: dict[int, AssetParams | None] = {}
+    for record in asset_params:
+        asset_id, parsed = parse_asset_params(record)
+        if asset_id in configs:
+            params[asset_id] = parsed
+
+    index = AddressIndex(configs, params)
+    balances: dict[int, dict[str, int]] = defaultdict(dict)
+    for record in holdings:
+        holding = parse_holding(record)
+        if holding is None:
+            continue
+        address, asset_id, amount = holding
+        if asset_id in index.assets_of(address):
+            balances[asset_id][address] = amount
+
+    for asset_id in sorted(configs):
+        try:
+            supply = compute_circulating_supply(
+                params.get(asset_id), configs[asset_id], balances.get(asset_id, {})
+            )
+        except ArithmeticError as e:
+            logger.warning(str(e))
+            supply = None
+        yield asset_id, supply
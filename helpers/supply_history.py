@@ -0,0 +1,344 @@
+# mypy: ignore-errors
+
+import dataclasses
+import json
+import logging
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, Final
+
+import msgpack
+from algosdk.constants import ZERO_ADDRESS
+from algosdk.encoding import encode_address
+from algosdk.transaction import OnComplete
+from algosdk.v2client.algod import AlgodClient
+
+from helpers.app_calls import apply_config_update, decode_config_update
+from helpers.asset_params import AssetParams
+from helpers.circulating_supply import (
+    compute_circulating_supply,
+    non_circulating_addresses,
+)
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyConfig,
+)
+
+logger = logging.getLogger(__name__)
+
+BLOCK_FILE_SUFFIX: Final[str] = ".msgp"
+SECONDS_PER_DAY: Final[int] = 86_400
+
+
+class ReplayError(Exception):
+    """The replay state lacks data required to compute a circulating supply"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SupplyPoint:
+    """ASA circulating supply at the end of a round (None if the config is deleted)"""
+
+    round: int
+    timestamp: int
+    asset_id: int
+    supply: int | None
+
+
+@dataclasses.dataclass
+class ReplayState:
+    """
+    Ledger state required by the replay: App configs, ASA parameters (None if
+    destroyed) and the ASA balances of tracked accounts (None if unknown). Every
+    holder of the ASAs created during the replay is tracked (`created`).
+    """
+
+    round: int = 0
+    configs: dict[int, CirculatingSupplyConfig] = dataclasses.field(
+        default_factory=dict
+    )
+    params: dict[int, AssetParams | None] = dataclasses.field(default_factory=dict)
+    balances: dict[int, dict[str, int | None]] = dataclasses.field(default_factory=dict)
+    created: set[int] = dataclasses.field(default_factory=set)
+
+    def save(self, path: str | Path) -> None:
+        """Saves the state as JSON, to resume a replay from the next round."""
+        data = {
+            "round": self.round,
+            "configs": {a: dataclasses.asdict(c) for a, c in self.configs.items()},
+            "params": {
+                a: dataclasses.asdict(p) if p is not None else None
+                for a, p in self.params.items()
+            },
+            "balances": self.balances,
+            "created": sorted(self.created),
+        }
+        Path(path).write_text(json.dumps(data))
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ReplayState":
+        data = json.loads(Path(path).read_text())
+        return cls(
+            round=data["round"],
+            configs={
+                int(a): CirculatingSupplyConfig(**c) for a, c in data["configs"].items()
+            },
+            params={
+                int(a): AssetParams(**p) if p is not None else None
+                for a, p in data["params"].items()
+            },
+            balances={int(a): b for a, b in data["balances"].items()},
+            created=set(data.get("created", [])),
+        )
+
+
+class SupplyReplay:
+    """
+    Replays blocks to compute the circulating supply history of every ASA configured
+    in the CirculatingSupply App, in a single streaming pass.
+
+    Balances are tracked only for the ASAs seeded in the initial state or created
+    during the replay. Every holder of an ASA created during the replay is tracked,
+    from its creation. For a seeded ASA, only its seeded accounts and its
+    non-circulating addresses (the reserve and the config labels, added as the ASA
+    reconfigurations and `set_not_circulating_address` calls are replayed) are
+    tracked: an address named while untracked has an unknown balance, which fails
+    the replay, so the seed must include every such account.
+    """
+
+    def __init__(self, app_id: int, state: ReplayState | None = None) -> None:
+        self.app_id = app_id
+        self.state = state or ReplayState()
+        self._supplies: dict[int, int] = {}
+
+    def replay(self, blocks: Iterable[Mapping[str, Any]]) -> Iterator[SupplyPoint]:
+        """Yields a point for each configured ASA whose supply changed in a round."""
+        first = True
+        for block in blocks:
+            header = block.get("block", block)
+            round_num, timestamp = header["rnd"], header.get("ts", 0)
+            if round_num <= self.state.round:
+                raise ValueError(f"Block {round_num} already replayed")
+            touched = set(self.state.configs) if first else set()
+            first = False
+            for stxn in header.get("txns", []):
+                self._apply_transaction(stxn, touched)
+            self.state.round = round_num
+            for asset_id in sorted(touched):
+                if (
+                    asset_id not in self.state.configs
+                    and asset_id not in self._supplies
+                ):
+                    continue  # Not configured, nor with a series to close
+                supply = self._supply(asset_id)
+                if asset_id in self._supplies and self._supplies[asset_id] == supply:
+                    continue
+                yield SupplyPoint(round_num, timestamp, asset_id, supply)
+                if supply is None:
+                    del self._supplies[asset_id]
+                else:
+                    self._supplies[asset_id] = supply
+
+    def _supply(self, asset_id: int) -> int | None:
+        config = self.state.configs.get(asset_id)
+        if config is None:
+            return None
+        if asset_id not in self.state.params:
+            raise ReplayError(f"Unknown parameters of ASA {asset_id}")
+        params = self.state.params[asset_id]
+        if params is None:
+            return 0
+        if asset_id not in self.state.balances:
+            raise ReplayError(f"Unknown balances of ASA {asset_id}")
+        balances = self.state.balances[asset_id]
+        for address in non_circulating_addresses(params, config).values():
+            if address in balances and balances[address] is None:
+                raise ReplayError(f"Unknown balance of {address} for ASA {asset_id}")
+        return compute_circulating_supply(params, config, balances)
+
+    def _tracked(self, asset_id: int) -> bool:
+        return asset_id in self.state.balances
+
+    def _track(self, asset_id: int, address: str) -> None:
+        """Tracks a non-circulating address, with unknown balance if untracked."""
+        if self._tracked(asset_id) and address != ZERO_ADDRESS:
+            # Untracked holders of created ASAs never opted in
+            unknown = None if asset_id not in self.state.created else 0
+            self.state.balances[asset_id].setdefault(address, unknown)
+
+    def _apply_transaction(self, stxn: Mapping[str, Any], touched: set[int]) -> None:
+        txn = stxn.get("txn", stxn)
+        match txn.get("type"):
+            case "acfg":
+                self._apply_asset_config(stxn, txn, touched)
+            case "axfer":
+                self._apply_asset_transfer(stxn, txn, touched)
+            case "appl":
+                self._apply_app_call(txn, touched)
+        # Inner transactions are executed during their outer transaction
+        for inner in stxn.get("dt", {}).get("itx", []):
+            self._apply_transaction(inner, touched)
+
+    def _apply_asset_config(
+        self, stxn: Mapping[str, Any], txn: Mapping[str, Any], touched: set[int]
+    ) -> None:
+        apar = txn.get("apar", {})
+        asset_id = txn.get("caid", 0)
+        if not asset_id:  # Creation
+            asset_id = stxn["caid"]
+            creator = _address(txn["snd"])
+            params = self.state.params[asset_id] = _asset_params(
+                asset_id, apar.get("t", 0), apar
+            )
+            # Only the creator holds units at creation
+            self.state.balances[asset_id] = {creator: params.total}
+            self.state.created.add(asset_id)
+        elif not apar:  # Destroy
+            self.state.params[asset_id] = None
+            self.state.balances.pop(asset_id, None)
+            self.state.created.discard(asset_id)
+        else:  # Reconfiguration (total is immutable)
+            params = self.state.params.get(asset_id)
+            if params is not None:
+                params = self.state.params[asset_id] = _asset_params(
+                    asset_id, params.total, apar
+                )
+                self._track(asset_id, params.reserve)
+        touched.add(asset_id)
+
+    def _apply_asset_transfer(
+        self, stxn: Mapping[str, Any], txn: Mapping[str, Any], touched: set[int]
+    ) -> None:
+        asset_id = txn.get("xaid", 0)
+        if not self._tracked(asset_id):
+            return
+        holdings = self.state.balances[asset_id]
+        sender = _address(txn["snd"])
+        source = _address(txn["asnd"]) if "asnd" in txn else sender
+        receiver = _address(txn.get("arcv", b""))
+        amount = txn.get("aamt", 0)
+        close_to = _address(txn["aclose"]) if "aclose" in txn else ZERO_ADDRESS
+        if asset_id in self.state.created:
+            # Tracks every holder, from its opt-in (zero self-transfer)
+            for address in (source, receiver, close_to):
+                if address != ZERO_ADDRESS:
+                    holdings.setdefault(address, 0)
+
+        if holdings.get(source) is not None:
+            holdings[source] -= amount
+        if holdings.get(receiver) is not None:
+            holdings[receiver] += amount
+        if "aclose" in txn:  # Opt-out
+            closing_amount = stxn.get("aca", holdings.get(source) or 0)
+            if holdings.get(close_to) is not None:
+                holdings[close_to] += closing_amount
+            if source in holdings:
+                holdings[source] = 0  # Still tracked, as not opted-in
+        touched.add(asset_id)
+
+    def _apply_app_call(self, txn: Mapping[str, Any], touched: set[int]) -> None:
+        if (
+            txn.get("apid", 0) != self.app_id
+            or txn.get("apan", OnComplete.NoOpOC) != OnComplete.NoOpOC
+        ):
+            return
+        update = decode_config_update(list(txn.get("apaa", [])))
+        if update is None:
+            return
+        config = apply_config_update(self.state.configs.get(update.asset_id), update)
+        if config is None:
+            self.state.configs.pop(update.asset_id, None)
+        else:
+            self.state.configs[update.asset_id] = config
+        if update.address is not None:
+            self._track(update.asset_id, update.address)
+        touched.add(update.asset_id)
+
+
+def _address(value: bytes | str) -> str:
+    if not value:
+        return ZERO_ADDRESS
+    return encode_address(value) if isinstance(value, bytes) else value
+
+
+def _asset_params(asset_id: int, total: int, apar: Mapping[str, Any]) -> AssetParams:
+    return AssetParams(
+        asset_id=asset_id,
+        total=total,
+        manager=_address(apar.get("m")),
+        reserve=_address(apar.get("r")),
+        clawback=_address(apar.get("c")),
+    )
+
+
+def daily_supply(points: Iterable[SupplyPoint]) -> Iterator[SupplyPoint]:
+    """
+    Reduces a (round ordered) supply history to the last point of each UTC day, for
+    every ASA with a supply. The daily point of days with no changes repeats the
+    previous supply.
+    """
+    current_day: int | None = None
+    last: dict[int, SupplyPoint] = {}
+    for point in points:
+        day = point.timestamp // SECONDS_PER_DAY
+        if current_day is not None and day > current_day:
+            yield from _day_close(current_day, last)
+            for skipped_day in range(current_day + 1, day):
+                yield from _day_close(skipped_day, last)
+        current_day = day
+        if point.supply is None:
+            last.pop(point.asset_id, None)
+        else:
+            last[point.asset_id] = point
+    if current_day is not None:
+        yield from _day_close(current_day, last)
+
+
+def _day_close(day: int, last: Mapping[int, SupplyPoint]) -> Iterator[SupplyPoint]:
+    day_end = (day + 1) * SECONDS_PER_DAY - 1
+    for asset_id in sorted(last):
+        point = last[asset_id]
+        yield SupplyPoint(point.round, day_end, asset_id, point.supply)
+
+
+# ------------------------------ Block sources ------------------------------ #
+
+
+def decode_block(raw: bytes) -> dict[str, Any]:
+    """Decodes an Algod msgpack block (addresses and arguments as raw bytes)."""
+    return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+def iter_algod_blocks(
+    algod: AlgodClient, first_round: int, last_round: int
+) -> Iterator[dict[str, Any]]:
+    for round_num in range(first_round, last_round + 1):
+        yield decode_block(algod.block_info(round_num, response_format="msgpack"))
+
+
+def iter_block_files(
+    directory: str | Path, first_round: int = 0, last_round: int | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yields the blocks stored as `<round>.msgp` files, in round order (offline)."""
+    files = sorted(
+        (int(f.stem), f)
+        for f in Path(directory).glob(f"*{BLOCK_FILE_SUFFIX}")
+        if f.stem.isdigit()
+    )
+    for round_num, file in files:
+        if round_num < first_round or (
+            last_round is not None and round_num > last_round
+        ):
+            continue
+        yield decode_block(file.read_bytes())
+
+
+def dump_algod_blocks(
+    algod: AlgodClient, first_round: int, last_round: int, directory: str | Path
+) -> None:
+    """Stores Algod blocks as `<round>.msgp` files, for offline replays."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for round_num in range(first_round, last_round + 1):
+        file = directory / f"{round_num}{BLOCK_FILE_SUFFIX}"
+        if not file.exists():
+            file.write_bytes(algod.block_info(round_num, response_format="msgpack"))
+    logger.info(f"Stored blocks {first_round}-{last_round} in {directory}")
@@ -0,0 +1,310 @@
+# mypy: ignore-errors
+
+import dataclasses
+import json
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Final
+from urllib.parse import parse_qs, urlsplit
+
+from algokit_utils import CommonAppCallParams, LogicError
+from algosdk.error import AlgodHTTPError, AlgodResponseError
+
+from smart_contracts import errors as err
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    Arc62GetCirculatingSupplyArgs,
+    CirculatingSupplyClient,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL: Final[float] = 5.0
+DEFAULT_MAX_CONCURRENCY: Final[int] = 4
+MAX_GROUP_SIZE: Final[int] = 16
+MAX_BATCH_SIZE: Final[int] = 256
+MAX_CACHE_SIZE: Final[int] = 100_000
+
+SUPPLY_PATH: Final[str] = "/v1/supply"
+ROUND_HEADER: Final[str] = "X-Algorand-Round"
+
+
+class SupplyError(Exception):
+    """The circulating supply could not be read"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SupplyResult:
+    """
+    ASA circulating supply at a round (None if the ASA has no config, or if its read
+    failed with an `error`)
+    """
+
+    asset_id: int
+    supply: int | None
+    round: int
+    error: str | None = None
+
+    def to_json(self) -> dict[str, int | str | None]:
+        data = {
+            "asset-id": self.asset_id,
+            "circulating-supply": self.supply,
+            "round": self.round,
+        }
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+# Source returns the supplies of the ASAs (None if not configured, the error if the
+# read failed) and their round; with no ASAs, it returns only the current round
+SupplySource = Callable[[list[int]], tuple[dict[int, int | SupplyError | None], int]]
+
+
+def simulate_supply_source(
+    client: CirculatingSupplyClient, sender: str | None = None
+) -> SupplySource:
+    """
+    Returns a source simulating the ARC-62 getter, with a single group for up to
+    `MAX_GROUP_SIZE` ASAs (no signature, resources populated by the simulation).
+    A failing getter is isolated, so that it does not fail the other ASAs.
+    The simulation `sender` defaults to the client default sender.
+    """
+
+    def last_round() -> int:
+        return client.algorand.client.algod.status()["last-round"]
+
+    def simulate(
+        asset_ids: list[int],
+    ) -> tuple[dict[int, int | SupplyError | None], int]:
+        if not asset_ids:
+            return {}, last_round()
+        group = client.new_group()
+        for asset_id in asset_ids:
+            group.arc62_get_circulating_supply(
+                args=Arc62GetCirculatingSupplyArgs(asset_id=asset_id),
+                params=CommonAppCallParams(sender=sender),
+            )
+        try:
+            result = group.simulate(allow_unnamed_resources=True, skip_signatures=True)
+        except LogicError as e:
+            # The simulation raises on the group failure message, Algod errors propagate
+            failure = str(e)
+        else:
+            return {
+                a: r.value for a, r in zip(asset_ids, result.returns, strict=True)
+            }, result.simulate_response["last-round"]
+        if len(asset_ids) > 1:
+            # A failing getter fails the whole group: isolate it
+            supplies, round_num = {}, 0
+            for asset_id in asset_ids:
+                supply, asset_round = simulate([asset_id])
+                supplies.update(supply)
+                round_num = max(round_num, asset_round)
+            return supplies, round_num
+        if err.CONFIG_NOT_EXISTS in failure:
+            return {asset_ids[0]: None}, last_round()
+        return {asset_ids[0]: SupplyError(failure)}, last_round()
+
+    return simulate
+
+
+class SupplyService:
+    """
+    Circulating supply service for many concurrent requests: results are cached for
+    a TTL, concurrent misses of the same ASA are coalesced into a single read, and
+    misses are read in groups with bounded concurrency towards Algod. Failed reads
+    are returned with their error, and are not cached.
+    """
+
+    def __init__(
+        self,
+        source: SupplySource,
+        *,
+        ttl: float = DEFAULT_TTL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        might_have_config: Callable[[int], bool] | None = None,
+    ) -> None:
+        self._source = source
+        self._ttl = ttl
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._might_have_config = might_have_config
+        self._cache: dict[int, tuple[SupplyResult, float]] = {}
+        self._inflight: dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self.reads = 0
+
+    @classmethod
+    def from_client(
+        cls,
+        client: CirculatingSupplyClient,
+        *,
+        sender: str | None = None,
+        **kwargs: Any,
+    ) -> "SupplyService":
+        return cls(simulate_supply_source(client, sender), **kwargs)
+
+    def get(self, asset_id: int) -> SupplyResult:
+        return self.get_many([asset_id])[asset_id]
+
+    def get_many(self, asset_ids: Iterable[int]) -> dict[int, SupplyResult]:
+        asset_ids = list(dict.fromkeys(asset_ids))
+        results: dict[int, SupplyResult] = {}
+        waiting: dict[int, Future] = {}
+        owned: dict[int, Future] = {}
+        now = time.monotonic()
+        with self._lock:
+            if len(self._cache) > MAX_CACHE_SIZE:
+                self._cache = {a: c for a, c in self._cache.items() if c[1] > now}
+            for asset_id in asset_ids:
+                cached = self._cache.get(asset_id)
+                if cached is not None and cached[1] > now:
+                    results[asset_id] = cached[0]
+                elif asset_id in self._inflight:
+                    waiting[asset_id] = self._inflight[asset_id]
+                else:
+                    owned[asset_id] = self._inflight[asset_id] = Future()
+
+        if owned:
+            self._read(list(owned), owned)
+        for asset_id, future in (owned | waiting).items():
+            results[asset_id] = future.result()
+        return {asset_id: results[asset_id] for asset_id in asset_ids}
+
+    def _read(self, asset_ids: list[int], futures: dict[int, Future]) -> None:
+        try:
+            for i in range(0, len(asset_ids), MAX_GROUP_SIZE):
+                batch = asset_ids[i : i + MAX_GROUP_SIZE]
+                for result in self._read_batch(batch):
+                    self._resolve(futures[result.asset_id], result)
+        except Exception as e:
+            # Fails all the pending reads once, with the source error
+            with self._lock:
+                for asset_id, future in futures.items():
+                    if not future.done():
+                        self._inflight.pop(asset_id, None)
+                        future.set_exception(e)
+            raise
+
+    def _read_batch(self, asset_ids: list[int]) -> list[SupplyResult]:
+        unconfigured = []
+        if self._might_have_config is not None:
+            unconfigured = [a for a in asset_ids if not self._might_have_config(a)]
+            asset_ids = [a for a in asset_ids if a not in unconfigured]
+        with self._semaphore:
+            # With every ASA filtered out, reads only the current round
+            self.reads += 1
+            supplies, round_num = self._source(asset_ids)
+        return [_result(a, supplies[a], round_num) for a in asset_ids] + [
+            SupplyResult(a, None, round_num) for a in unconfigured
+        ]
+
+    def _resolve(self, future: Future, result: SupplyResult) -> None:
+        with self._lock:
+            if result.error is None:
+                self._cache[result.asset_id] = (result, time.monotonic() + self._ttl)
+            self._inflight.pop(result.asset_id, None)
+        future.set_result(result)
+
+
+class SupplyRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the `SupplyService`:
+
+    - `GET /v1/supply/<asset_id>`: plain-text supply (JSON with `?format=json`);
+    - `GET /v1/supply?asset-ids=<id>,<id>,...`: JSON list of supplies.
+
+    Responses carry the Algod round of the supply in the `X-Algorand-Round` header.
+    """
+
+    server: "SupplyServer"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        try:
+            if url.path.startswith(SUPPLY_PATH + "/"):
+                asset_id = _parse_asset_id(url.path.removeprefix(SUPPLY_PATH + "/"))
+                self._send_single(
+                    self.server.service.get(asset_id),
+                    as_json=query.get("format") == ["json"],
+                )
+            elif url.path == SUPPLY_PATH:
+                asset_ids = [
+                    _parse_asset_id(a)
+                    for a in ",".join(query.get("asset-ids", [])).split(",")
+                    if a
+                ]
+                if not asset_ids or len(asset_ids) > MAX_BATCH_SIZE:
+                    raise ValueError(f"Expected 1 to {MAX_BATCH_SIZE} ASA IDs")
+                self._send_batch(list(self.server.service.get_many(asset_ids).values()))
+            else:
+                self._send(HTTPStatus.NOT_FOUND, {"message": "Not found"})
+        except ValueError as e:
+            self._send(HTTPStatus.BAD_REQUEST, {"message": str(e)})
+        except (SupplyError, AlgodHTTPError, AlgodResponseError, OSError) as e:
+            logger.exception("Circulating supply request failed")
+            self._send(HTTPStatus.BAD_GATEWAY, {"message": str(e)})
+
+    def _send_single(self, result: SupplyResult, *, as_json: bool) -> None:
+        if result.error is not None:
+            self._send(HTTPStatus.BAD_GATEWAY, {"message": result.error}, result.round)
+        elif result.supply is None:
+            self._send(
+                HTTPStatus.NOT_FOUND, {"message": err.CONFIG_NOT_EXISTS}, result.round
+            )
+        elif as_json:
+            self._send(HTTPStatus.OK, result.to_json(), result.round)
+        else:
+            self._send(HTTPStatus.OK, str(result.supply), result.round)
+
+    def _send_batch(self, results: list[SupplyResult]) -> None:
+        self._send(
+            HTTPStatus.OK,
+            {"supplies": [r.to_json() for r in results]},
+            max(r.round for r in results),
+        )
+
+    def _send(
+        self, status: HTTPStatus, body: str | dict[str, Any], round_num: int = 0
+    ) -> None:
+        if isinstance(body, str):
+            content, content_type = body.encode(), "text/plain; charset=utf-8"
+        else:
+            content, content_type = json.dumps(body).encode(), "application/json"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        if round_num:
+            self.send_header(ROUND_HEADER, str(round_num))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug(format % args)
+
+
+class SupplyServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: SupplyService) -> None:
+        super().__init__(address, SupplyRequestHandler)
+        self.service = service
+
+
+def _result(
+    asset_id: int, supply: int | SupplyError | None, round_num: int
+) -> SupplyResult:
+    if isinstance(supply, SupplyError):
+        return SupplyResult(asset_id, None, round_num, str(supply))
+    return SupplyResult(asset_id, supply, round_num)
+
+
+def _parse_asset_id(value: str) -> int:
+    if not value.isdigit():
+        raise ValueError(f"Invalid ASA ID: {value}")
+    return int(value)
@@ -0,0 +1,332 @@
+# mypy: ignore-errors
+
+import bisect
+import dataclasses
+import itertools
+import mmap
+import struct
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Final
+
+from helpers.supply_history import SECONDS_PER_DAY, SupplyPoint
+
+CHUNK_SIZE: Final[int] = 1024
+SECONDS_PER_HOUR: Final[int] = 3_600
+
+HOURLY: Final[str] = "hourly"
+DAILY: Final[str] = "daily"
+ROLLUP_PERIODS: Final[dict[str, int]] = {
+    HOURLY: SECONDS_PER_HOUR,
+    DAILY: SECONDS_PER_DAY,
+}
+
+INDEX_FILE: Final[str] = "index.bin"
+DATA_FILE: Final[str] = "data.bin"
+
+# Chunk index record: first round, last round, first timestamp, first supply,
+# data offset, data size, points count
+_INDEX_RECORD: Final = struct.Struct("<QQQQQQQ")
+# Rollup record: bucket start, min, max, last supply, last round
+_ROLLUP_RECORD: Final = struct.Struct("<QQQQQ")
+_U64: Final = struct.Struct("<Q")
+
+# Column values are uint64, deltas are taken modulo 2^64
+_U64_MOD: Final[int] = 1 << 64
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SupplyRollup:
+    """Circulating supply min/max/last over a time bucket"""
+
+    start: int
+    min: int
+    max: int
+    last: int
+    last_round: int
+
+
+class SupplyStore:
+    """
+    Compact columnar store of circulating supply histories, one directory per ASA.
+
+    Each ASA series is split in chunks of round, timestamp and supply columns, delta
+    and varint encoded, plus a bitmap of the deleted configs (None supply), indexed
+    by a fixed-size chunk index; hourly and daily min/max/last rollups are stored
+    as fixed-size records. Reads memory-map the files and decode only the chunks
+    overlapping the queried range.
+    """
+
+    def __init__(self, path: str | Path, *, chunk_size: int = CHUNK_SIZE) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        self._buffers: dict[int, _ColumnsBuffer] = {}
+
+    def __enter__(self) -> "SupplyStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.flush()
+
+    def assets(self) -> list[int]:
+        return sorted(int(d.name) for d in self.path.iterdir() if d.name.isdigit())
+
+    # ------------------------------ Write ------------------------------ #
+
+    def append(self, points: Iterable[SupplyPoint]) -> None:
+        """Appends points; each ASA series must be appended in round order."""
+        for point in points:
+            buffer = self._buffers.get(point.asset_id)
+            if buffer is None:
+                buffer = self._buffers[point.asset_id] = _ColumnsBuffer(
+                    last_round=self._last_round(point.asset_id)
+                )
+            if point.round <= buffer.last_round:
+                raise ValueError(
+                    f"Round {point.round} of ASA {point.asset_id} is not after "
+                    f"the last stored round {buffer.last_round}"
+                )
+            buffer.append(point)
+            if len(buffer) >= self.chunk_size:
+                self._flush_asset(point.asset_id)
+
+    def flush(self) -> None:
+        for asset_id in list(self._buffers):
+            self._flush_asset(asset_id)
+        self._buffers.clear()
+
+    def _flush_asset(self, asset_id: int) -> None:
+        buffer = self._buffers[asset_id]
+        if not len(buffer):
+            return
+        asset_dir = self.path / str(asset_id)
+        asset_dir.mkdir(exist_ok=True)
+        data = _encode_chunk(buffer)
+        with open(asset_dir / DATA_FILE, "ab") as f:
+            offset = f.tell()
+            f.write(data)
+        with open(asset_dir / INDEX_FILE, "ab") as f:
+            f.write(
+                _INDEX_RECORD.pack(
+                    buffer.rounds[0],
+                    buffer.rounds[-1],
+                    buffer.timestamps[0],
+                    buffer.supplies[0],
+                    offset,
+                    len(data),
+                    len(buffer),
+                )
+            )
+        for period, seconds in ROLLUP_PERIODS.items():
+            _append_rollups(asset_dir / f"{period}.bin", buffer, seconds)
+        self._buffers[asset_id] = _ColumnsBuffer(last_round=buffer.rounds[-1])
+
+    def _last_round(self, asset_id: int) -> int:
+        index = self.path / str(asset_id) / INDEX_FILE
+        if not index.exists() or not index.stat().st_size:
+            return -1
+        with open(index, "rb") as f:
+            f.seek(-_INDEX_RECORD.size, 2)
+            return _INDEX_RECORD.unpack(f.read())[1]
+
+    # ------------------------------ Read ------------------------------- #
+
+    def query(
+        self, asset_id: int, first_round: int = 0, last_round: int | None = None
+    ) -> Iterator[SupplyPoint]:
+        """Yields the stored points in the round range (inclusive)."""
+        asset_dir = self.path / str(asset_id)
+        with _MappedFile(asset_dir / INDEX_FILE) as index, _MappedFile(
+            asset_dir / DATA_FILE
+        ) as data:
+            if index is None or data is None:
+                return
+            chunks = len(index) // _INDEX_RECORD.size
+            # First chunk whose last round is in range
+            start = bisect.bisect_left(
+                range(chunks),
+                first_round,
+                key=lambda i: _U64.unpack_from(index, i * _INDEX_RECORD.size + 8)[0],
+            )
+            for i in range(start, chunks):
+                record = _INDEX_RECORD.unpack_from(index, i * _INDEX_RECORD.size)
+                first, _last, timestamp, supply, offset, size, count = record
+                if last_round is not None and first > last_round:
+                    break
+                for point in _decode_chunk(
+                    asset_id,
+                    data[offset : offset + size],
+                    first,
+                    timestamp,
+                    supply,
+                    count,
+                ):
+                    if point.round < first_round:
+                        continue
+                    if last_round is not None and point.round > last_round:
+                        return
+                    yield point
+
+    def rollups(
+        self, asset_id: int, period: str, start: int = 0, end: int | None = None
+    ) -> Iterator[SupplyRollup]:
+        """Yields the rollups of the buckets starting in the time range [start, end)."""
+        path = self.path / str(asset_id) / f"{period}.bin"
+        with _MappedFile(path) as rollups:
+            if rollups is None:
+                return
+            count = len(rollups) // _ROLLUP_RECORD.size
+            i = bisect.bisect_left(
+                range(count),
+                start,
+                key=lambda j: _U64.unpack_from(rollups, j * _ROLLUP_RECORD.size)[0],
+            )
+            for j in range(i, count):
+                rollup = SupplyRollup(
+                    *_ROLLUP_RECORD.unpack_from(rollups, j * _ROLLUP_RECORD.size)
+                )
+                if end is not None and rollup.start >= end:
+                    break
+                yield rollup
+
+
+class _ColumnsBuffer:
+    def __init__(self, last_round: int) -> None:
+        self.last_round = last_round
+        self.rounds = array("Q")
+        self.timestamps = array("Q")
+        self.supplies = array("Q")
+        # Deleted config flags; their supply repeats the previous one (zero delta)
+        self.absent = array("B")
+
+    def __len__(self) -> int:
+        return len(self.rounds)
+
+    def append(self, point: SupplyPoint) -> None:
+        self.rounds.append(point.round)
+        self.timestamps.append(point.timestamp)
+        absent = point.supply is None
+        previous = self.supplies[-1] if self.supplies else 0
+        self.supplies.append(previous if absent else point.supply)
+        self.absent.append(absent)
+        self.last_round = point.round
+
+    def present(self) -> Iterator[tuple[int, int, int]]:
+        """Yields the round, timestamp and supply of the points with a config."""
+        for round_num, timestamp, supply, absent in zip(
+            self.rounds, self.timestamps, self.supplies, self.absent, strict=True
+        ):
+            if not absent:
+                yield round_num, timestamp, supply
+
+
+class _MappedFile:
+    """Read-only memory map of a file (None if missing or empty)"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file = None
+        self._mmap = None
+
+    def __enter__(self) -> mmap.mmap | None:
+        if not self.path.exists() or not self.path.stat().st_size:
+            return None
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def __exit__(self, *exc: object) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+
+
+def _encode_chunk(buffer: _ColumnsBuffer) -> bytes:
+    out = bytearray()
+    for column in (buffer.rounds, buffer.timestamps, buffer.supplies):
+        for prev, value in itertools.pairwise(column):
+            _write_uvarint(out, _zigzag(_delta(prev, value)))
+    bitmap = bytearray((len(buffer) + 7) // 8)
+    for i, absent in enumerate(buffer.absent):
+        bitmap[i // 8] |= absent << (i % 8)
+    return bytes(out + bitmap)
+
+
+def _decode_chunk(
+    asset_id: int,
+    data: bytes,
+    first_round: int,
+    first_timestamp: int,
+    first_supply: int,
+    count: int,
+) -> Iterator[SupplyPoint]:
+    pos = 0
+    columns = []
+    for first in (first_round, first_timestamp, first_supply):
+        column = [first]
+        for _ in range(count - 1):
+            delta, pos = _read_uvarint(data, pos)
+            column.append((column[-1] + _unzigzag(delta)) % _U64_MOD)
+        columns.append(column)
+    for i, (round_num, timestamp, supply) in enumerate(zip(*columns, strict=True)):
+        absent = data[pos + i // 8] >> (i % 8) & 1
+        yield SupplyPoint(round_num, timestamp, asset_id, None if absent else supply)
+
+
+def _append_rollups(path: Path, buffer: _ColumnsBuffer, seconds: int) -> None:
+    rollups: list[list[int]] = []
+    # Merge into the last stored bucket, if still open
+    tail = None
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb") as f:
+            f.seek(-_ROLLUP_RECORD.size, 2)
+            tail = list(_ROLLUP_RECORD.unpack(f.read()))
+            rollups.append(tail)
+    for round_num, timestamp, supply in buffer.present():
+        start = timestamp - timestamp % seconds
+        if rollups and rollups[-1][0] == start:
+            bucket = rollups[-1]
+            bucket[1] = min(bucket[1], supply)
+            bucket[2] = max(bucket[2], supply)
+            bucket[3] = supply
+            bucket[4] = round_num
+        else:
+            rollups.append([start, supply, supply, supply, round_num])
+    with open(path, "r+b" if tail is not None else "wb") as f:
+        f.seek(-_ROLLUP_RECORD.size if tail is not None else 0, 2)
+        for bucket in rollups:
+            f.write(_ROLLUP_RECORD.pack(*bucket))
+
+
+def _delta(prev: int, value: int) -> int:
+    """Returns the uint64 delta as a signed int64, wrapping modulo 2^64."""
+    delta = (value - prev) % _U64_MOD
+    return delta - _U64_MOD if delta >= _U64_MOD >> 1 else delta
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+
+def _write_uvarint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_uvarint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
@@ -1,27 +1,56 @@
+import ast
 import dataclasses
+import hashlib
 import importlib
+import importlib.util
+import json
 import logging
+import os
 import subprocess
 import sys
-from collections.abc import Callable
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from shutil import rmtree
+from typing import TypedDict, cast
 
-from algokit_utils.config import config
 from dotenv import load_dotenv
 
-# Set up logging and load environment variables.
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s %(levelname)-10s: %(message)s"
+from helpers.build_report import (
+    BuildBudget,
+    app_interfaces,
+    build_reports,
+    cheapest_variant,
+    check_budget,
+    diff_reports,
+    save_build_reports,
 )
+from helpers.client_generation import make_client_file_lazy
+
 logger = logging.getLogger(__name__)
-logger.info("Loading .env")
-load_dotenv()
 
-# Set trace_all to True to capture all transactions, defaults to capturing traces only on failure
-# Learn more about using AlgoKit AVM Debugger to debug your TEAL source codes and inspect various kinds of
-# Algorand transactions in atomic groups -> https://github.com/algorandfoundation/algokit-avm-vscode-debugger
-config.configure(debug=True, trace_all=False, logger=logger)
+
+@contextmanager
+def _timed(label: str) -> Iterator[None]:
+    """Logs (debug) the time spent in the block, e.g. importing heavy modules."""
+    start = time.perf_counter()
+    yield
+    logger.debug(f"{label} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def _configure_cli() -> None:
+    """Sets up logging (`LOG_LEVEL` environment variable) and loads the `.env`."""
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO"),
+        format="%(asctime)s %(levelname)-10s: %(message)s",
+    )
+    logger.info("Loading .env")
+    with _timed("Loaded .env"):
+        load_dotenv()
+
 
 # Determine the root path based on this file's location.
 root_path = Path(__file__).parent
@@ -46,13 +75,27 @@ def import_contract(folder: Path) -> Path:
 
 
 def import_deploy_if_exists(folder: Path) -> Callable[[], None] | None:
-    """Imports the deploy function from a folder if it exists."""
-    try:
-        module_name = f"{folder.parent.name}.{folder.name}.deploy_config"
-        deploy_module = importlib.import_module(module_name)
-        return deploy_module.deploy  # type: ignore[no-any-return, misc]
-    except ImportError:
+    """
+    Returns the deploy function from a folder if it exists. The deploy module and
+    its dependencies are imported on the first call only, so that the other
+    actions do not pay for them.
+    """
+    if not (folder / "deploy_config.py").exists():
         return None
+    module_name = f"{folder.parent.name}.{folder.name}.deploy_config"
+
+    def deploy() -> None:
+        with _timed(f"Imported {module_name}"):
+            from algokit_utils.config import config
+
+            # Set trace_all to True to capture all transactions, defaults to capturing traces only on failure
+            # Learn more about using AlgoKit AVM Debugger to debug your TEAL source codes and inspect various kinds of
+            # Algorand transactions in atomic groups -> https://github.com/algorandfoundation/algokit-avm-vscode-debugger
+            config.configure(debug=True, trace_all=False, logger=logger)
+            deploy_module = importlib.import_module(module_name)
+        deploy_module.deploy()
+
+    return deploy
 
 
 def has_contract_file(directory: Path) -> bool:
@@ -68,7 +111,7 @@ contracts: list[SmartContract] = [
         name=folder.name,
         deploy=import_deploy_if_exists(folder),
     )
-    for folder in root_path.iterdir()
+    for folder in sorted(root_path.iterdir())
     if folder.is_dir() and has_contract_file(folder) and not folder.name.startswith("_")
 ]
 
@@ -86,17 +129,142 @@ def _get_output_path(output_dir: Path, deployment_extension: str) -> Path:
     )
 
 
-def build(output_dir: Path, contract_path: Path) -> Path:
-    """
-    Builds the contract by exporting (compiling) its source and generating a client.
-    If the output directory already exists, it is cleared.
-    """
-    output_dir = output_dir.resolve()
-    if output_dir.exists():
-        rmtree(output_dir)
-    output_dir.mkdir(exist_ok=True, parents=True)
-    logger.info(f"Exporting {contract_path} to {output_dir}")
+# Build fingerprint and output hashes of the last build, in the output directory
+build_cache_file = ".build_cache.json"
+
+
+class BuildCache(TypedDict):
+    fingerprint: str
+    outputs: dict[str, str]
+
+
+compile_options = ["--no-output-arc32", "--output-arc56", "--output-source-map"]
+
+# puyapy optimization levels of the optimization matrix build
+optimization_levels = (0, 1, 2)
+
+# Optimization level selected by the optimization matrix build, in the contract folder
+optimization_level_file = "optimization_level"
+
+
+def _compile_options(optimization_level: int | None) -> list[str]:
+    """Returns the compile options, at the compiler default optimization level if None."""
+    if optimization_level is None:
+        return compile_options
+    return [*compile_options, f"--optimization-level={optimization_level}"]
+
+
+def _selected_optimization_level(contract_path: Path) -> int | None:
+    """Returns the optimization level selected for the contract (None if not any)."""
+    try:
+        return int((contract_path.parent / optimization_level_file).read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _module_path(module: str) -> Path | None:
+    """Returns the source file of a project module (None if not in the project)."""
+    path = root_path.parent.joinpath(*module.split("."))
+    for candidate in (path.with_suffix(".py"), path / "__init__.py"):
+        if candidate.is_file():
+            return candidate.resolve()
+    return None
+
+
+def _source_dependencies(contract_path: Path) -> list[Path]:
+    """Returns the contract source and the project modules it imports, recursively."""
+    pending, found = [contract_path.resolve()], set()
+    while pending:
+        path = pending.pop()
+        if path in found:
+            continue
+        found.add(path)
+        package = ".".join(path.relative_to(root_path.parent).parts[:-1])
+        for node in ast.walk(ast.parse(path.read_text(), filename=str(path))):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = importlib.util.resolve_name(
+                    "." * node.level + (node.module or ""), package
+                )
+                # Imported names may be submodules
+                modules = [base] + [f"{base}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for module in modules:
+                # Parent packages are imported too
+                parts = module.split(".")
+                for i in range(1, len(parts) + 1):
+                    module_path = _module_path(".".join(parts[:i]))
+                    if module_path is not None:
+                        pending.append(module_path)
+    return sorted(found)
+
+
+# Versions of the compiler and of the client generator, read once per process
+_compiler_versions: list[str] = []
+
+
+def _compiler_version() -> str:
+    """Returns the versions of the compiler and of the client generator (AlgoKit)."""
+    if not _compiler_versions:
+        _compiler_versions.extend(
+            subprocess.run(
+                command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            ).stdout.strip()
+            for command in (
+                ["algokit", "--no-color", "--version"],
+                ["algokit", "--no-color", "compile", "python", "--version"],
+            )
+        )
+    return "\n".join(_compiler_versions)
+
+
+def _build_fingerprint(
+    contract_path: Path, *, lazy_client: bool, optimization_level: int | None
+) -> str:
+    """Hashes the contract sources, the compiler version and the build options."""
+    digest = hashlib.sha256()
+    digest.update(_compiler_version().encode())
+    options = _compile_options(optimization_level)
+    digest.update(" ".join([*options, deployment_extension, str(lazy_client)]).encode())
+    for path in _source_dependencies(contract_path):
+        digest.update(str(path.relative_to(root_path.parent)).encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def _output_hashes(output_dir: Path) -> dict[str, str]:
+    return {
+        file.name: hashlib.sha256(file.read_bytes()).hexdigest()
+        for file in sorted(output_dir.iterdir())
+        if file.is_file() and file.name != build_cache_file
+    }
+
 
+def _is_up_to_date(output_dir: Path, fingerprint: str) -> bool:
+    """Checks the last build fingerprint, and that its outputs are unchanged."""
+    try:
+        cache = cast(
+            BuildCache, json.loads((output_dir / build_cache_file).read_text())
+        )
+    except (OSError, ValueError):
+        return False
+    return (
+        isinstance(cache, dict)
+        and cache.get("fingerprint") == fingerprint
+        and cache.get("outputs") == _output_hashes(output_dir)
+    )
+
+
+def _build_result_path(output_dir: Path) -> Path:
+    app_spec_file = next(iter(sorted(output_dir.glob("*.arc56.json"))), None)
+    return app_spec_file if app_spec_file is not None else output_dir
+
+
+def _compile(
+    output_dir: Path, contract_path: Path, *, optimization_level: int | None
+) -> None:
     build_result = subprocess.run(
         [
             "algokit",
@@ -105,9 +273,7 @@ def build(output_dir: Path, contract_path: Path) -> Path:
             "python",
             str(contract_path.resolve()),
             f"--out-dir={output_dir}",
-            "--no-output-arc32",
-            "--output-arc56",
-            "--output-source-map",
+            *_compile_options(optimization_level),
         ],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
@@ -116,6 +282,45 @@ def build(output_dir: Path, contract_path: Path) -> Path:
     if build_result.returncode:
         raise Exception(f"Could not build contract:\n{build_result.stdout}")
 
+
+def build(
+    output_dir: Path,
+    contract_path: Path,
+    *,
+    force: bool = False,
+    lazy_client: bool = False,
+    budget: BuildBudget | None = None,
+    optimization_level: int | None = None,
+) -> Path:
+    """
+    Builds the contract by exporting (compiling) its source and generating a client.
+    The build is skipped if the contract sources, its imported project modules and
+    the compiler are unchanged since the last build, unless forced. Otherwise, if
+    the output directory already exists, it is cleared.
+    A lazy Python client parses its app spec on first use and has slotted
+    dataclasses, for faster imports.
+    The program sizes and method costs are reported against the previous build,
+    and checked against the optional budget.
+    Without an optimization level, the contract is built at the level selected by
+    the optimization matrix build, if any, else at the compiler default.
+    """
+    output_dir = output_dir.resolve()
+    if optimization_level is None:
+        optimization_level = _selected_optimization_level(contract_path)
+    fingerprint = _build_fingerprint(
+        contract_path, lazy_client=lazy_client, optimization_level=optimization_level
+    )
+    if not force and _is_up_to_date(output_dir, fingerprint):
+        logger.info(f"Skipping unchanged {contract_path}")
+        _check_build_budget(output_dir, budget)
+        return _build_result_path(output_dir)
+    previous_reports = build_reports(output_dir) if output_dir.exists() else {}
+    if output_dir.exists():
+        rmtree(output_dir)
+    output_dir.mkdir(exist_ok=True, parents=True)
+    logger.info(f"Exporting {contract_path} to {output_dir}")
+    _compile(output_dir, contract_path, optimization_level=optimization_level)
+
     # Look for arc56.json files and generate the client based on them.
     app_spec_file_names: list[str] = [
         file.name for file in output_dir.glob("*.arc56.json")
@@ -129,7 +334,7 @@ def build(output_dir: Path, contract_path: Path) -> Path:
     else:
         for file_name in app_spec_file_names:
             client_file = file_name
-            print(file_name)
+            logger.info(f"Generating the client of {file_name}")
             generate_result = subprocess.run(
                 [
                     "algokit",
@@ -152,16 +357,183 @@ def build(output_dir: Path, contract_path: Path) -> Path:
                     raise Exception(
                         f"Could not generate typed client:\n{generate_result.stdout}"
                     )
+            if lazy_client and deployment_extension == "py":
+                for client_path in output_dir.glob("*_client.py"):
+                    make_client_file_lazy(client_path)
+    reports = build_reports(output_dir)
+    save_build_reports(output_dir, reports)
+    for line in diff_reports(previous_reports, reports) or ["No size or cost change"]:
+        logger.info(f"{contract_path.parent.name}: {line}")
+    cache: BuildCache = {
+        "fingerprint": fingerprint,
+        "outputs": _output_hashes(output_dir),
+    }
+    (output_dir / build_cache_file).write_text(json.dumps(cache, indent=2))
+    _check_build_budget(output_dir, budget)
     if client_file:
         return output_dir / client_file
     return output_dir
 
 
+def _check_build_budget(output_dir: Path, budget: BuildBudget | None) -> None:
+    violations = check_budget(build_reports(output_dir), budget) if budget else []
+    if violations:
+        raise Exception("Build budget exceeded:\n" + "\n".join(violations))
+
+
+def _timed_build(
+    output_dir: Path,
+    contract_path: Path,
+    *,
+    force: bool,
+    lazy_client: bool,
+    budget: BuildBudget | None,
+    optimization_level: int | None,
+) -> float:
+    logger.info(f"Building app at {contract_path}")
+    start = time.perf_counter()
+    build(
+        output_dir,
+        contract_path,
+        force=force,
+        lazy_client=lazy_client,
+        budget=budget,
+        optimization_level=optimization_level,
+    )
+    return time.perf_counter() - start
+
+
+def build_all(
+    artifact_path: Path,
+    contracts_to_build: list[SmartContract],
+    *,
+    force: bool = False,
+    lazy_client: bool = False,
+    budget: BuildBudget | None = None,
+    optimization_level: int | None = None,
+    max_workers: int | None = None,
+) -> None:
+    """
+    Builds the contracts concurrently in a process pool, then logs the build time
+    of each contract in the contracts order. Raises with all the failed builds.
+    """
+    if not contracts_to_build:
+        return
+    start = time.perf_counter()
+    workers = min(max_workers or os.cpu_count() or 1, len(contracts_to_build))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            contract.name: pool.submit(
+                _timed_build,
+                artifact_path / contract.name,
+                contract.path,
+                force=force,
+                lazy_client=lazy_client,
+                budget=budget,
+                optimization_level=optimization_level,
+            )
+            for contract in contracts_to_build
+        }
+    errors = {}
+    for name, future in futures.items():
+        try:
+            logger.info(f"Built {name} in {future.result():.1f}s")
+        except Exception as e:
+            logger.error(f"Failed building {name}")
+            errors[name] = e
+    logger.info(
+        f"Built {len(futures) - len(errors)}/{len(futures)} contracts "
+        f"in {time.perf_counter() - start:.1f}s with {workers} workers"
+    )
+    if errors:
+        raise Exception(
+            "Could not build contracts:\n"
+            + "\n".join(f"{name}: {e}" for name, e in errors.items())
+        )
+
+
+def build_optimization_matrix(
+    artifact_path: Path,
+    contract: SmartContract,
+    *,
+    select: bool = False,
+    lazy_client: bool = False,
+    max_workers: int | None = None,
+) -> int:
+    """
+    Compiles the contract at each optimization level concurrently in a process pool,
+    then logs the program sizes and the statically estimated method costs (not
+    simulated) of each variant and returns the cheapest optimization level (lowest
+    total estimated method cost, then program size).
+    Raises if the variants do not have the same ARC-56 interfaces. If selected, the
+    cheapest optimization level is stored in the contract folder, for the next
+    builds, and the contract is (re)built at this level.
+    """
+    workers = min(max_workers or os.cpu_count() or 1, len(optimization_levels))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dirs = {
+            level: Path(temp_dir) / f"O{level}" for level in optimization_levels
+        }
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                level: pool.submit(
+                    _compile, output_dir, contract.path, optimization_level=level
+                )
+                for level, output_dir in output_dirs.items()
+            }
+        for future in futures.values():
+            future.result()
+        interfaces = {
+            json.dumps(app_interfaces(output_dir), sort_keys=True)
+            for output_dir in output_dirs.values()
+        }
+        if len(interfaces) > 1:
+            raise Exception(
+                f"ARC-56 interfaces of {contract.name} differ across optimization levels"
+            )
+        variants = {
+            level: build_reports(output_dir)
+            for level, output_dir in output_dirs.items()
+        }
+    best = cheapest_variant(variants)
+    for level, reports in variants.items():
+        for name, report in reports.items():
+            costs = ", ".join(f"{m} {c}" for m, c in report.method_costs.items())
+            logger.info(
+                f"{contract.name} O{level}{' (cheapest)' if level == best else ''}: "
+                f"{name} {report.program_bytes} program bytes, "
+                f"{report.extra_pages} extra pages, "
+                f"statically estimated opcode costs: {costs}"
+            )
+    if select:
+        level_file = contract.path.parent / optimization_level_file
+        level_file.write_text(f"{best}\n")
+        logger.info(f"Selected {contract.name} O{best}, stored in {level_file}")
+        build(
+            artifact_path / contract.name,
+            contract.path,
+            force=True,
+            lazy_client=lazy_client,
+            optimization_level=best,
+        )
+    return best
+
+
 # --------------------------- Main Logic --------------------------- #
 
 
-def main(action: str, contract_name: str | None = None) -> None:
+def main(
+    action: str,
+    contract_name: str | None = None,
+    *,
+    force: bool = False,
+    lazy_client: bool = False,
+    budget: BuildBudget | None = None,
+    optimization_level: int | None = None,
+    select: bool = False,
+) -> None:
     """Main entry point to build and/or deploy smart contracts."""
+    _configure_cli()
     artifact_path = root_path / "artifacts"
     # Filter contracts based on an optional specific contract name.
     filtered_contracts = [
@@ -172,9 +544,14 @@ def main(action: str, contract_name: str | None = None) -> None:
 
     match action:
         case "build":
-            for contract in filtered_contracts:
-                logger.info(f"Building app at {contract.path}")
-                build(artifact_path / contract.name, contract.path)
+            build_all(
+                artifact_path,
+                filtered_contracts,
+                force=force,
+                lazy_client=lazy_client,
+                budget=budget,
+                optimization_level=optimization_level,
+            )
         case "deploy":
             for contract in filtered_contracts:
                 output_dir = artifact_path / contract.name
@@ -192,20 +569,54 @@ def main(action: str, contract_name: str | None = None) -> None:
                     logger.info(f"Deploying app {contract.name}")
                     contract.deploy()
         case "all":
+            build_all(
+                artifact_path,
+                filtered_contracts,
+                force=force,
+                lazy_client=lazy_client,
+                budget=budget,
+                optimization_level=optimization_level,
+            )
             for contract in filtered_contracts:
-                logger.info(f"Building app at {contract.path}")
-                build(artifact_path / contract.name, contract.path)
                 if contract.deploy:
                     logger.info(f"Deploying {contract.name}")
                     contract.deploy()
+        case "optimize":
+            for contract in filtered_contracts:
+                build_optimization_matrix(
+                    artifact_path, contract, select=select, lazy_client=lazy_client
+                )
         case _:
             logger.error(f"Unknown action: {action}")
 
 
+def _int_option(options: dict[str, str], name: str) -> int | None:
+    """Returns the integer value of a `--name=N` command line option, if given."""
+    value = options.get(name)
+    return int(value) if value is not None else None
+
+
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        main(sys.argv[1], sys.argv[2])
-    elif len(sys.argv) > 1:
-        main(sys.argv[1])
-    else:
-        main("all")
+    # `--force` rebuilds the unchanged contracts too, `--lazy-client` generates lazy
+    # Python clients, `--max-program-bytes=N`, `--max-extra-pages=N` and
+    # `--max-opcode-cost=N` (per method) fail the build beyond the budget,
+    # `--optimization-level=N` overrides the selected level or the compiler default.
+    # The `optimize` action compares the optimization levels, `--select` stores and
+    # builds the cheapest one
+    options = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    limits = dict(option.split("=", 1) for option in options if "=" in option)
+    budget = BuildBudget(
+        program_bytes=_int_option(limits, "--max-program-bytes"),
+        extra_pages=_int_option(limits, "--max-extra-pages"),
+        opcode_cost=_int_option(limits, "--max-opcode-cost"),
+    )
+    args = [arg for arg in sys.argv[1:] if arg not in options]
+    main(
+        args[0] if args else "all",
+        args[1] if len(args) > 1 else None,
+        force="--force" in options,
+        lazy_client="--lazy-client" in options,
+        budget=budget,
+        optimization_level=_int_option(limits, "--optimization-level"),
+        select="--select" in options,
+    )
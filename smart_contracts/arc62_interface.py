@@ -1,9 +1,9 @@
-from abc import ABC, abstractmethod
+from abc import abstractmethod
 
 from algopy import ARC4Contract, UInt64, arc4
 
 
-class Arc62Interface(ARC4Contract, ABC):
+class Arc62Interface(ARC4Contract):
     """
     ARC-0062 (ASA Circulating Supply) - Interface
     """
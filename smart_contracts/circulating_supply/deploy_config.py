@@ -1,9 +1,11 @@
 # mypy: ignore-errors
 
+import functools
 import json
 import logging
 import os
-from typing import Final
+from collections.abc import Mapping
+from typing import Any, Final
 
 from algokit_utils import (
     AlgoAmount,
@@ -19,6 +21,7 @@ from algokit_utils import (
     OperationPerformed,
     PaymentParams,
     SigningAccount,
+    TransactionComposer,
 )
 from algokit_utils.config import config
 from algosdk.encoding import decode_address
@@ -38,7 +41,8 @@ from asa_metadata_registry._generated.asa_metadata_registry_client import (
 )
 from asa_metadata_registry.deployments import RegistryDeployment
 
-from helpers.bonfire import arc54_asset_opt_in
+from helpers.bonfire import arc54_asset_opt_in_params
+from helpers.deploy_graph import DeployStep, run_steps
 from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
     Arc62GetCirculatingSupplyArgs,
     CirculatingSupplyClient,
@@ -101,88 +105,115 @@ ARC2_DATA: dict[str, int] = {
 }  # Update after Smart ASA App deployment
 
 
-def _asset_opt_in(
-    *, algorand: AlgorandClient, account: SigningAccount, asset_id: int
-) -> None:
-    algorand.send.asset_opt_in(
-        AssetOptInParams(sender=account.address, asset_id=asset_id)
-    )
-
-
-def _asset_transfer(
+def _add_opt_in_and_transfer(
+    group: TransactionComposer,
     *,
-    algorand: AlgorandClient,
-    sender: SigningAccount,
     asset_id: int,
+    sender: SigningAccount,
     amount: int,
-    receiver: str,
+    receiver: SigningAccount | None,
 ) -> None:
-    algorand.send.asset_transfer(
+    if receiver is not None:
+        group.add_asset_opt_in(
+            AssetOptInParams(
+                sender=receiver.address, signer=receiver.signer, asset_id=asset_id
+            )
+        )
+        receiver_address = receiver.address
+    else:
+        logger.info("Opting in Bonfire on TestNet...")
+        group.add_app_call_method_call(
+            arc54_asset_opt_in_params(caller=sender, asset_id=asset_id)
+        )
+        receiver_address = os.environ[ARC54_BURN_ADDRESS]
+
+    group.add_asset_transfer(
         AssetTransferParams(
             sender=sender.address,
             asset_id=asset_id,
             amount=amount,
-            receiver=receiver,
+            receiver=receiver_address,
         )
     )
 
 
-def _opt_in_and_transfer(
+def _add_init_config_and_label(
+    group: TransactionComposer,
     *,
     algorand: AlgorandClient,
+    circulating_supply_client: CirculatingSupplyClient,
     asset_id: int,
-    sender: SigningAccount,
-    amount: int,
-    receiver: SigningAccount | None,
+    non_circulating_address: str,
+    label: str,
+    caller: SigningAccount,
 ) -> None:
-    if receiver is not None:
-        _asset_opt_in(
-            algorand=algorand,
-            account=receiver,
-            asset_id=asset_id,
+    mbr_payment = algorand.create_transaction.payment(
+        PaymentParams(
+            sender=caller.address,
+            receiver=circulating_supply_client.app_address,
+            amount=CONFIG_MBR,
         )
-        receiver_address = receiver.address
-    else:
-        logger.info("Opting in Bonfire on TestNet...")
-        arc54_asset_opt_in(
-            algorand=algorand,
-            caller=sender,
-            asset_id=asset_id,
+    )
+    group.add_app_call_method_call(
+        circulating_supply_client.params.init_config(
+            args=InitConfigArgs(asset=asset_id, mbr_payment=mbr_payment),
+            params=CommonAppCallParams(sender=caller.address),
+        )
+    )
+    group.add_app_call_method_call(
+        circulating_supply_client.params.set_not_circulating_address(
+            args=SetNotCirculatingAddressArgs(
+                asset=asset_id,
+                address=non_circulating_address,
+                label=label,
+            ),
+            params=CommonAppCallParams(sender=caller.address),
         )
-        receiver_address = os.environ[ARC54_BURN_ADDRESS]
-
-    _asset_transfer(
-        algorand=algorand,
-        sender=sender,
-        asset_id=asset_id,
-        amount=amount,
-        receiver=receiver_address,
     )
 
 
-def _set_label_and_get_circulating_supply(
+def _get_circulating_supply(
     *,
     circulating_supply_client: CirculatingSupplyClient,
     asset_id: int,
-    non_circulating_address: str,
-    label: str,
     caller: SigningAccount,
 ) -> int | None:
-    circulating_supply_client.send.set_not_circulating_address(
-        args=SetNotCirculatingAddressArgs(
-            asset=asset_id,
-            address=non_circulating_address,
-            label=label,
-        ),
-        params=CommonAppCallParams(sender=caller.address),
-    )
     return circulating_supply_client.send.arc62_get_circulating_supply(
         args=Arc62GetCirculatingSupplyArgs(asset_id=asset_id),
         params=CommonAppCallParams(sender=caller.address),
     ).abi_return
 
 
+def _create_metadata(
+    *,
+    registry_client: AsaMetadataRegistry,
+    asset_id: int,
+    flags: MetadataFlags,
+    asset_manager: SigningAccount,
+) -> None:
+    logger.info(f"Uploading ARC-3 metadata of ASA {asset_id} on the Registry...")
+    asa_metadata = AssetMetadata.from_json(
+        asset_id=asset_id,
+        json_obj=ARC3_METADATA_JSON,
+        flags=flags,
+        deprecated_by=DEPRECATED_BY,
+        arc3_compliant=METADATA_FLAGS.irreversible.arc3,
+    )
+    registry_client.write.create_metadata(
+        metadata=asa_metadata,
+        asset_manager=asset_manager,
+    )
+    metadata = registry_client.read.get_asset_metadata(asset_id=asset_id)
+    logger.info(f"ARC-89 ASA Metadata: {metadata.json}")
+
+
 def deploy() -> None:
+    """
+    Deploys the App and the ARC-3 and ARC-2 discovery ASAs as a graph of steps:
+    the independent steps run concurrently and the dependent transactions are
+    packed into atomic groups (ASA creations, then opt-ins, transfers, configs and
+    labels), so that the deploy takes a handful of rounds.
+    """
     config.configure(
         debug=False,
         populate_app_call_resources=True,
@@ -196,248 +227,223 @@ def deploy() -> None:
     circulating = algorand.account.from_environment("CIRCULATING")
 
     if algorand.client.is_localnet():
-        registry_app_factory = algorand.client.get_typed_app_factory(
-            AsaMetadataRegistryFactory,
-            default_sender=deployer.address,
-        )
-
-        registry_app_client, _ = registry_app_factory.deploy(
-            compilation_params=AppClientCompilationParams(
-                deploy_time_params={
-                    "TRUSTED_DEPLOYER": deployer.public_key,
-                    "ARC90_NETAUTH": "net:" + algorand.client.network().genesis_id,
-                }
-            )
-        )
-
-        algorand.account.ensure_funded_from_environment(
-            account_to_fund=registry_app_client.app_address,
-            min_spending_balance=ACCOUNT_MBR,
-        )
-
-        registry_client = AsaMetadataRegistry.from_app_client(
-            app_client=registry_app_client, algod=algorand.client.algod
-        )
-
-        registry_deployment = RegistryDeployment(
-            network=algorand.client.network().genesis_id,
-            genesis_hash_b64=algorand.client.network().genesis_hash,
-            app_id=registry_app_client.app_id,
-            arc90_uri_netauth="net:" + algorand.client.network().genesis_id,
-            creator_address=deployer.address,
-        )
         non_circulating = algorand.account.from_environment("NON_CIRCULATING")
         non_circulating_address = non_circulating.address
         non_circulating_label = CUSTOM_1
     elif algorand.client.is_testnet():
-        registry_deployment = DEFAULT_DEPLOYMENTS["testnet"]
-        registry_app_client = algorand.client.get_typed_app_client_by_id(
-            AsaMetadataRegistryClient,
-            app_id=registry_deployment.app_id,
-            default_sender=deployer.address,
-            default_signer=deployer.signer,
-        )
-        registry_client = AsaMetadataRegistry.from_app_client(
-            app_client=registry_app_client, algod=algorand.client.algod
-        )
         non_circulating = None
         non_circulating_address = os.environ[ARC54_BURN_ADDRESS]
         non_circulating_label = BURNED
     else:
         raise OSError("Unsupported network for deployment")
-    logger.info(f"ASA Metadata Registry deployment: {registry_deployment}")
-
-    factory = algorand.client.get_typed_app_factory(
-        CirculatingSupplyFactory,
-        compilation_params=AppClientCompilationParams(
-            deploy_time_params={
-                ARC54_BURN_ADDRESS: decode_address(os.environ[ARC54_BURN_ADDRESS]),
-            }
-        ),
-        default_sender=deployer.address,
-    )
 
-    circulating_supply_client, deploy_result = factory.deploy(
-        on_schema_break=OnSchemaBreak.AppendApp,
-        on_update=OnUpdate.AppendApp,
-    )
-    logger.info(
-        f"Circulating Supply Application ID: {circulating_supply_client.app_id}"
-    )
-    if deploy_result.operation_performed.name == OperationPerformed.Create.name:
-        algorand.send.payment(
-            PaymentParams(
-                amount=ACCOUNT_MBR,
-                sender=deployer.address,
-                receiver=circulating_supply_client.app_address,
+    def deploy_registry(
+        _: Mapping[str, Any],
+    ) -> tuple[AsaMetadataRegistry, RegistryDeployment]:
+        if non_circulating is not None:
+            registry_app_factory = algorand.client.get_typed_app_factory(
+                AsaMetadataRegistryFactory,
+                default_sender=deployer.address,
             )
-        )
 
-    # Update Asset Metadata
-    ARC3_METADATA_JSON["properties"]["arc-62"][
-        "application-id"
-    ] = circulating_supply_client.app_id
-
-    # ARC-3 Circulating Supply App discovery
-    # https://dev.algorand.co/arc-standards/arc-0062/#circulating-supply-application-discovery
-    arc90_uri = Arc90Uri(
-        netauth=registry_deployment.arc90_uri_netauth,
-        app_id=registry_deployment.app_id,
-        box_name=None,
-        compliance=Arc90Compliance((54, 62, 89)),  # ARC-54, ARC-62, ARC-89
-    )
-    assert arc90_uri.is_partial
-    logger.info(f"Smart ASA Metadata Partial URI: {arc90_uri.to_uri()}")
-
-    logger.info("Creating ARC-3 discovery Circulating Supply ASA...")
-    arc3_asset_id = algorand.send.asset_create(
-        AssetCreateParams(
-            sender=deployer.address,
-            signer=deployer.signer,
-            asset_name=ASA_NAME + "@arc3",
-            unit_name=ASA_UNIT_NAME,
-            total=ASA_TOTAL,
-            decimals=ASA_DECIMALS,
-            manager=deployer.address,
-            reserve=deployer.address,
-            url=arc90_uri.to_uri(),
-            metadata_hash=ASA_METADATA_HASH,
-            default_frozen=ASA_DEFAULT_FROZEN,
-        )
-    ).asset_id
+            registry_app_client, _ = registry_app_factory.deploy(
+                compilation_params=AppClientCompilationParams(
+                    deploy_time_params={
+                        "TRUSTED_DEPLOYER": deployer.public_key,
+                        "ARC90_NETAUTH": "net:" + algorand.client.network().genesis_id,
+                    }
+                )
+            )
 
-    logger.info("Uploading ARC-3 metadata on the ASA Metadata Registry...")
-    asa_metadata = AssetMetadata.from_json(
-        asset_id=arc3_asset_id,
-        json_obj=ARC3_METADATA_JSON,
-        flags=METADATA_FLAGS,
-        deprecated_by=DEPRECATED_BY,
-        arc3_compliant=METADATA_FLAGS.irreversible.arc3,
-    )
+            algorand.account.ensure_funded_from_environment(
+                account_to_fund=registry_app_client.app_address,
+                min_spending_balance=ACCOUNT_MBR,
+            )
 
-    registry_client.write.create_metadata(
-        metadata=asa_metadata,
-        asset_manager=deployer,
-    )
-    metadata = registry_client.read.get_asset_metadata(asset_id=arc3_asset_id)
-    logger.info(f"ARC-89 ASA Metadata: {metadata.json}")
+            registry_deployment = RegistryDeployment(
+                network=algorand.client.network().genesis_id,
+                genesis_hash_b64=algorand.client.network().genesis_hash,
+                app_id=registry_app_client.app_id,
+                arc90_uri_netauth="net:" + algorand.client.network().genesis_id,
+                creator_address=deployer.address,
+            )
+        else:
+            registry_deployment = DEFAULT_DEPLOYMENTS["testnet"]
+            registry_app_client = algorand.client.get_typed_app_client_by_id(
+                AsaMetadataRegistryClient,
+                app_id=registry_deployment.app_id,
+                default_sender=deployer.address,
+                default_signer=deployer.signer,
+            )
+        logger.info(f"ASA Metadata Registry deployment: {registry_deployment}")
+        registry_client = AsaMetadataRegistry.from_app_client(
+            app_client=registry_app_client, algod=algorand.client.algod
+        )
+        return registry_client, registry_deployment
 
-    _opt_in_and_transfer(
-        algorand=algorand,
-        asset_id=arc3_asset_id,
-        sender=deployer,
-        amount=1,
-        receiver=non_circulating,
-    )
-    _opt_in_and_transfer(
-        algorand=algorand,
-        asset_id=arc3_asset_id,
-        sender=deployer,
-        amount=1,
-        receiver=circulating,
-    )
+    def deploy_app(_: Mapping[str, Any]) -> tuple[CirculatingSupplyClient, bool]:
+        factory = algorand.client.get_typed_app_factory(
+            CirculatingSupplyFactory,
+            compilation_params=AppClientCompilationParams(
+                deploy_time_params={
+                    ARC54_BURN_ADDRESS: decode_address(os.environ[ARC54_BURN_ADDRESS]),
+                }
+            ),
+            default_sender=deployer.address,
+        )
 
-    logger.info("Setting ARC-3 discovery Circulating Supply App...")
-    mbr_payment = algorand.create_transaction.payment(
-        PaymentParams(
-            sender=deployer.address,
-            receiver=circulating_supply_client.app_address,
-            amount=CONFIG_MBR,
+        circulating_supply_client, deploy_result = factory.deploy(
+            on_schema_break=OnSchemaBreak.AppendApp,
+            on_update=OnUpdate.AppendApp,
         )
-    )
-    circulating_supply_client.send.init_config(
-        args=InitConfigArgs(asset=arc3_asset_id, mbr_payment=mbr_payment),
-        params=CommonAppCallParams(sender=deployer.address),
-    )
-    arc3_circulating_supply = _set_label_and_get_circulating_supply(
-        circulating_supply_client=circulating_supply_client,
-        asset_id=arc3_asset_id,
-        non_circulating_address=non_circulating_address,
-        label=non_circulating_label,
-        caller=deployer,
-    )
-    logger.info(f"ARC-3 discovery Circulating Supply: {arc3_circulating_supply}")
-
-    # ARC-2 Circulating Supply App discovery (backward compatibility)
-    # https://dev.algorand.co/arc-standards/arc-0062/#backwards-compatibility
-    logger.info("Creating ARC-2 discovery Circulating Supply ASA...")
-    arc2_asset_id = algorand.send.asset_create(
-        AssetCreateParams(
-            sender=deployer.address,
-            signer=deployer.signer,
-            asset_name=ASA_NAME,
-            unit_name=ASA_UNIT_NAME,
-            total=ASA_TOTAL,
-            decimals=ASA_DECIMALS,
-            manager=deployer.address,
-            metadata_hash=ASA_METADATA_HASH,
-            default_frozen=ASA_DEFAULT_FROZEN,
+        logger.info(
+            f"Circulating Supply Application ID: {circulating_supply_client.app_id}"
         )
-    ).asset_id
-
-    _opt_in_and_transfer(
-        algorand=algorand,
-        asset_id=arc2_asset_id,
-        sender=deployer,
-        amount=1,
-        receiver=non_circulating,
-    )
-    _opt_in_and_transfer(
-        algorand=algorand,
-        asset_id=arc2_asset_id,
-        sender=deployer,
-        amount=1,
-        receiver=circulating,
-    )
 
-    logger.info("Setting ARC-2 discovery Circulating Supply App...")
-    mbr_payment = algorand.create_transaction.payment(
-        PaymentParams(
-            sender=deployer.address,
-            receiver=circulating_supply_client.app_address,
-            amount=CONFIG_MBR,
+        # Update Asset Metadata and ARC-2 note
+        ARC3_METADATA_JSON["properties"]["arc-62"][
+            "application-id"
+        ] = circulating_supply_client.app_id
+        ARC2_DATA["application-id"] = circulating_supply_client.app_id
+        created = (
+            deploy_result.operation_performed.name == OperationPerformed.Create.name
         )
-    )
-    circulating_supply_client.send.init_config(
-        args=InitConfigArgs(asset=arc2_asset_id, mbr_payment=mbr_payment),
-        params=CommonAppCallParams(sender=deployer.address),
-    )
+        return circulating_supply_client, created
+
+    def create_assets(results: Mapping[str, Any]) -> tuple[int, int]:
+        _, registry_deployment = results["registry"]
+        circulating_supply_client, created = results["app"]
+        group = algorand.new_group()
+        if created:
+            group.add_payment(
+                PaymentParams(
+                    amount=ACCOUNT_MBR,
+                    sender=deployer.address,
+                    receiver=circulating_supply_client.app_address,
+                )
+            )
 
-    ARC2_DATA["application-id"] = circulating_supply_client.app_id
-    arc2_note = ARC2_PREFIX + ":j" + json.dumps(ARC2_DATA)
-    logger.info(
-        f"Setting Circulating Supply App discovery with ARC-2 note: {arc2_note}"
-    )
-    algorand.send.asset_config(
-        params=AssetConfigParams(
-            sender=deployer.address,
-            asset_id=arc2_asset_id,
-            manager=deployer.address,
-            note=arc2_note.encode("utf-8"),
+        # ARC-3 Circulating Supply App discovery
+        # https://dev.algorand.co/arc-standards/arc-0062/#circulating-supply-application-discovery
+        arc90_uri = Arc90Uri(
+            netauth=registry_deployment.arc90_uri_netauth,
+            app_id=registry_deployment.app_id,
+            box_name=None,
+            compliance=Arc90Compliance((54, 62, 89)),  # ARC-54, ARC-62, ARC-89
         )
-    )
+        assert arc90_uri.is_partial
+        logger.info(f"Smart ASA Metadata Partial URI: {arc90_uri.to_uri()}")
 
-    logger.info("Uploading ARC-3 metadata on the ASA Metadata Registry...")
-    asa_metadata = AssetMetadata.from_json(
-        asset_id=arc2_asset_id,
-        json_obj=ARC3_METADATA_JSON,
-        flags=BACKWARD_METADATA_FLAGS,
-        deprecated_by=DEPRECATED_BY,
-        arc3_compliant=METADATA_FLAGS.irreversible.arc3,
-    )
+        logger.info("Creating ARC-3 and ARC-2 discovery Circulating Supply ASAs...")
+        group.add_asset_create(
+            AssetCreateParams(
+                sender=deployer.address,
+                signer=deployer.signer,
+                asset_name=ASA_NAME + "@arc3",
+                unit_name=ASA_UNIT_NAME,
+                total=ASA_TOTAL,
+                decimals=ASA_DECIMALS,
+                manager=deployer.address,
+                reserve=deployer.address,
+                url=arc90_uri.to_uri(),
+                metadata_hash=ASA_METADATA_HASH,
+                default_frozen=ASA_DEFAULT_FROZEN,
+            )
+        )
+        # ARC-2 Circulating Supply App discovery (backward compatibility)
+        # https://dev.algorand.co/arc-standards/arc-0062/#backwards-compatibility
+        group.add_asset_create(
+            AssetCreateParams(
+                sender=deployer.address,
+                signer=deployer.signer,
+                asset_name=ASA_NAME,
+                unit_name=ASA_UNIT_NAME,
+                total=ASA_TOTAL,
+                decimals=ASA_DECIMALS,
+                manager=deployer.address,
+                metadata_hash=ASA_METADATA_HASH,
+                default_frozen=ASA_DEFAULT_FROZEN,
+            )
+        )
+        arc3_confirmation, arc2_confirmation = group.send().confirmations[-2:]
+        return arc3_confirmation["asset-index"], arc2_confirmation["asset-index"]
+
+    def configure_assets(results: Mapping[str, Any]) -> None:
+        circulating_supply_client, _ = results["app"]
+        group = algorand.new_group()
+        for asset_id in results["assets"]:
+            for receiver in (non_circulating, circulating):
+                _add_opt_in_and_transfer(
+                    group,
+                    asset_id=asset_id,
+                    sender=deployer,
+                    amount=1,
+                    receiver=receiver,
+                )
+
+        logger.info("Setting ARC-3 and ARC-2 discovery Circulating Supply App...")
+        for asset_id in results["assets"]:
+            _add_init_config_and_label(
+                group,
+                algorand=algorand,
+                circulating_supply_client=circulating_supply_client,
+                asset_id=asset_id,
+                non_circulating_address=non_circulating_address,
+                label=non_circulating_label,
+                caller=deployer,
+            )
 
-    registry_client.write.create_metadata(
-        metadata=asa_metadata,
-        asset_manager=deployer,
-    )
-    metadata = registry_client.read.get_asset_metadata(asset_id=arc2_asset_id)
-    logger.info(f"ARC-89 ASA Metadata: {metadata.json}")
+        _, arc2_asset_id = results["assets"]
+        arc2_note = ARC2_PREFIX + ":j" + json.dumps(ARC2_DATA)
+        logger.info(
+            f"Setting Circulating Supply App discovery with ARC-2 note: {arc2_note}"
+        )
+        group.add_asset_config(
+            AssetConfigParams(
+                sender=deployer.address,
+                asset_id=arc2_asset_id,
+                manager=deployer.address,
+                note=arc2_note.encode("utf-8"),
+            )
+        )
+        group.send()
+
+    def create_metadata(results: Mapping[str, Any], *, arc: int) -> None:
+        registry_client, _ = results["registry"]
+        arc3_asset_id, arc2_asset_id = results["assets"]
+        _create_metadata(
+            registry_client=registry_client,
+            asset_id=arc3_asset_id if arc == 3 else arc2_asset_id,
+            flags=METADATA_FLAGS if arc == 3 else BACKWARD_METADATA_FLAGS,
+            asset_manager=deployer,
+        )
 
-    arc2_circulating_supply = _set_label_and_get_circulating_supply(
-        circulating_supply_client=circulating_supply_client,
-        asset_id=arc2_asset_id,
-        non_circulating_address=non_circulating_address,
-        label=non_circulating_label,
-        caller=deployer,
+    def get_circulating_supplies(results: Mapping[str, Any]) -> None:
+        circulating_supply_client, _ = results["app"]
+        for arc, asset_id in zip((3, 2), results["assets"], strict=True):
+            circulating_supply = _get_circulating_supply(
+                circulating_supply_client=circulating_supply_client,
+                asset_id=asset_id,
+                caller=deployer,
+            )
+            logger.info(f"ARC-{arc} discovery Circulating Supply: {circulating_supply}")
+
+    run_steps(
+        [
+            DeployStep("registry", deploy_registry),
+            DeployStep("app", deploy_app),
+            DeployStep("assets", create_assets, after=("registry", "app")),
+            DeployStep("configs", configure_assets, after=("app", "assets")),
+            DeployStep(
+                "arc3_metadata",
+                functools.partial(create_metadata, arc=3),
+                after=("registry", "app", "assets"),
+            ),
+            DeployStep(
+                "arc2_metadata",
+                functools.partial(create_metadata, arc=2),
+                after=("registry", "app", "assets", "configs"),
+            ),
+            DeployStep("supplies", get_circulating_supplies, after=("configs",)),
+        ]
     )
-    logger.info(f"ARC-2 discovery Circulating Supply: {arc2_circulating_supply}")
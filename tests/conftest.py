@@ -1,3 +1,4 @@
+import os
 from typing import Final
 
 import pytest
@@ -13,8 +14,11 @@ from algokit_utils import (
     SigningAccount,
 )
 from algokit_utils.config import config
+from algosdk import mnemonic
 from algosdk.encoding import decode_address
 
+from helpers.fake_algod import FakeAlgodClient, fake_algorand_client
+from helpers.program_cache import DEFAULT_CACHE_DIR, ProgramCache
 from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
     CirculatingSupplyClient,
     CirculatingSupplyFactory,
@@ -23,6 +27,11 @@ from smart_contracts.artifacts.circulating_supply.circulating_supply_client impo
 from smart_contracts.circulating_supply.deploy_config import ACCOUNT_MBR, CONFIG_MBR
 from smart_contracts.template_vars import ARC54_BURN_ADDRESS
 
+# Set to run the tests on the in-process fake Algod instead of LocalNet
+FAKE_ALGOD: Final[str] = "FAKE_ALGOD"
+# Set by pytest-xdist in the parallel workers (e.g. `gw0`)
+XDIST_WORKER: Final[str] = "PYTEST_XDIST_WORKER"
+
 INITIAL_FUNDS: Final[AlgoAmount] = AlgoAmount(algo=100)
 
 ASA_TOTAL: Final[int] = 100
@@ -33,6 +42,28 @@ CUSTOM_BALANCE_2: Final[int] = 4
 CUSTOM_BALANCE_3: Final[int] = 5
 CUSTOM_BALANCE_4: Final[int] = 6
 
+ACCOUNTS: Final[tuple[str, ...]] = (
+    "deployer",
+    "asset_creator",
+    "asset_manager",
+    "asset_reserve",
+    "burned_supply",
+    "custom_supply_1",
+    "custom_supply_2",
+    "custom_supply_3",
+    "custom_supply_4",
+)
+
+# ASA holder account and balance, by balance fixture
+HOLDER_BALANCES: Final[dict[str, tuple[str, int]]] = {
+    "reserve_with_balance": ("asset_reserve", RESERVE_BALANCE),
+    "burned_balance": ("burned_supply", BURNED_BALANCE),
+    "custom_balance_1": ("custom_supply_1", CUSTOM_BALANCE_1),
+    "custom_balance_2": ("custom_supply_2", CUSTOM_BALANCE_2),
+    "custom_balance_3": ("custom_supply_3", CUSTOM_BALANCE_3),
+    "custom_balance_4": ("custom_supply_4", CUSTOM_BALANCE_4),
+}
+
 config.configure(
     debug=False,
     populate_app_call_resources=True,
@@ -40,92 +71,142 @@ config.configure(
 )
 
 
-def _create_funded_account(algorand: AlgorandClient) -> SigningAccount:
-    account = algorand.account.random()
-    algorand.account.ensure_funded_from_environment(
-        account_to_fund=account.address,
-        min_spending_balance=INITIAL_FUNDS,
+def _create_funded_accounts(
+    algorand: AlgorandClient,
+    dispenser: SigningAccount,
+    count: int,
+    amount: AlgoAmount = INITIAL_FUNDS,
+) -> list[SigningAccount]:
+    # A single atomic group funds all the accounts
+    accounts = [algorand.account.random() for _ in range(count)]
+    group = algorand.new_group()
+    for account in accounts:
+        group.add_payment(
+            PaymentParams(
+                sender=dispenser.address,
+                receiver=account.address,
+                amount=amount,
+            )
+        )
+    group.send()
+    return accounts
+
+
+def _worker_dispenser(algorand: AlgorandClient, count: int) -> SigningAccount:
+    dispenser = algorand.account.dispenser_from_environment()
+    if not os.environ.get(XDIST_WORKER):
+        return dispenser
+    # Each parallel worker funds its accounts from its own dispenser
+    [worker_dispenser] = _create_funded_accounts(
+        algorand,
+        dispenser,
+        1,
+        AlgoAmount(micro_algo=(count + 1) * INITIAL_FUNDS.micro_algo),
     )
-    return account
+    return worker_dispenser
 
 
-def _create_account_with_asset_balance(
+def _create_accounts_with_asset_balance(
     algorand: AlgorandClient,
     asset_creator: SigningAccount,
-    receiver: SigningAccount,
+    balances: dict[str, tuple[SigningAccount, int]],
     asset: int,
-    amount: int,
-) -> SigningAccount:
-    algorand.send.asset_opt_in(
-        AssetOptInParams(
-            sender=receiver.address,
-            signer=receiver.signer,
-            asset_id=asset,
+) -> dict[str, SigningAccount]:
+    # A single atomic group opts in all the receivers and transfers their balances
+    group = algorand.new_group()
+    for receiver, amount in balances.values():
+        group.add_asset_opt_in(
+            AssetOptInParams(
+                sender=receiver.address,
+                signer=receiver.signer,
+                asset_id=asset,
+            )
+        ).add_asset_transfer(
+            AssetTransferParams(
+                sender=asset_creator.address,
+                signer=asset_creator.signer,
+                asset_id=asset,
+                amount=amount,
+                receiver=receiver.address,
+            )
         )
-    )
-    algorand.send.asset_transfer(
-        AssetTransferParams(
-            sender=asset_creator.address,
-            signer=asset_creator.signer,
-            asset_id=asset,
-            amount=amount,
-            receiver=receiver.address,
-        )
-    )
-    assert algorand.asset.get_account_information(receiver, asset).balance == amount
-    return receiver
+    group.send()
+    for receiver, amount in balances.values():
+        assert algorand.asset.get_account_information(receiver, asset).balance == amount
+    return {name: receiver for name, (receiver, _) in balances.items()}
 
 
 @pytest.fixture(scope="session")
-def algorand() -> AlgorandClient:
+def algorand(pytestconfig: pytest.Config) -> AlgorandClient:
+    if os.environ.get(FAKE_ALGOD):
+        # Offline run on the in-process Algod, funding from its genesis dispenser
+        algod = FakeAlgodClient()
+        os.environ.setdefault(
+            "DISPENSER_MNEMONIC", mnemonic.from_private_key(algod.dispenser.private_key)
+        )
+        return fake_algorand_client(algod)
     client = AlgorandClient.default_localnet()
     client.set_suggested_params_cache_timeout(0)
+    # Apps are created with the compiled programs of the previous runs
+    ProgramCache(pytestconfig.rootpath / DEFAULT_CACHE_DIR).install(client.app)
     return client
 
 
 @pytest.fixture(scope="session")
-def deployer(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def accounts(algorand: AlgorandClient) -> dict[str, SigningAccount]:
+    dispenser = _worker_dispenser(algorand, len(ACCOUNTS))
+    return dict(
+        zip(
+            ACCOUNTS,
+            _create_funded_accounts(algorand, dispenser, len(ACCOUNTS)),
+            strict=True,
+        )
+    )
+
+
+@pytest.fixture(scope="session")
+def deployer(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["deployer"]
 
 
 @pytest.fixture(scope="session")
-def asset_creator(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def asset_creator(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["asset_creator"]
 
 
 @pytest.fixture(scope="session")
-def asset_manager(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def asset_manager(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["asset_manager"]
 
 
 @pytest.fixture(scope="session")
-def asset_reserve(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def asset_reserve(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["asset_reserve"]
 
 
 @pytest.fixture(scope="session")
-def burned_supply(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def burned_supply(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["burned_supply"]
 
 
 @pytest.fixture(scope="session")
-def custom_supply_1(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def custom_supply_1(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["custom_supply_1"]
 
 
 @pytest.fixture(scope="session")
-def custom_supply_2(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def custom_supply_2(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["custom_supply_2"]
 
 
 @pytest.fixture(scope="session")
-def custom_supply_3(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def custom_supply_3(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["custom_supply_3"]
 
 
 @pytest.fixture(scope="session")
-def custom_supply_4(algorand: AlgorandClient) -> SigningAccount:
-    return _create_funded_account(algorand)
+def custom_supply_4(accounts: dict[str, SigningAccount]) -> SigningAccount:
+    return accounts["custom_supply_4"]
 
 
 @pytest.fixture(scope="function")
@@ -148,75 +229,53 @@ def asset(
 
 
 @pytest.fixture(scope="function")
-def reserve_with_balance(
+def asset_balances(
+    request: pytest.FixtureRequest,
     algorand: AlgorandClient,
     asset_creator: SigningAccount,
-    asset_reserve: SigningAccount,
     asset: int,
-) -> SigningAccount:
-    return _create_account_with_asset_balance(
-        algorand, asset_creator, asset_reserve, asset, RESERVE_BALANCE
+) -> dict[str, SigningAccount]:
+    # Only the holders of the balance fixtures used by the test, in a single group
+    return _create_accounts_with_asset_balance(
+        algorand,
+        asset_creator,
+        {
+            account: (request.getfixturevalue(account), amount)
+            for fixture, (account, amount) in HOLDER_BALANCES.items()
+            if fixture in request.fixturenames
+        },
+        asset,
     )
 
 
 @pytest.fixture(scope="function")
-def burned_balance(
-    algorand: AlgorandClient,
-    asset_creator: SigningAccount,
-    burned_supply: SigningAccount,
-    asset: int,
-) -> SigningAccount:
-    return _create_account_with_asset_balance(
-        algorand, asset_creator, burned_supply, asset, BURNED_BALANCE
-    )
+def reserve_with_balance(asset_balances: dict[str, SigningAccount]) -> SigningAccount:
+    return asset_balances["asset_reserve"]
 
 
 @pytest.fixture(scope="function")
-def custom_balance_1(
-    algorand: AlgorandClient,
-    asset_creator: SigningAccount,
-    custom_supply_1: SigningAccount,
-    asset: int,
-) -> SigningAccount:
-    return _create_account_with_asset_balance(
-        algorand, asset_creator, custom_supply_1, asset, CUSTOM_BALANCE_1
-    )
+def burned_balance(asset_balances: dict[str, SigningAccount]) -> SigningAccount:
+    return asset_balances["burned_supply"]
 
 
 @pytest.fixture(scope="function")
-def custom_balance_2(
-    algorand: AlgorandClient,
-    asset_creator: SigningAccount,
-    custom_supply_2: SigningAccount,
-    asset: int,
-) -> SigningAccount:
-    return _create_account_with_asset_balance(
-        algorand, asset_creator, custom_supply_2, asset, CUSTOM_BALANCE_2
-    )
+def custom_balance_1(asset_balances: dict[str, SigningAccount]) -> SigningAccount:
+    return asset_balances["custom_supply_1"]
 
 
 @pytest.fixture(scope="function")
-def custom_balance_3(
-    algorand: AlgorandClient,
-    asset_creator: SigningAccount,
-    custom_supply_3: SigningAccount,
-    asset: int,
-) -> SigningAccount:
-    return _create_account_with_asset_balance(
-        algorand, asset_creator, custom_supply_3, asset, CUSTOM_BALANCE_3
-    )
+def custom_balance_2(asset_balances: dict[str, SigningAccount]) -> SigningAccount:
+    return asset_balances["custom_supply_2"]
 
 
 @pytest.fixture(scope="function")
-def custom_balance_4(
-    algorand: AlgorandClient,
-    asset_creator: SigningAccount,
-    custom_supply_4: SigningAccount,
-    asset: int,
-) -> SigningAccount:
-    return _create_account_with_asset_balance(
-        algorand, asset_creator, custom_supply_4, asset, CUSTOM_BALANCE_4
-    )
+def custom_balance_3(asset_balances: dict[str, SigningAccount]) -> SigningAccount:
+    return asset_balances["custom_supply_3"]
+
+
+@pytest.fixture(scope="function")
+def custom_balance_4(asset_balances: dict[str, SigningAccount]) -> SigningAccount:
+    return asset_balances["custom_supply_4"]
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,179 @@
+import base64
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from algokit_utils import LogicError
+
+from helpers.app_discovery import (
+    MAX_GROUP_SIZE,
+    AppDiscovery,
+    parse_arc62_metadata,
+    registry_metadata_reader,
+)
+from helpers.arc2_discovery import ARC2_NOTE_PREFIX, Arc2Resolver
+
+REGISTRY_APP_ID = 89
+SELECTOR = bytes.fromhex("01020304")
+
+
+def _metadata(app_id: int) -> dict[str, Any]:
+    return {"name": "ASA", "properties": {"arc-62": {"application-id": app_id}}}
+
+
+class _Registry:
+    """Stand-in of the registry reader: reading ASA 666 fails"""
+
+    def __init__(self, metadata: dict[int, dict[str, Any]]) -> None:
+        self.metadata = metadata
+        self.reads: list[list[int]] = []
+
+    def __call__(self, asset_ids: list[int]) -> dict[int, dict[str, Any] | None]:
+        self.reads.append(asset_ids)
+        if 666 in asset_ids:
+            raise ConnectionError("Algod unreachable")
+        return {a: self.metadata.get(a) for a in asset_ids}
+
+
+class _RegistryGroup:
+    """Stand-in of a registry client group: ASAs above 100 have no metadata"""
+
+    def __init__(self, groups: list[list[int]]) -> None:
+        self.asset_ids: list[int] = []
+        groups.append(self.asset_ids)
+
+    def arc89_get_metadata_object_by_key(
+        self, args: tuple[int, str], params: object
+    ) -> None:
+        self.asset_ids.append(args[0])
+
+    def simulate(self, **_kwargs: object) -> SimpleNamespace:
+        if any(a > 100 for a in self.asset_ids):
+            raise LogicError(
+                logic_error_str="assert failed",
+                program="",
+                source_map=None,
+                transaction_id="",
+                message="assert failed",
+                pc=0,
+            )
+        return SimpleNamespace(
+            returns=[
+                SimpleNamespace(value=json.dumps({"arc-62": {"application-id": a}}))
+                for a in self.asset_ids
+            ]
+        )
+
+
+def _b64(value: bytes) -> str:
+    return base64.b64encode(value).decode()
+
+
+def test_pass_parse_arc62_metadata() -> None:
+    assert parse_arc62_metadata(_metadata(42)) == 42
+    assert parse_arc62_metadata({"properties": {"arc-62": {}}}) is None
+    assert parse_arc62_metadata({"name": "ASA"}) is None
+    assert parse_arc62_metadata(None) is None
+
+
+def test_pass_registry_metadata_reader() -> None:
+    groups: list[list[int]] = []
+    client = SimpleNamespace(new_group=lambda: _RegistryGroup(groups))
+    read = registry_metadata_reader(client)
+
+    metadata = read([*range(1, 21), 101])
+
+    assert {a: parse_arc62_metadata(m) for a, m in metadata.items()} == {
+        **{a: a for a in range(1, 21)},
+        101: None,
+    }
+    # One simulated group per MAX_GROUP_SIZE ASAs, the failing one isolated
+    assert groups[0] == list(range(1, MAX_GROUP_SIZE + 1))
+    assert groups[1:] == [[*range(17, 21), 101], *([a] for a in [17, 18, 19, 20, 101])]
+
+
+def test_pass_resolve_many(tmp_path: Path) -> None:
+    registry = _Registry({i: _metadata(1_000 + i) for i in range(1, 50)})
+    with Arc2Resolver(tmp_path / "arc2.sqlite") as arc2:
+        arc2.scan(
+            [
+                {"txn": {"type": "acfg", "caid": a, "note": note}}
+                for a, note in (
+                    (100, ARC2_NOTE_PREFIX + b'{"application-id": 2000}'),
+                    (666, ARC2_NOTE_PREFIX + b'{"application-id": 6000}'),
+                )
+            ],
+            round_num=1,
+        )
+        discovery = AppDiscovery(registry, arc2=arc2)
+
+        resolved = discovery.resolve_many([*range(1, 50), 100, 101])
+        # A failed registry read falls back on the ARC-2 notes
+        assert discovery.resolve(666) == 6000
+
+    assert resolved == {i: 1_000 + i for i in range(1, 50)} | {100: 2000}
+    # The misses are read in a single batch
+    assert registry.reads[0] == [*range(1, 50), 100, 101]
+    # Undiscovered ASAs are cached too
+    discovery.resolve_many([1, 101])
+    assert registry.reads == [[*range(1, 50), 100, 101], [666]]
+
+
+def test_pass_failed_reads_are_not_cached() -> None:
+    registry = _Registry({})
+    discovery = AppDiscovery(registry)
+
+    assert discovery.resolve(666) is None
+    assert 666 not in discovery
+    discovery.resolve(666)
+    assert registry.reads == [[666], [666]]
+
+
+def test_pass_observe_transaction() -> None:
+    registry = _Registry({1: _metadata(10), 2: _metadata(20)})
+    discovery = AppDiscovery(registry, registry_app_id=REGISTRY_APP_ID)
+    discovery.resolve_many([1, 2])
+
+    registry.metadata[1] = _metadata(11)
+    discovery.observe_transaction(
+        {
+            "tx-type": "appl",
+            "application-transaction": {
+                "application-id": 1,
+                "application-args": [_b64(SELECTOR), _b64((2).to_bytes(8, "big"))],
+            },
+            "inner-txns": [
+                {
+                    "tx-type": "appl",
+                    "application-transaction": {
+                        "application-id": REGISTRY_APP_ID,
+                        # ASA ID argument, no foreign ASAs (shared group resources)
+                        "application-args": [
+                            _b64(SELECTOR),
+                            _b64((1).to_bytes(8, "big")),
+                        ],
+                    },
+                }
+            ],
+        }
+    )
+
+    assert 1 not in discovery
+    assert 2 in discovery
+    assert discovery.resolve_many([1, 2]) == {1: 11, 2: 20}
+
+    # Block format, ASA reference argument (index of the foreign ASAs)
+    discovery.observe_transaction(
+        {
+            "txn": {
+                "type": "appl",
+                "apid": REGISTRY_APP_ID,
+                "apaa": [SELECTOR, b"\x01"],
+                "apas": [1, 2],
+            }
+        }
+    )
+
+    assert 1 in discovery
+    assert 2 not in discovery
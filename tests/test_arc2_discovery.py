@@ -0,0 +1,82 @@
+import base64
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from helpers.arc2_discovery import ARC2_NOTE_PREFIX, Arc2Resolver, parse_arc62_note
+
+
+def _note(app_id: int) -> bytes:
+    return ARC2_NOTE_PREFIX + json.dumps({"application-id": app_id}).encode()
+
+
+def _indexer_acfg(asset_id: int, note: bytes, round_num: int) -> dict[str, Any]:
+    return {
+        "tx-type": "acfg",
+        "confirmed-round": round_num,
+        "asset-config-transaction": {"asset-id": asset_id},
+        "note": base64.b64encode(note).decode(),
+    }
+
+
+class _Indexer:
+    def __init__(self, pages: list[list[dict[str, Any]]]) -> None:
+        self.pages = pages
+        self.calls: list[dict[str, Any]] = []
+
+    def search_transactions(self, **kwargs: Any) -> dict[str, Any]:
+        self.calls.append(kwargs)
+        page = int(kwargs["next_page"] or 0)
+        return {
+            "current-round": 100,
+            "transactions": self.pages[page],
+            "next-token": str(page + 1) if page + 1 < len(self.pages) else None,
+        }
+
+
+@pytest.mark.parametrize(
+    ("note", "app_id"),
+    [
+        (_note(42), 42),
+        (_note(0), None),
+        (ARC2_NOTE_PREFIX + b"{not json", None),
+        (ARC2_NOTE_PREFIX + b"[42]", None),
+        (b"arc69:j" + json.dumps({"application-id": 42}).encode(), None),
+        (b"", None),
+    ],
+)
+def test_pass_parse_arc62_note(note: bytes, app_id: int | None) -> None:
+    assert parse_arc62_note(note) == app_id
+
+
+def test_pass_sync(tmp_path: Path) -> None:
+    path = tmp_path / "arc2.sqlite"
+    indexer = _Indexer(
+        [
+            [_indexer_acfg(1, _note(10), 5), _indexer_acfg(2, _note(20), 6)],
+            [
+                _indexer_acfg(1, _note(11), 7),  # Latest note wins
+                {
+                    "tx-type": "appl",
+                    "confirmed-round": 8,
+                    "inner-txns": [_indexer_acfg(3, _note(30), 8)],
+                },
+            ],
+        ]
+    )
+    with Arc2Resolver(path) as resolver:
+        assert resolver.sync(indexer) == 4
+        # A block transaction with an older note does not override
+        resolver.scan(
+            [{"txn": {"type": "acfg", "caid": 2, "note": _note(19)}}], round_num=4
+        )
+
+    with Arc2Resolver(path) as resolver:
+        assert resolver.last_round == 100
+        assert resolver.resolve([1, 2, 3, 4]) == {1: 11, 2: 20, 3: 30}
+        resolver.sync(_Indexer([[]]))
+
+    assert [c["min_round"] for c in indexer.calls] == [1, 1]
+    assert indexer.calls[0]["note_prefix"] == ARC2_NOTE_PREFIX
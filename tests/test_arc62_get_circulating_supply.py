@@ -1,15 +1,13 @@
-import pytest
 from algokit_utils import (
     AlgorandClient,
-    AssetConfigParams,
     AssetDestroyParams,
     AssetTransferParams,
     CommonAppCallParams,
-    LogicError,
+    SendParams,
     SigningAccount,
 )
 
-from smart_contracts import errors as err
+from helpers.circulating_supply import CirculatingSupplyReader
 from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
     Arc62GetCirculatingSupplyArgs,
     CirculatingSupplyClient,
@@ -17,9 +15,18 @@ from smart_contracts.artifacts.circulating_supply.circulating_supply_client impo
 )
 from smart_contracts.circulating_supply import config as cfg
 
+from .conftest import (
+    ASA_TOTAL,
+    BURNED_BALANCE,
+    CUSTOM_BALANCE_1,
+    CUSTOM_BALANCE_2,
+    CUSTOM_BALANCE_3,
+    CUSTOM_BALANCE_4,
+    RESERVE_BALANCE,
+)
 
-def test_pass_get_circulating_supply(
-    algorand: AlgorandClient,
+
+def test_pass_getter_group_resources(
     asset_circulating_supply_client: CirculatingSupplyClient,
     asset_manager: SigningAccount,
     asset: int,
@@ -30,14 +37,6 @@ def test_pass_get_circulating_supply(
     custom_balance_3: SigningAccount,
     custom_balance_4: SigningAccount,
 ) -> None:
-    total = algorand.asset.get_by_id(asset).total
-    reserve_balance = algorand.asset.get_account_information(
-        reserve_with_balance, asset
-    ).balance
-
-    def balance(acct: SigningAccount) -> int:
-        return algorand.asset.get_account_information(acct, asset).balance
-
     nc_accounts = [
         (cfg.BURNED, burned_balance),
         (cfg.CUSTOM_1, custom_balance_1),
@@ -45,64 +44,34 @@ def test_pass_get_circulating_supply(
         (cfg.CUSTOM_3, custom_balance_3),
         (cfg.CUSTOM_4, custom_balance_4),
     ]
-    nc_balances = {label: balance(acct) for label, acct in nc_accounts}
-
-    print("\nASA Total: ", total)
-    print("Reserve Balance: ", reserve_balance)
-    for label, _acct in nc_accounts:
-        print(f"{label.capitalize()} Balance: ", nc_balances[label])
-
-    def get_circulating_supply() -> int:
-        return asset_circulating_supply_client.send.arc62_get_circulating_supply(
-            args=Arc62GetCirculatingSupplyArgs(asset_id=asset)
-        ).abi_return
-
-    def set_nc_address(label: str, acct: SigningAccount) -> None:
+    for label, acct in nc_accounts:
         asset_circulating_supply_client.send.set_not_circulating_address(
             args=SetNotCirculatingAddressArgs(
-                asset=asset,
-                address=acct.address,
-                label=label,
+                asset=asset, address=acct.address, label=label
             ),
             params=CommonAppCallParams(sender=asset_manager.address),
         )
+    # Reserve and labels exceed the account references of a single App Call
+    addresses = {reserve_with_balance.address, *(a.address for _, a in nc_accounts)}
+    assert len(addresses) == 6
 
-    expected = total - reserve_balance
-
-    circulating_supply = get_circulating_supply()
-    assert circulating_supply == expected
-
-    for label, acct in nc_accounts:
-        set_nc_address(label, acct)
-        expected -= nc_balances[label]
-        circulating_supply = get_circulating_supply()
-        assert circulating_supply == expected
-
-    print("Circulating Supply: ", circulating_supply)
-
-
-def test_pass_no_reserve(
-    algorand: AlgorandClient,
-    asset_circulating_supply_client: CirculatingSupplyClient,
-    asset_manager: SigningAccount,
-    asset: int,
-) -> None:
-    total = algorand.asset.get_by_id(asset).total
-    algorand.send.asset_config(
-        AssetConfigParams(
-            sender=asset_manager.address,
-            signer=asset_manager.signer,
-            asset_id=asset,
-            manager=asset_manager.address,
-            reserve="",
-        ),
+    reader = CirculatingSupplyReader(asset_circulating_supply_client)
+    result = reader.new_getter_group(asset).send(
+        SendParams(populate_app_call_resources=False)
     )
-    circulating_supply = (
-        asset_circulating_supply_client.send.arc62_get_circulating_supply(
-            args=Arc62GetCirculatingSupplyArgs(asset_id=asset),
-        ).abi_return
+
+    expected = ASA_TOTAL - (
+        RESERVE_BALANCE
+        + BURNED_BALANCE
+        + CUSTOM_BALANCE_1
+        + CUSTOM_BALANCE_2
+        + CUSTOM_BALANCE_3
+        + CUSTOM_BALANCE_4
     )
-    assert circulating_supply == total
+    # One extra_resources call before the getter
+    assert len(result.returns) == 2
+    assert result.returns[-1].value == expected
+    assert reader.get_circulating_supply(asset) == expected
 
 
 def test_pass_closed_address(
@@ -173,13 +142,3 @@ def test_pass_asa_not_exists(
         ).abi_return
     )
     assert circulating_supply == 0
-
-
-def test_fail_config_not_exists(
-    circulating_supply_client: CirculatingSupplyClient,
-    asset: int,
-) -> None:
-    with pytest.raises(LogicError, match=err.CONFIG_NOT_EXISTS):
-        circulating_supply_client.send.arc62_get_circulating_supply(
-            args=Arc62GetCirculatingSupplyArgs(asset_id=asset),
-        )
@@ -0,0 +1,155 @@
+import pytest
+from algosdk.constants import ZERO_ADDRESS
+
+from helpers.asset_params import AssetParams, AssetParamsCache
+from helpers.circulating_supply import (
+    compute_circulating_supply,
+    empty_config,
+    getter_resources,
+    non_circulating_balances,
+)
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyConfig,
+)
+from smart_contracts.circulating_supply import config as cfg
+
+RESERVE = "R" * 58
+BURNED = "B" * 58
+CUSTOM = "C" * 58
+
+
+class _Fetcher:
+    def __init__(self) -> None:
+        self.calls: list[int] = []
+
+    def __call__(self, asset_id: int) -> AssetParams | None:
+        self.calls.append(asset_id)
+        if asset_id == 0:
+            return None
+        return AssetParams(asset_id=asset_id, total=100, reserve=RESERVE)
+
+
+def test_pass_cache_hit_rate() -> None:
+    fetcher = _Fetcher()
+    cache = AssetParamsCache(fetcher)
+
+    assert cache.get(1) == AssetParams(asset_id=1, total=100, reserve=RESERVE)
+    assert cache.get(1) is cache.get(1)
+    assert cache.get(0) is None
+    assert cache.get(0) is None
+
+    assert fetcher.calls == [1, 0]
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 2
+    assert cache.stats.hit_rate == 3 / 5
+
+
+def test_pass_cache_eviction() -> None:
+    fetcher = _Fetcher()
+    cache = AssetParamsCache(fetcher, max_size=2)
+
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)  # ASA 2 becomes the least recently used
+    cache.get(3)
+
+    assert len(cache) == 2
+    assert 2 not in cache
+    assert cache.stats.evictions == 1
+
+
+def test_pass_cache_invalidation() -> None:
+    fetcher = _Fetcher()
+    cache = AssetParamsCache(fetcher)
+    for asset_id in (1, 2, 3):
+        cache.get(asset_id)
+
+    # Indexer asset config
+    cache.observe_transaction(
+        {"tx-type": "acfg", "asset-config-transaction": {"asset-id": 1}}
+    )
+    # Block asset destroy, as inner transaction
+    cache.observe_transaction(
+        {
+            "txn": {"type": "appl"},
+            "dt": {"itx": [{"txn": {"type": "acfg", "caid": 2}}]},
+        }
+    )
+    # Asset creation
+    cache.observe_transaction({"txn": {"txn": {"type": "acfg"}}})
+
+    assert 1 not in cache
+    assert 2 not in cache
+    assert 3 in cache
+    assert cache.stats.invalidations == 2
+
+
+def test_pass_cache_invalidation_during_fetch() -> None:
+    fetcher = _Fetcher()
+
+    def fetch(asset_id: int) -> AssetParams | None:
+        params = fetcher(asset_id)
+        # The ASA is reconfigured after the read, before the fetch returns
+        cache.observe_transaction({"txn": {"type": "acfg", "caid": asset_id}})
+        return params
+
+    cache = AssetParamsCache(fetch)
+    assert cache.get(1) is not None
+    # The possibly stale params are not cached
+    assert 1 not in cache
+    assert cache.get(1) is not None
+    assert fetcher.calls == [1, 1]
+
+
+def test_fail_cache_invalid_size() -> None:
+    with pytest.raises(ValueError):
+        AssetParamsCache(_Fetcher(), max_size=0)
+
+
+def test_pass_compute_circulating_supply() -> None:
+    params = AssetParams(asset_id=1, total=100, reserve=RESERVE)
+    config = CirculatingSupplyConfig(
+        burned_addr=BURNED,
+        custom_1_addr=CUSTOM,
+        custom_2_addr=ZERO_ADDRESS,
+        custom_3_addr=ZERO_ADDRESS,
+        custom_4_addr=ZERO_ADDRESS,
+    )
+    # Custom address is not opted-in, Zero Address balances are ignored
+    balances = {RESERVE: 10, BURNED: 5, ZERO_ADDRESS: 50}
+
+    assert non_circulating_balances(params, config, balances) == {
+        "reserve": 10,
+        cfg.BURNED: 5,
+        cfg.CUSTOM_1: 0,
+    }
+    assert compute_circulating_supply(params, config, balances) == 85
+    assert compute_circulating_supply(None, config, balances) == 0
+
+
+def test_fail_compute_circulating_supply_underflow() -> None:
+    params = AssetParams(asset_id=1, total=100, reserve=RESERVE)
+    config = CirculatingSupplyConfig(
+        burned_addr=ZERO_ADDRESS,
+        custom_1_addr=RESERVE,
+        custom_2_addr=ZERO_ADDRESS,
+        custom_3_addr=ZERO_ADDRESS,
+        custom_4_addr=ZERO_ADDRESS,
+    )
+    with pytest.raises(ArithmeticError):
+        compute_circulating_supply(params, config, {RESERVE: 60})
+
+
+def test_pass_getter_resources() -> None:
+    addresses = [chr(ord("D") + i) * 58 for i in range(5)]
+    params = AssetParams(asset_id=1, total=100, reserve=RESERVE)
+    config = CirculatingSupplyConfig(*addresses)
+
+    getter, extra = getter_resources(42, 1, params, config)
+
+    assert getter.asset_references == [1]
+    assert getter.box_references[0].name == (1).to_bytes(8, "big")
+    assert getter.account_references == [RESERVE, *addresses[:3]]
+    assert extra.asset_references == [1]
+    assert extra.account_references == addresses[3:]
+    assert len(getter_resources(42, 1, params, empty_config())) == 1
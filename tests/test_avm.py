@@ -0,0 +1,157 @@
+import base64
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+import pytest
+from algosdk.source_map import SourceMap
+
+from helpers.avm import AssembleError, AvmError, StackValue, assemble, evaluate
+
+ARTIFACTS = Path(__file__).parents[1] / "smart_contracts/artifacts/circulating_supply"
+
+SENDER = bytes(range(32))
+
+PROGRAM = """#pragma version 12
+    intcblock 0 1
+    bytecblock 0x01 "box"
+    txn NumAppArgs
+    bz bare
+    txna ApplicationArgs 0
+    pushbytess "double" "store" // method names
+    uncover 2
+    match double store
+    err
+
+double:
+    pushint 21
+    callsub twice
+    itob
+    log
+    intc_1
+    return
+
+store:
+    bytec_1
+    pushint 8
+    box_create
+    assert
+    bytec_1
+    intc_0
+    bytec_0
+    box_replace
+    intc_1
+    return
+
+bare:
+    txn Sender
+    len
+    pushint 32
+    ==
+    assert
+    intc_0
+    return
+
+twice:
+    proto 1 1
+    frame_dig -1
+    dup
+    +
+    retsub
+"""
+
+
+class _Context:
+    """Single App Call with its arguments, and the App boxes"""
+
+    def __init__(self, *args: bytes) -> None:
+        self.args = list(args)
+        self.boxes: dict[bytes, bytes] = {}
+
+    def txn_field(self, group_index: int, field: str) -> Any:  # noqa: ANN401
+        return {
+            "Sender": SENDER,
+            "ApplicationArgs": self.args,
+            "NumAppArgs": len(self.args),
+        }[field]
+
+    def global_field(self, field: str) -> StackValue:
+        return {"GroupSize": 1}[field]
+
+    def box(self, name: bytes) -> bytes | None:
+        return self.boxes.get(name)
+
+    def put_box(self, name: bytes, value: bytes) -> None:
+        self.boxes[name] = value
+
+    def delete_box(self, name: bytes) -> None:
+        del self.boxes[name]
+
+    def submit_inner(self, fields: Mapping[str, Any]) -> None:
+        raise NotImplementedError
+
+
+def test_pass_assemble_circulating_supply() -> None:
+    # The ARC-56 bytecode is compiled with empty template values
+    app_spec = json.loads((ARTIFACTS / "CirculatingSupply.arc56.json").read_text())
+    for program in ("approval", "clear"):
+        teal = (ARTIFACTS / f"CirculatingSupply.{program}.teal").read_text()
+        assembled = assemble(teal.replace("TMPL_ARC54_BURN_ADDRESS", "0x"))
+        assert assembled.bytecode == base64.b64decode(app_spec["byteCode"][program])
+
+
+def test_pass_source_map() -> None:
+    program = assemble(PROGRAM)
+    # `intcblock`, after the version byte, is on line 1 (0-based)
+    assert program.lines[1] == 1
+    source_map = SourceMap(program.source_map())
+    assert all(source_map.get_line_for_pc(pc) == n for pc, n in program.lines.items())
+
+
+def test_pass_evaluate() -> None:
+    program = assemble(PROGRAM).bytecode
+    evaluation = evaluate(program, _Context(b"double"), 0)
+    assert evaluation.approved
+    assert evaluation.logs == [(42).to_bytes(8, "big")]
+
+    context = _Context(b"store")
+    evaluation = evaluate(
+        program, context, 0, trace={"enable": True, "state-change": True}
+    )
+    assert evaluation.approved
+    assert context.boxes == {b"box": b"\x01" + bytes(7)}
+    assert evaluation.cost == len(evaluation.trace)
+    changes = [c for step in evaluation.trace for c in step.get("state-changes", [])]
+    assert [c["new-value"]["bytes"] for c in changes] == [
+        base64.b64encode(bytes(8)).decode(),
+        base64.b64encode(b"\x01" + bytes(7)).decode(),
+    ]
+
+    # The bare call returns 0
+    assert not evaluate(program, _Context(), 0).approved
+
+
+def test_fail_evaluate() -> None:
+    program = assemble(PROGRAM)
+    with pytest.raises(AvmError, match="err opcode executed") as e:
+        evaluate(program.bytecode, _Context(b"unknown"), 0)
+    assert program.lines[e.value.pc] == 9
+
+    context = _Context(b"store")
+    context.boxes[b"box"] = bytes(8)
+    with pytest.raises(AvmError, match="assert failed") as e:
+        evaluate(program.bytecode, context, 0)
+    assert e.value.op == "assert"
+
+    with pytest.raises(AvmError, match="dynamic cost budget exceeded"):
+        evaluate(program.bytecode, _Context(b"double"), 0, budget=5)
+
+
+def test_fail_assemble() -> None:
+    with pytest.raises(AssembleError, match="unknown opcode: int"):
+        assemble("#pragma version 12\nint 1\n")
+    with pytest.raises(AssembleError, match="undefined label missing"):
+        assemble("#pragma version 12\nb missing\n")
+    with pytest.raises(AssembleError, match="unable to parse 'TMPL_VALUE'"):
+        assemble("#pragma version 12\npushbytes TMPL_VALUE\n")
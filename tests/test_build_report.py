@@ -0,0 +1,89 @@
+import dataclasses
+
+from helpers.build_report import (
+    BuildBudget,
+    app_interfaces,
+    build_reports,
+    cheapest_variant,
+    check_budget,
+    diff_reports,
+    extra_pages,
+)
+from helpers.cost_estimator import method_costs
+from helpers.cost_profiler import ARTIFACTS_DIR
+
+
+def test_pass_build_reports() -> None:
+    report = build_reports(ARTIFACTS_DIR)["CirculatingSupply"]
+    assert report.clear_bytes == 4
+    assert report.extra_pages == extra_pages(report.program_bytes) == 0
+    assert report.method_costs == {
+        name: cost.opcode_cost for name, cost in method_costs().items()
+    }
+    assert extra_pages(2048) == 0
+    assert extra_pages(2049) == 1
+
+
+def test_pass_diff_reports() -> None:
+    previous = build_reports(ARTIFACTS_DIR)
+    report = previous["CirculatingSupply"]
+    costs = {
+        **report.method_costs,
+        "init_config": report.method_costs["init_config"] + 4,
+    }
+    del costs["extra_resources"]
+    current = {
+        "CirculatingSupply": dataclasses.replace(
+            report, approval_bytes=report.approval_bytes - 10, method_costs=costs
+        )
+    }
+    assert diff_reports(previous, previous) == []
+    assert diff_reports(previous, current) == [
+        f"CirculatingSupply approval bytes: {report.approval_bytes} -> "
+        f"{report.approval_bytes - 10} (-10)",
+        f"CirculatingSupply init_config opcode cost: "
+        f"{report.method_costs['init_config']} -> {costs['init_config']} (+4)",
+        f"CirculatingSupply extra_resources opcode cost: removed, was "
+        f"{report.method_costs['extra_resources']}",
+    ]
+    assert diff_reports({}, previous) == [
+        f"CirculatingSupply: new, {report.program_bytes} program bytes, 0 extra pages"
+    ]
+
+
+def test_fail_build_budget() -> None:
+    reports = build_reports(ARTIFACTS_DIR)
+    report = reports["CirculatingSupply"]
+    assert check_budget(reports, BuildBudget()) == []
+    max_cost = max(report.method_costs.values())
+    violations = check_budget(
+        reports,
+        BuildBudget(
+            program_bytes=report.program_bytes - 1,
+            extra_pages=0,
+            opcode_cost=max_cost - 1,
+        ),
+    )
+    assert violations == [
+        f"CirculatingSupply program bytes: {report.program_bytes} > "
+        f"{report.program_bytes - 1}",
+        f"CirculatingSupply arc62_get_circulating_supply opcode cost: {max_cost} > "
+        f"{max_cost - 1}",
+    ]
+
+
+def test_pass_cheapest_variant() -> None:
+    reports = build_reports(ARTIFACTS_DIR)
+    report = reports["CirculatingSupply"]
+    larger = dataclasses.replace(report, approval_bytes=report.approval_bytes + 1)
+    costlier = dataclasses.replace(
+        report, method_costs={**report.method_costs, "get_config": 1_000}
+    )
+    assert cheapest_variant({0: {"App": costlier}, 1: {"App": larger}}) == 1
+    assert cheapest_variant({0: {"App": larger}, 1: {"App": report}}) == 1
+    assert cheapest_variant({0: reports, 1: reports}) == 0
+
+    interfaces = app_interfaces(ARTIFACTS_DIR)
+    assert list(interfaces) == ["CirculatingSupply"]
+    assert "byteCode" not in interfaces["CirculatingSupply"]
+    assert interfaces["CirculatingSupply"]["name"] == "CirculatingSupply"
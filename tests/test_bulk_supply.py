@@ -0,0 +1,105 @@
+import random
+
+import pytest
+from algosdk.account import generate_account
+from algosdk.constants import ZERO_ADDRESS
+
+from helpers.asset_params import AssetParams
+from helpers.bulk_supply import LABELS, HoldingsSnapshot, compute_bulk_supply
+from helpers.circulating_supply import (
+    compute_circulating_supply,
+    empty_config,
+    non_circulating_balances,
+)
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyConfig,
+)
+
+ADDRESSES = [generate_account()[1] for _ in range(12)]
+TOTAL = 1_000_000
+
+
+def _random_ledger(seed: int, assets: int) -> tuple[
+    list[tuple[int, str, int]],
+    dict[int, CirculatingSupplyConfig],
+    dict[int, AssetParams | None],
+]:
+    rng = random.Random(seed)
+    rows, configs, params = [], {}, {}
+    for asset_id in range(1, assets + 1):
+        if rng.random() < 0.1:  # Deleted ASA
+            params[asset_id] = None
+            configs[asset_id] = empty_config()
+            continue
+        addresses = [*rng.sample(ADDRESSES, 6), ZERO_ADDRESS]
+        params[asset_id] = AssetParams(
+            asset_id=asset_id, total=TOTAL, reserve=rng.choice(addresses)
+        )
+        configs[asset_id] = CirculatingSupplyConfig(
+            *(rng.choice(addresses) for _ in range(5))
+        )
+        # Some addresses are not opted-in
+        for address in rng.sample(ADDRESSES, 8):
+            rows.append((asset_id, address, rng.randrange(TOTAL // 10)))
+    rng.shuffle(rows)
+    return rows, configs, params
+
+
+def test_pass_matches_scalar_supply() -> None:
+    rows, configs, params = _random_ledger(seed=62, assets=200)
+    result = compute_bulk_supply(HoldingsSnapshot.from_rows(rows), configs, params)
+
+    balances: dict[int, dict[str, int]] = {}
+    for asset_id, address, balance in rows:
+        balances.setdefault(asset_id, {})[address] = balance
+    assert result.to_dict() == {
+        asset_id: compute_circulating_supply(
+            params[asset_id], config, balances.get(asset_id, {})
+        )
+        for asset_id, config in configs.items()
+    }
+    for asset_id, config in configs.items():
+        if params[asset_id] is None:
+            continue
+        expected = non_circulating_balances(
+            params[asset_id], config, balances.get(asset_id, {})
+        )
+        assert {
+            label: balance
+            for label, balance in result.breakdown_of(asset_id).items()
+            if label in expected
+        } == expected
+
+
+def test_pass_breakdown() -> None:
+    reserve, burned = ADDRESSES[:2]
+    params = {1: AssetParams(asset_id=1, total=100, reserve=reserve)}
+    configs = {1: CirculatingSupplyConfig(burned, *(ZERO_ADDRESS,) * 4)}
+    holdings = HoldingsSnapshot.from_rows(
+        [(1, reserve, 30), (1, burned, 20), (1, ZERO_ADDRESS, 5), (2, burned, 7)]
+    )
+
+    result = compute_bulk_supply(holdings, configs, params)
+
+    assert result.to_dict() == {1: 50}
+    assert result.breakdown_of(1) == dict.fromkeys(LABELS, 0) | {
+        LABELS[0]: 30,
+        LABELS[1]: 20,
+    }
+    with pytest.raises(KeyError):
+        result.breakdown_of(2)
+
+
+def test_fail_underflow() -> None:
+    # The same address set on every label is subtracted many times
+    address = ADDRESSES[0]
+    params = {1: AssetParams(asset_id=1, total=100, reserve=address)}
+    configs = {1: CirculatingSupplyConfig(*(address,) * 5)}
+    holdings = HoldingsSnapshot.from_rows([(1, address, 60)])
+
+    result = compute_bulk_supply(holdings, configs, params)
+
+    assert result.underflow.tolist() == [True]
+    assert result.to_dict() == {}
+    with pytest.raises(ArithmeticError):
+        compute_circulating_supply(params[1], configs[1], {address: 60})
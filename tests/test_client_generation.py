@@ -0,0 +1,46 @@
+import dataclasses
+import importlib.util
+from pathlib import Path
+from types import ModuleType
+
+import pytest
+
+from helpers.client_generation import ClientGenerationError, make_client_lazy
+from helpers.fake_algod import fake_algorand_client
+from smart_contracts.artifacts.circulating_supply import circulating_supply_client
+
+CLIENT_SOURCE = Path(circulating_supply_client.__file__).read_text()
+
+
+def _import_lazy_client(tmp_path: Path) -> ModuleType:
+    path = tmp_path / "lazy_circulating_supply_client.py"
+    path.write_text(make_client_lazy(CLIENT_SOURCE))
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_pass_lazy_client(tmp_path: Path) -> None:
+    client = _import_lazy_client(tmp_path)
+    assert client._app_spec.cache_info().currsize == 0
+
+    factory = client.CirculatingSupplyFactory(fake_algorand_client())
+    assert factory.app_name == circulating_supply_client.APP_SPEC.name
+    assert client.APP_SPEC is client._app_spec()
+    assert client._app_spec.cache_info().misses == 1
+
+    args = client.SetNotCirculatingAddressArgs(asset=1, address="", label="")
+    assert not hasattr(args, "__dict__")
+    assert [f.name for f in dataclasses.fields(client.CirculatingSupplyConfig)] == [
+        f.name
+        for f in dataclasses.fields(circulating_supply_client.CirculatingSupplyConfig)
+    ]
+    assert make_client_lazy(make_client_lazy(CLIENT_SOURCE)) == make_client_lazy(
+        CLIENT_SOURCE
+    )
+
+
+def test_fail_unexpected_client_layout() -> None:
+    with pytest.raises(ClientGenerationError):
+        make_client_lazy(CLIENT_SOURCE + "SPEC = APP_SPEC\n")
@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Any
+
+from helpers.app_calls import (
+    DELETE_CONFIG,
+    INIT_CONFIG,
+    ConfigUpdate,
+    encode_config_update,
+)
+from helpers.circulating_supply import config_box_name
+from helpers.config_index import BloomFilter, ConfiguredAssetIndex
+
+APP_ID = 1234
+
+
+def _app_call(update: ConfigUpdate, app_id: int = APP_ID) -> dict[str, Any]:
+    return {
+        "txn": {"type": "appl", "apid": app_id, "apaa": encode_config_update(update)}
+    }
+
+
+def test_pass_bloom_filter() -> None:
+    bloom = BloomFilter(capacity=1_000, false_positive_rate=0.01)
+    for i in range(1_000):
+        bloom.add(config_box_name(i))
+
+    assert all(config_box_name(i) in bloom for i in range(1_000))
+    false_positives = sum(config_box_name(i) in bloom for i in range(1_000, 101_000))
+    assert false_positives / 100_000 < 0.02
+    assert BloomFilter.from_bytes(bloom.to_bytes()).to_bytes() == bloom.to_bytes()
+
+
+def test_pass_bloom_filter_growth() -> None:
+    bloom = BloomFilter(capacity=1_000, false_positive_rate=0.01)
+    for i in range(10_000):
+        bloom.add(config_box_name(i))
+
+    # Layers of 1_000, 2_000, 4_000 and 8_000 items
+    assert bloom.layers == 4
+    assert all(config_box_name(i) in bloom for i in range(10_000))
+    false_positives = sum(config_box_name(i) in bloom for i in range(10_000, 110_000))
+    assert bloom.false_positive_rate < 0.01
+    assert false_positives / 100_000 < 0.01
+    loaded = BloomFilter.from_bytes(bloom.to_bytes())
+    assert loaded.layers == 4
+    assert config_box_name(9_999) in loaded
+
+
+def test_pass_configured_asset_index(tmp_path: Path) -> None:
+    index = ConfiguredAssetIndex.from_box_names(
+        APP_ID, [config_box_name(a) for a in range(1, 100)]
+    )
+    assert index.might_have_config(1)
+    assert not index.might_have_config(1_000)
+
+    index.observe_transaction(_app_call(ConfigUpdate(INIT_CONFIG, 1_000)))
+    index.observe_transaction(_app_call(ConfigUpdate(DELETE_CONFIG, 1)))
+    # Other Apps are ignored
+    index.observe_transaction(_app_call(ConfigUpdate(INIT_CONFIG, 2_000), 42))
+    index.save(tmp_path / "index.bin")
+
+    index = ConfiguredAssetIndex.load(tmp_path / "index.bin")
+    assert index.app_id == APP_ID
+    assert index.might_have_config(1_000)
+    assert not index.might_have_config(2_000)
+    assert index.stale == 1
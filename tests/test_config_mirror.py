@@ -0,0 +1,118 @@
+import base64
+from pathlib import Path
+from typing import Any
+
+import pytest
+from algosdk.constants import ZERO_ADDRESS
+
+from helpers.app_calls import (
+    DELETE_CONFIG,
+    INIT_CONFIG,
+    SET_NOT_CIRCULATING_ADDRESS,
+    ConfigUpdate,
+    encode_config_update,
+)
+from helpers.circulating_supply import empty_config
+from helpers.config_mirror import ConfigMirror
+from smart_contracts.circulating_supply import config as cfg
+
+APP_ID = 1234
+ADDRESS = "7ZUECA7HFLZTXENRV24SHLU4AVPUTMTTDUFUBNBD64C73F3UHRTHAIOF6Q"
+
+
+def _indexer_txn(update: ConfigUpdate, round_num: int) -> dict[str, Any]:
+    return {
+        "tx-type": "appl",
+        "confirmed-round": round_num,
+        "application-transaction": {
+            "application-id": APP_ID,
+            "on-completion": "noop",
+            "application-args": [
+                base64.b64encode(a).decode() for a in encode_config_update(update)
+            ],
+        },
+    }
+
+
+def _block_txn(update: ConfigUpdate, app_id: int = APP_ID) -> dict[str, Any]:
+    return {
+        "txn": {"type": "appl", "apid": app_id, "apaa": encode_config_update(update)}
+    }
+
+
+class _Indexer:
+    def __init__(self, pages: list[list[dict[str, Any]]]) -> None:
+        self.pages = pages
+        self.min_rounds: list[int] = []
+
+    def search_transactions(self, **kwargs: Any) -> dict[str, Any]:
+        self.min_rounds.append(kwargs["min_round"])
+        page = int(kwargs["next_page"] or 0)
+        return {
+            "current-round": 100,
+            "transactions": self.pages[page],
+            "next-token": str(page + 1) if page + 1 < len(self.pages) else None,
+        }
+
+
+def test_pass_apply_transactions(tmp_path: Path) -> None:
+    path = tmp_path / "mirror.sqlite"
+    with ConfigMirror(path, APP_ID) as mirror:
+        mirror.reset({1: empty_config()}, 10)
+        mirror.apply_transactions(
+            [
+                _indexer_txn(ConfigUpdate(INIT_CONFIG, 2), 11),
+                _indexer_txn(
+                    ConfigUpdate(SET_NOT_CIRCULATING_ADDRESS, 2, cfg.CUSTOM_2, ADDRESS),
+                    12,
+                ),
+            ]
+        )
+        mirror.apply_transactions(
+            [
+                _block_txn(ConfigUpdate(DELETE_CONFIG, 1)),
+                _block_txn(ConfigUpdate(INIT_CONFIG, 3), app_id=APP_ID + 1),
+            ],
+            round_num=13,
+        )
+
+    # Warm restart
+    with ConfigMirror(path, APP_ID) as mirror:
+        assert mirror.last_round == 13
+        assert 1 not in mirror
+        assert 3 not in mirror
+        assert len(mirror) == 1
+        config = mirror.get(2)
+        assert config.custom_2_addr == ADDRESS
+        assert config.burned_addr == ZERO_ADDRESS
+        assert mirror.get_round(2) == 12
+
+
+def test_pass_sync_incremental(tmp_path: Path) -> None:
+    indexer = _Indexer(
+        [
+            [_indexer_txn(ConfigUpdate(INIT_CONFIG, 5), 50)],
+            [_indexer_txn(ConfigUpdate(DELETE_CONFIG, 5), 60)],
+            [],
+        ]
+    )
+    with ConfigMirror(tmp_path / "mirror.sqlite", APP_ID) as mirror:
+        mirror.reset({}, 40)
+        assert mirror.sync_incremental(indexer) == 2
+        assert indexer.min_rounds == [41, 41, 41]
+        assert mirror.last_round == 100
+        assert not mirror.get_all()
+
+
+def test_fail_app_mismatch(tmp_path: Path) -> None:
+    path = tmp_path / "mirror.sqlite"
+    ConfigMirror(path, APP_ID).close()
+    with pytest.raises(ValueError, match="belongs to App"):
+        ConfigMirror(path, APP_ID + 1)
+
+
+def test_fail_apply_past_round(tmp_path: Path) -> None:
+    with ConfigMirror(tmp_path / "mirror.sqlite", APP_ID) as mirror:
+        mirror.reset({}, 10)
+        with pytest.raises(ValueError, match="precedes"):
+            mirror.apply([ConfigUpdate(INIT_CONFIG, 1)], 9)
@@ -0,0 +1,225 @@
+import base64
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from algokit_utils import (
+    AlgoAmount,
+    AlgorandClient,
+    AssetDestroyParams,
+    AssetTransferParams,
+    CommonAppCallParams,
+    PaymentParams,
+    SigningAccount,
+)
+
+from helpers.cost_benchmark import (
+    BOX_GET,
+    CallCost,
+    compare_costs,
+    load_baseline,
+    measure_call,
+    save_baseline,
+    trace_cost,
+)
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    Arc62GetCirculatingSupplyArgs,
+    CirculatingSupplyClient,
+    CirculatingSupplyComposer,
+    DeleteConfigArgs,
+    GetConfigArgs,
+    InitConfigArgs,
+    SetNotCirculatingAddressArgs,
+)
+from smart_contracts.circulating_supply import config as cfg
+
+from .conftest import CONFIG_MBR, HOLDER_BALANCES
+
+# Recorded on LocalNet, only (re-)recorded with UPDATE_COST_BASELINE set
+COST_BASELINE = Path(__file__).parent / "cost_baseline.json"
+UPDATE_COST_BASELINE = "UPDATE_COST_BASELINE"
+# Set to run the benchmark against the baseline: opt-in until the baseline is committed
+COST_BENCHMARK = "COST_BENCHMARK"
+
+SLOTS = (
+    ("burned_supply", cfg.BURNED),
+    ("custom_supply_1", cfg.CUSTOM_1),
+    ("custom_supply_2", cfg.CUSTOM_2),
+    ("custom_supply_3", cfg.CUSTOM_3),
+    ("custom_supply_4", cfg.CUSTOM_4),
+)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def test_pass_trace_cost() -> None:
+    program = bytes([0x0C, BOX_GET, 0x00])
+    response = {
+        "txn-groups": [
+            {
+                "txn-results": [
+                    {"txn-result": {}},
+                    {
+                        "app-budget-consumed": 42,
+                        "exec-trace": {
+                            "approval-program-trace": [
+                                {
+                                    "pc": 1,
+                                    "stack-additions": [
+                                        {"type": 1, "bytes": _b64(bytes(160))},
+                                        {"type": 2, "uint": 1},
+                                    ],
+                                },
+                                {
+                                    "pc": 2,
+                                    "stack-additions": [{"type": 1, "bytes": "AA=="}],
+                                    "state-changes": [
+                                        {
+                                            "app-state-type": "b",
+                                            "operation": "w",
+                                            "key": _b64(bytes(8)),
+                                            "new-value": {"bytes": _b64(bytes(160))},
+                                        }
+                                    ],
+                                },
+                            ]
+                        },
+                    },
+                ]
+            }
+        ]
+    }
+    assert trace_cost(response, program) == (42, 160, 160)
+
+
+def test_pass_compare_costs(tmp_path: Path) -> None:
+    cost = CallCost(
+        opcode_cost=100, box_read_bytes=0, box_write_bytes=0, mbr_delta=0, fees=1_000
+    )
+    save_baseline(tmp_path / "baseline.json", {"call": cost})
+    baseline = load_baseline(tmp_path / "baseline.json")
+    assert compare_costs(baseline, {"call": cost}) == []
+    assert compare_costs(baseline, {"new": cost}) == []
+    slower = CallCost(105, 0, 0, 0, 1_000)
+    assert compare_costs(baseline, {"call": slower}, threshold=0.05) == []
+    assert compare_costs(baseline, {"call": slower}, threshold=0.01) == [
+        "call opcode_cost: 105 > 100"
+    ]
+
+
+@pytest.mark.skipif(
+    not (os.environ.get(COST_BENCHMARK) or os.environ.get(UPDATE_COST_BASELINE)),
+    reason=f"Opt-in with {COST_BENCHMARK}=1, once the cost baseline is recorded",
+)
+@pytest.mark.usefixtures(*HOLDER_BALANCES)
+def test_pass_cost_benchmark(
+    algorand: AlgorandClient,
+    circulating_supply_client: CirculatingSupplyClient,
+    asset_creator: SigningAccount,
+    asset_manager: SigningAccount,
+    asset: int,
+    asset_balances: dict[str, SigningAccount],
+) -> None:
+    client = circulating_supply_client
+    min_fee = algorand.get_suggested_params().min_fee
+    costs: dict[str, CallCost] = {}
+
+    def measure(name: str, call: Callable[[CirculatingSupplyComposer], object]) -> None:
+        def new_group() -> CirculatingSupplyComposer:
+            group = client.new_group()
+            call(group)
+            return group
+
+        costs[name] = measure_call(client, new_group)
+
+    params = CommonAppCallParams(sender=asset_manager.address)
+    measure(
+        "init_config",
+        lambda g: g.init_config(
+            args=InitConfigArgs(
+                asset=asset,
+                mbr_payment=algorand.create_transaction.payment(
+                    PaymentParams(
+                        sender=asset_manager.address,
+                        receiver=client.app_address,
+                        amount=CONFIG_MBR,
+                    )
+                ),
+            ),
+            params=params,
+        ),
+    )
+    for slots in range(len(SLOTS) + 1):
+        measure(
+            f"get_config[{slots} slots]",
+            lambda g: g.get_config(args=GetConfigArgs(asset=asset), params=params),
+        )
+        measure(
+            f"arc62_get_circulating_supply[{slots} slots]",
+            lambda g: g.arc62_get_circulating_supply(
+                args=Arc62GetCirculatingSupplyArgs(asset_id=asset), params=params
+            ),
+        )
+        if slots < len(SLOTS):
+            holder, label = SLOTS[slots]
+            measure(
+                f"set_not_circulating_address[{label}]",
+                lambda g, h=holder, lb=label: g.set_not_circulating_address(
+                    args=SetNotCirculatingAddressArgs(
+                        asset=asset, address=asset_balances[h].address, label=lb
+                    ),
+                    params=params,
+                ),
+            )
+
+    # Non-circulating addresses (and reserve) closed out of the ASA
+    for holder in asset_balances.values():
+        algorand.send.asset_transfer(
+            AssetTransferParams(
+                sender=holder.address,
+                signer=holder.signer,
+                asset_id=asset,
+                amount=0,
+                receiver=asset_creator.address,
+                close_asset_to=asset_creator.address,
+            )
+        )
+    measure(
+        "arc62_get_circulating_supply[opted out]",
+        lambda g: g.arc62_get_circulating_supply(
+            args=Arc62GetCirculatingSupplyArgs(asset_id=asset), params=params
+        ),
+    )
+
+    algorand.send.asset_destroy(
+        AssetDestroyParams(sender=asset_manager.address, asset_id=asset)
+    )
+    measure(
+        "arc62_get_circulating_supply[deleted asa]",
+        lambda g: g.arc62_get_circulating_supply(
+            args=Arc62GetCirculatingSupplyArgs(asset_id=asset), params=params
+        ),
+    )
+    measure(
+        "delete_config[deleted asa]",
+        lambda g: g.delete_config(
+            args=DeleteConfigArgs(asset=asset),
+            params=CommonAppCallParams(
+                sender=asset_manager.address,
+                extra_fee=AlgoAmount(micro_algo=min_fee),
+            ),
+        ),
+    )
+
+    if os.environ.get(UPDATE_COST_BASELINE):
+        save_baseline(COST_BASELINE, costs)
+        pytest.skip(f"Recorded the cost baseline in {COST_BASELINE}")
+    assert COST_BASELINE.exists(), (
+        f"Missing cost baseline {COST_BASELINE}: record it on LocalNet with "
+        f"{UPDATE_COST_BASELINE}=1 and commit it"
+    )
+    regressions = compare_costs(load_baseline(COST_BASELINE), costs)
+    assert not regressions, "Cost regressions:\n" + "\n".join(regressions)
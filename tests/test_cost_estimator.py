@@ -0,0 +1,74 @@
+import pytest
+
+from helpers.cost_estimator import CostEstimationError, CostEstimator, method_costs
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    APP_SPEC,
+)
+
+TEAL = """#pragma version 12
+main:
+    pushbytess 0x01020304 0x05060708 // method "first()void", method "second()void"
+    txna ApplicationArgs 0
+    match first second
+    err
+
+first:
+    txn NumAppArgs
+    bnz first_reject@1
+    callsub double_sha
+    callsub double_sha
+    pushint 1 // "//"
+    return
+
+first_reject@1:
+    err
+
+second:
+    itxn_begin
+    itxn_next
+    itxn_submit
+    pushint 1
+    return
+
+double_sha:
+    sha256
+    sha256
+    retsub
+"""
+
+
+def test_pass_method_costs() -> None:
+    costs = method_costs()
+    assert list(costs) == [m.name for m in APP_SPEC.methods]
+    assert costs["extra_resources"].opcode_cost == 14
+    assert costs["withdraw_balance_excess"].inner_transactions == 1
+    assert costs["withdraw_balance_excess"].min_fee() == 2_000
+    assert costs["arc62_get_circulating_supply"].box_ops > 0
+    assert all(c.app_calls == 1 for c in costs.values())
+
+
+def test_pass_subroutines_and_rejects() -> None:
+    first, second = CostEstimator(TEAL).method_costs().values()
+    assert first.method == "01020304"
+    assert first.opcode_cost == 3 + 2 + 1 + 71 + 1 + 71 + 2
+    assert first.app_calls == 1
+    assert second.opcode_cost == 8
+    assert second.inner_transactions == 2
+    assert second.min_fee(min_txn_fee=1_000) == 3_000
+
+
+def test_pass_unoptimized_router() -> None:
+    # Without optimization each selector is pushed on its own
+    teal = TEAL.replace(
+        "    pushbytess 0x01020304 0x05060708",
+        "    pushbytes 0xffffffff\n    pushbytes 0x01020304\n    pushbytes 0x05060708",
+    )
+    names = {bytes.fromhex("01020304"): "first", bytes.fromhex("05060708"): "second"}
+    costs = CostEstimator(teal, names).method_costs()
+    assert list(costs) == ["first", "second"]
+    assert costs["second"].opcode_cost == 10
+
+
+def test_fail_unbounded_loop() -> None:
+    with pytest.raises(CostEstimationError):
+        CostEstimator("main:\nloop@1:\n    b loop@1\n")
@@ -0,0 +1,94 @@
+import base64
+from typing import Any
+
+from algokit_utils.applications.app_client import get_constant_block_offset
+from algosdk import abi
+
+from helpers.cost_profiler import CostProfiler, PuyaSourceMap, opcode_cost
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    APP_SPEC,
+)
+
+# Version, `intcblock 0 1 8 32`, `bytecblock 0x151f7c75 <burning address>`
+PROGRAM = (
+    bytes([0x0C, 0x20, 0x04, 0x00, 0x01, 0x08, 0x20, 0x26, 0x02, 0x04])
+    + bytes.fromhex("151f7c75")
+    + bytes([0x20])
+    + bytes(32)
+    + bytes.fromhex("311b")  # txn NumAppArgs
+)
+CBLOCKS = get_constant_block_offset(PROGRAM)
+
+# init_config ops of `Txn.sender == asset.manager` (line 61) and its assert (line 60)
+SENDER_IS_MANAGER_PCS = (98, 100, 102, 104, 105)
+UNAUTHORIZED_PC = 106
+
+
+def _simulate_response(method: str, pcs: list[int]) -> dict[str, Any]:
+    selector = next(
+        m.to_abi_method().get_selector() for m in APP_SPEC.methods if m.name == method
+    )
+    return {
+        "txn-groups": [
+            {
+                "txn-results": [
+                    {
+                        "app-budget-consumed": len(pcs),
+                        "txn-result": {
+                            "txn": {
+                                "txn": {
+                                    "apaa": [
+                                        base64.b64encode(selector).decode(),
+                                        base64.b64encode(
+                                            abi.UintType(64).encode(1)
+                                        ).decode(),
+                                    ]
+                                }
+                            }
+                        },
+                        "exec-trace": {
+                            "approval-program-trace": [{"pc": pc} for pc in pcs]
+                        },
+                    }
+                ]
+            }
+        ]
+    }
+
+
+def test_pass_source_map() -> None:
+    source_map = PuyaSourceMap.from_file()
+    assert source_map.sources[0].name == "contract.py"
+    source = source_map.sources[0].read_text().splitlines()
+    _, line = source_map.lines[UNAUTHORIZED_PC]
+    assert source_map.ops[UNAUTHORIZED_PC] == "assert // Unauthorized"
+    assert source[line - 1] == "        assert ("
+    assert opcode_cost(source_map.ops[UNAUTHORIZED_PC]) == 1
+    assert opcode_cost("sha256") == 35
+    assert opcode_cost("ecdsa_verify Secp256k1") == 1_700
+    assert opcode_cost("ecdsa_verify Secp256r1") == 2_500
+    assert opcode_cost("ec_pairing_check BN254g1") == 8_000
+
+
+def test_pass_cost_profiler() -> None:
+    profiler = CostProfiler()
+    pcs = [CBLOCKS + pc for pc in (*SENDER_IS_MANAGER_PCS, UNAUTHORIZED_PC)]
+    profiler.add_simulation(_simulate_response("init_config", [1, *pcs]), PROGRAM)
+    profiler.add_simulation(_simulate_response("init_config", pcs), PROGRAM)
+
+    costs = {(c.method, c.line): c.cost for c in profiler.line_costs()}
+    assert costs == {
+        ("init_config", 0): 1,
+        ("init_config", 60): 2,
+        ("init_config", 61): 10,
+    }
+    assert profiler.budget_consumed == 13
+    assert "init_config;contract.py:61 Txn.sender == asset.manager 10\n" in (
+        profiler.folded_stacks()
+    )
+    report = profiler.annotated_source("init_config")
+    assert "(total cost 13)" in report
+    assert "    10     10   76.9              Txn.sender == asset.manager" in report
+    assert profiler.annotated_source("delete_config").startswith(
+        "  cost    ops      %  (total cost 0)"
+    )
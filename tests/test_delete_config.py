@@ -4,12 +4,10 @@ from algokit_utils import (
     AlgorandClient,
     AssetDestroyParams,
     CommonAppCallParams,
-    LogicError,
     SigningAccount,
 )
 from algosdk.error import AlgodHTTPError
 
-from smart_contracts import errors as err
 from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
     CirculatingSupplyClient,
     DeleteConfigArgs,
@@ -74,27 +72,3 @@ def test_pass_delete_config_for_deleted_asset(
     )
 
     assert result.abi_return == CONFIG_MBR
-
-
-def test_fail_unauthorized(
-    asset_creator: SigningAccount,
-    asset: int,
-    asset_circulating_supply_client: CirculatingSupplyClient,
-) -> None:
-    with pytest.raises(LogicError, match=err.UNAUTHORIZED):
-        asset_circulating_supply_client.send.delete_config(
-            args=DeleteConfigArgs(asset=asset),
-            params=CommonAppCallParams(sender=asset_creator.address),
-        )
-
-
-def test_fail_config_not_exists(
-    asset_manager: SigningAccount,
-    asset: int,
-    circulating_supply_client: CirculatingSupplyClient,
-) -> None:
-    with pytest.raises(LogicError, match=err.CONFIG_NOT_EXISTS):
-        circulating_supply_client.send.delete_config(
-            args=DeleteConfigArgs(asset=asset),
-            params=CommonAppCallParams(sender=asset_manager.address),
-        )
@@ -0,0 +1,51 @@
+import threading
+
+import pytest
+
+from helpers.deploy_graph import DeployGraphError, DeployStep, run_steps
+
+
+def test_pass_run_steps() -> None:
+    # The independent steps must be in flight together to pass the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def concurrent(value: int) -> int:
+        barrier.wait()
+        return value
+
+    results = run_steps(
+        [
+            DeployStep(
+                "sum", lambda r: r["first"] + r["second"], after=("first", "second")
+            ),
+            DeployStep("first", lambda _: concurrent(1)),
+            DeployStep("second", lambda _: concurrent(2)),
+            DeployStep("double", lambda r: 2 * r["sum"], after=("sum",)),
+        ]
+    )
+    assert results == {"first": 1, "second": 2, "sum": 3, "double": 6}
+
+
+def test_fail_run_steps() -> None:
+    def fail(_: object) -> None:
+        raise ValueError("Failed step")
+
+    skipped = []
+    with pytest.raises(ValueError, match="Failed step"):
+        run_steps(
+            [
+                DeployStep("fail", fail),
+                DeployStep("skipped", skipped.append, after=("fail",)),
+            ]
+        )
+    assert not skipped
+
+    with pytest.raises(DeployGraphError):
+        run_steps([DeployStep("orphan", lambda _: None, after=("missing",))])
+    with pytest.raises(DeployGraphError):
+        run_steps(
+            [
+                DeployStep("a", lambda _: None, after=("b",)),
+                DeployStep("b", lambda _: None, after=("a",)),
+            ]
+        )
@@ -0,0 +1,240 @@
+from typing import Any
+
+import pytest
+from algokit_utils import (
+    AlgoAmount,
+    AlgorandClient,
+    AppClientCompilationParams,
+    AssetCreateParams,
+    AssetOptInParams,
+    AssetTransferParams,
+    CommonAppCallParams,
+    LogicError,
+    PaymentParams,
+    SigningAccount,
+)
+from algosdk.encoding import decode_address
+from algosdk.error import AlgodHTTPError
+
+from helpers.avm import APP_CALL_BUDGET
+from helpers.cost_benchmark import measure_call
+from helpers.fake_algod import MIN_FEE, fake_algorand_client
+from helpers.supply_service import SupplyService
+from smart_contracts import errors as err
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    Arc62GetCirculatingSupplyArgs,
+    CirculatingSupplyClient,
+    CirculatingSupplyFactory,
+    DeleteConfigArgs,
+    InitConfigArgs,
+    SetNotCirculatingAddressArgs,
+)
+from smart_contracts.circulating_supply import config as cfg
+from smart_contracts.template_vars import ARC54_BURN_ADDRESS
+
+from .conftest import ACCOUNT_MBR, ASA_TOTAL, CONFIG_MBR
+
+
+@pytest.fixture()
+def algorand() -> AlgorandClient:
+    return fake_algorand_client()
+
+
+def _account(algorand: AlgorandClient) -> SigningAccount:
+    account = algorand.account.random()
+    algorand.account.ensure_funded(
+        account_to_fund=account.address,
+        dispenser_account=algorand.client.algod.dispenser.address,
+        min_spending_balance=AlgoAmount(algo=10),
+    )
+    return account
+
+
+def _holder(
+    algorand: AlgorandClient, manager: SigningAccount, asset: int, amount: int
+) -> SigningAccount:
+    holder = _account(algorand)
+    algorand.send.asset_opt_in(AssetOptInParams(sender=holder.address, asset_id=asset))
+    algorand.send.asset_transfer(
+        AssetTransferParams(
+            sender=manager.address,
+            asset_id=asset,
+            amount=amount,
+            receiver=holder.address,
+        )
+    )
+    return holder
+
+
+def _client(
+    algorand: AlgorandClient, deployer: SigningAccount, burned: SigningAccount
+) -> CirculatingSupplyClient:
+    factory = algorand.client.get_typed_app_factory(
+        CirculatingSupplyFactory,
+        compilation_params=AppClientCompilationParams(
+            deploy_time_params={ARC54_BURN_ADDRESS: decode_address(burned.address)}
+        ),
+        default_sender=deployer.address,
+    )
+    client, _ = factory.send.create.bare()
+    algorand.send.payment(
+        PaymentParams(
+            sender=deployer.address,
+            receiver=client.app_address,
+            amount=ACCOUNT_MBR,
+        )
+    )
+    return client
+
+
+def _init_config(
+    client: CirculatingSupplyClient, manager: SigningAccount, asset: int
+) -> int:
+    mbr_payment = client.algorand.create_transaction.payment(
+        PaymentParams(
+            sender=manager.address,
+            receiver=client.app_address,
+            amount=CONFIG_MBR,
+        )
+    )
+    return client.send.init_config(
+        args=InitConfigArgs(asset=asset, mbr_payment=mbr_payment),
+        params=CommonAppCallParams(sender=manager.address),
+    ).abi_return
+
+
+def test_pass_circulating_supply(algorand: AlgorandClient) -> None:
+    manager, burned = _account(algorand), _account(algorand)
+    client = _client(algorand, manager, burned)
+    asset = algorand.send.asset_create(
+        AssetCreateParams(
+            sender=manager.address, total=ASA_TOTAL, manager=manager.address
+        )
+    ).asset_id
+    algorand.send.asset_opt_in(AssetOptInParams(sender=burned.address, asset_id=asset))
+    algorand.send.asset_transfer(
+        AssetTransferParams(
+            sender=manager.address, asset_id=asset, amount=2, receiver=burned.address
+        )
+    )
+    custom = _holder(algorand, manager, asset, 3)
+
+    assert _init_config(client, manager, asset) == CONFIG_MBR
+    for address, label in (
+        (burned.address, cfg.BURNED),
+        (custom.address, cfg.CUSTOM_1),
+    ):
+        client.send.set_not_circulating_address(
+            args=SetNotCirculatingAddressArgs(
+                asset=asset, address=address, label=label
+            ),
+            params=CommonAppCallParams(sender=manager.address),
+        )
+
+    config_ = client.state.box.circulating_supply.get_value(asset)
+    assert (config_.burned_addr, config_.custom_1_addr) == (
+        burned.address,
+        custom.address,
+    )
+    supply = client.send.arc62_get_circulating_supply(
+        args=Arc62GetCirculatingSupplyArgs(asset_id=asset)
+    ).abi_return
+    assert supply == ASA_TOTAL - 2 - 3
+    # The programs are evaluated: simulate reports their cost and trace
+    cost = measure_call(
+        client,
+        lambda: client.new_group().arc62_get_circulating_supply(
+            args=Arc62GetCirculatingSupplyArgs(asset_id=asset)
+        ),
+    )
+    assert 0 < cost.opcode_cost <= APP_CALL_BUDGET
+    assert cost.box_read_bytes > 0
+    # The not configured ASA fails the simulated group
+    supplies = SupplyService.from_client(client).get_many([asset, asset + 1])
+    assert supplies[asset].supply == supply
+    assert supplies[asset + 1].supply is None
+
+    result = client.send.delete_config(
+        args=DeleteConfigArgs(asset=asset),
+        params=CommonAppCallParams(
+            sender=manager.address, extra_fee=AlgoAmount(micro_algo=MIN_FEE)
+        ),
+    )
+    assert result.abi_return == CONFIG_MBR
+    assert algorand.account.get_information(client.app_address).amount == ACCOUNT_MBR
+    with pytest.raises(AlgodHTTPError, match="box not found"):
+        client.state.box.circulating_supply.get_value(asset)
+
+
+def test_fail_supply_algod_error(
+    algorand: AlgorandClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    manager, burned = _account(algorand), _account(algorand)
+    client = _client(algorand, manager, burned)
+    asset = algorand.send.asset_create(
+        AssetCreateParams(
+            sender=manager.address, total=ASA_TOTAL, manager=manager.address
+        )
+    ).asset_id
+    _init_config(client, manager, asset)
+
+    algod = algorand.client.algod
+    algod_request = algod.algod_request
+    simulations = []
+
+    def unavailable(
+        method: str, requrl: str, *args: Any, **kwargs: Any
+    ) -> Any:  # noqa: ANN401
+        if requrl == "/transactions/simulate":
+            simulations.append(requrl)
+            raise AlgodHTTPError("Service unavailable", 503)
+        return algod_request(method, requrl, *args, **kwargs)
+
+    monkeypatch.setattr(algod, "algod_request", unavailable)
+    # An Algod error fails the whole group once, it is not isolated per ASA
+    with pytest.raises(AlgodHTTPError, match="Service unavailable"):
+        SupplyService.from_client(client).get_many([asset, asset + 1])
+    assert len(simulations) == 1
+
+
+def test_fail_logic_errors(algorand: AlgorandClient) -> None:
+    manager, burned = _account(algorand), _account(algorand)
+    client = _client(algorand, manager, burned)
+    asset = algorand.send.asset_create(
+        AssetCreateParams(
+            sender=manager.address,
+            total=ASA_TOTAL,
+            manager=manager.address,
+            clawback=manager.address,
+        )
+    ).asset_id
+
+    with pytest.raises(LogicError, match=err.CONFIG_NOT_EXISTS):
+        client.send.arc62_get_circulating_supply(
+            args=Arc62GetCirculatingSupplyArgs(asset_id=asset)
+        )
+    _init_config(client, manager, asset)
+    with pytest.raises(LogicError, match=err.CONFIG_EXISTS):
+        _init_config(client, manager, asset)
+    with pytest.raises(LogicError, match=err.NOT_OPTED_IN):
+        client.send.set_not_circulating_address(
+            args=SetNotCirculatingAddressArgs(
+                asset=asset, address=burned.address, label=cfg.BURNED
+            ),
+            params=CommonAppCallParams(sender=manager.address),
+        )
+    algorand.send.asset_opt_in(AssetOptInParams(sender=burned.address, asset_id=asset))
+    with pytest.raises(LogicError, match=err.ASA_NOT_ARC54_COMPLIANT):
+        client.send.set_not_circulating_address(
+            args=SetNotCirculatingAddressArgs(
+                asset=asset, address=burned.address, label=cfg.BURNED
+            ),
+            params=CommonAppCallParams(sender=manager.address),
+        )
+    with pytest.raises(LogicError, match=err.UNAUTHORIZED):
+        client.send.delete_config(
+            args=DeleteConfigArgs(asset=asset),
+            params=CommonAppCallParams(
+                sender=burned.address, extra_fee=AlgoAmount(micro_algo=MIN_FEE)
+            ),
+        )
@@ -0,0 +1,87 @@
+import base64
+import re
+from pathlib import Path
+from typing import Any
+
+from algokit_utils import AppManager
+from algosdk import logic
+
+from helpers.program_cache import ProgramCache
+from smart_contracts.template_vars import ARC54_BURN_ADDRESS
+
+APPROVAL = (
+    Path(__file__).parents[1]
+    / "smart_contracts/artifacts/circulating_supply/CirculatingSupply.approval.teal"
+).read_text()
+# Approval template with an additional int template variable
+TEMPLATE = APPROVAL + "    pushint TMPL_LIMIT\n"
+
+ADDRESS_1 = bytes(range(32))
+ADDRESS_2 = bytes(range(32, 64))
+
+
+class _Algod:
+    """Assembles the byte constants of the TEAL, counting the compilations"""
+
+    def __init__(self) -> None:
+        self.compilations = 0
+
+    def compile(self, teal: str, **_: Any) -> dict[str, Any]:
+        self.compilations += 1
+        program = bytes.fromhex(
+            "0c"
+            + "".join(
+                re.findall(r"^\s*bytecblock((?: 0x[0-9a-f]+)+)", teal, re.M)
+            ).replace(" 0x", "")
+        )
+        return {
+            "result": base64.b64encode(program).decode(),
+            "hash": logic.address(program),
+            "sourcemap": {"version": 3, "sources": [], "names": [], "mappings": ""},
+        }
+
+
+def _compile(
+    algod: _Algod, cache: ProgramCache, address: bytes, limit: int = 1
+) -> bytes:
+    return (
+        cache.install(AppManager(algod))
+        .compile_teal_template(TEMPLATE, {ARC54_BURN_ADDRESS: address, "LIMIT": limit})
+        .compiled_base64_to_bytes
+    )
+
+
+def test_pass_program_cache(tmp_path: Path) -> None:
+    algod = _Algod()
+    program = _compile(algod, ProgramCache(tmp_path), ADDRESS_1)
+    assert ADDRESS_1 in program
+    assert algod.compilations == 1
+
+    cache = ProgramCache(tmp_path)
+    assert _compile(algod, cache, ADDRESS_1) == program
+    assert (cache.hits, algod.compilations) == (1, 1)
+
+    # Assembled offline for another template address
+    program = _compile(algod, cache, ADDRESS_2)
+    assert cache.assembled == 1
+    assert algod.compilations == 1
+    assert program == _compile(_Algod(), ProgramCache(tmp_path / "new"), ADDRESS_2)
+    assert _compile(algod, ProgramCache(tmp_path), ADDRESS_2) == program
+    assert algod.compilations == 1
+
+    # Int template values change the program size
+    _compile(algod, cache, ADDRESS_1, limit=2)
+    assert algod.compilations == 2
+
+
+def test_pass_ambiguous_template_value(tmp_path: Path) -> None:
+    # The address occurs twice in the program: the patch would be ambiguous
+    arc4_prefix = bytes.fromhex("151f7c75")
+    address = arc4_prefix * 8
+    algod = _Algod()
+    teal = APPROVAL.replace("0x151f7c75", "0x" + address.hex())
+    cache = ProgramCache(tmp_path)
+    manager = cache.install(AppManager(algod))
+    manager.compile_teal_template(teal, {ARC54_BURN_ADDRESS: address})
+    manager.compile_teal_template(teal, {ARC54_BURN_ADDRESS: ADDRESS_1})
+    assert (cache.assembled, algod.compilations) == (0, 2)
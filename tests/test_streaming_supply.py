@@ -0,0 +1,96 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Any
+
+from algosdk.account import generate_account
+from algosdk.constants import ZERO_ADDRESS
+
+from helpers.circulating_supply import empty_config
+from helpers.streaming_supply import (
+    AddressIndex,
+    iter_json_lines,
+    parse_asset_params,
+    stream_circulating_supply,
+)
+from smart_contracts.artifacts.circulating_supply.circulating_supply_client import (
+    CirculatingSupplyConfig,
+)
+
+RESERVE = generate_account()[1]
+BURNED = generate_account()[1]
+HOLDER = generate_account()[1]
+
+
+def _asset(asset_id: int, total: int, **fields: Any) -> dict[str, Any]:
+    return {"index": asset_id, "params": {"total": total, "reserve": RESERVE}} | fields
+
+
+def _holding(address: str, asset_id: int, amount: int, **fields: Any) -> dict[str, Any]:
+    return {"address": address, "asset-id": asset_id, "amount": amount} | fields
+
+
+def _write(path: Path, records: list[dict[str, Any]]) -> Path:
+    lines = "".join(json.dumps(r) + "\n" for r in records)
+    if path.suffix == ".gz":
+        path.write_bytes(gzip.compress(lines.encode()))
+    else:
+        path.write_text(lines)
+    return path
+
+
+def test_pass_stream_circulating_supply(tmp_path: Path) -> None:
+    configs = {
+        1: CirculatingSupplyConfig(BURNED, *(ZERO_ADDRESS,) * 4),
+        2: empty_config(),
+        3: empty_config(),  # Deleted ASA
+        4: empty_config(),  # Missing from the params dump
+        5: CirculatingSupplyConfig(RESERVE, *(ZERO_ADDRESS,) * 4),  # Underflow
+        6: empty_config(),
+    }
+    params = _write(
+        tmp_path / "params.jsonl.gz",
+        [
+            _asset(1, 100),
+            _asset(2, 50),
+            _asset(3, 10, deleted=True),
+            _asset(5, 10),
+            _asset(6, 10),
+            _asset(9, 1),
+        ],
+    )
+    holdings = _write(
+        tmp_path / "holdings.jsonl",
+        [
+            _holding(RESERVE, 1, 30),
+            _holding(BURNED, 1, 20),
+            _holding(HOLDER, 1, 50),
+            _holding(BURNED, 2, 5),  # Not a non-circulating address of ASA 2
+            _holding(RESERVE, 2, 10, deleted=True),  # Closed-out
+            _holding(RESERVE, 5, 6),  # Reserve set as burned too: 12 > 10
+            _holding(RESERVE, 6, 4),
+            _holding(RESERVE, 9, 1),
+        ],
+    )
+
+    supplies = stream_circulating_supply(
+        configs, iter_json_lines(params), iter_json_lines(holdings)
+    )
+
+    # The underflowing ASA does not stop the stream
+    assert list(supplies) == [(1, 50), (2, 50), (3, 0), (4, 0), (5, None), (6, 6)]
+
+
+def test_pass_address_index() -> None:
+    configs = {
+        1: CirculatingSupplyConfig(BURNED, *(ZERO_ADDRESS,) * 4),
+        2: empty_config(),
+    }
+    params = dict(parse_asset_params(a) for a in (_asset(1, 100), _asset(2, 50)))
+
+    index = AddressIndex(configs, params)
+
+    assert len(index) == 2
+    assert index.assets_of(RESERVE) == {1, 2}
+    assert index.assets_of(BURNED) == {1}
+    assert not index.assets_of(HOLDER)
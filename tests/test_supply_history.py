@@ -0,0 +1,223 @@
+from pathlib import Path
+from typing import Any
+
+import msgpack
+import pytest
+from algosdk.account import generate_account
+from algosdk.constants import ZERO_ADDRESS
+from algosdk.encoding import decode_address
+
+from helpers.app_calls import (
+    DELETE_CONFIG,
+    INIT_CONFIG,
+    SET_NOT_CIRCULATING_ADDRESS,
+    ConfigUpdate,
+    encode_config_update,
+)
+from helpers.asset_params import AssetParams
+from helpers.supply_history import (
+    SECONDS_PER_DAY,
+    ReplayError,
+    ReplayState,
+    SupplyPoint,
+    SupplyReplay,
+    daily_supply,
+    iter_block_files,
+)
+from smart_contracts.circulating_supply import config as cfg
+
+APP_ID = 1234
+ASSET_ID = 1001
+TOTAL = 100
+
+CREATOR = generate_account()[1]
+RESERVE = generate_account()[1]
+CUSTOM = generate_account()[1]
+HOLDER = generate_account()[1]
+
+
+def _block(round_num: int, timestamp: int, *txns: dict[str, Any]) -> dict[str, Any]:
+    return {"block": {"rnd": round_num, "ts": timestamp, "txns": list(txns)}}
+
+
+def _create(reserve: str) -> dict[str, Any]:
+    apar = {"t": TOTAL, "m": decode_address(CREATOR), "r": decode_address(reserve)}
+    return {
+        "txn": {"type": "acfg", "snd": decode_address(CREATOR), "apar": apar},
+        "caid": ASSET_ID,
+    }
+
+
+def _transfer(sender: str, receiver: str, amount: int, **fields: Any) -> dict[str, Any]:
+    txn = {
+        "type": "axfer",
+        "snd": decode_address(sender),
+        "arcv": decode_address(receiver),
+        "xaid": ASSET_ID,
+    }
+    if amount:
+        txn["aamt"] = amount
+    return {"txn": txn | fields}
+
+
+def _opt_in(account: str) -> dict[str, Any]:
+    return _transfer(account, account, 0)
+
+
+def _reconfigure(reserve: str) -> dict[str, Any]:
+    apar = {"m": decode_address(CREATOR), "r": decode_address(reserve)}
+    return {
+        "txn": {
+            "type": "acfg",
+            "snd": decode_address(CREATOR),
+            "caid": ASSET_ID,
+            "apar": apar,
+        }
+    }
+
+
+def _app_call(update: ConfigUpdate) -> dict[str, Any]:
+    return {
+        "txn": {
+            "type": "appl",
+            "snd": decode_address(CREATOR),
+            "apid": APP_ID,
+            "apaa": encode_config_update(update),
+        }
+    }
+
+
+def _blocks() -> list[dict[str, Any]]:
+    return [
+        _block(
+            10,
+            0,
+            _create(reserve=RESERVE),
+            _opt_in(RESERVE),
+            _opt_in(CUSTOM),
+            _opt_in(HOLDER),
+            _transfer(CREATOR, RESERVE, 40),
+            _transfer(CREATOR, CUSTOM, 10),
+        ),
+        _block(11, 10, _app_call(ConfigUpdate(INIT_CONFIG, ASSET_ID))),
+        _block(
+            12,
+            20,
+            _app_call(
+                ConfigUpdate(
+                    SET_NOT_CIRCULATING_ADDRESS, ASSET_ID, cfg.CUSTOM_1, CUSTOM
+                )
+            ),
+        ),
+        # Unrelated transfer, no supply change
+        _block(13, SECONDS_PER_DAY, _transfer(CREATOR, HOLDER, 5)),
+        # Custom address closes out to a circulating holder
+        _block(
+            14,
+            SECONDS_PER_DAY + 10,
+            {
+                **_transfer(CUSTOM, HOLDER, 0, aclose=decode_address(HOLDER)),
+                "aca": 10,
+            },
+        ),
+        _block(
+            15, 3 * SECONDS_PER_DAY, _app_call(ConfigUpdate(DELETE_CONFIG, ASSET_ID))
+        ),
+    ]
+
+
+def test_pass_replay() -> None:
+    replay = SupplyReplay(APP_ID)
+    points = list(replay.replay(_blocks()))
+
+    assert points == [
+        SupplyPoint(11, 10, ASSET_ID, TOTAL - 40),
+        SupplyPoint(12, 20, ASSET_ID, TOTAL - 40 - 10),
+        SupplyPoint(14, SECONDS_PER_DAY + 10, ASSET_ID, TOTAL - 40),
+        SupplyPoint(15, 3 * SECONDS_PER_DAY, ASSET_ID, None),
+    ]
+    assert replay.state.round == 15
+    # Every holder of a created ASA is tracked, closed out addresses hold zero
+    assert replay.state.balances[ASSET_ID] == {
+        CREATOR: 45,
+        RESERVE: 40,
+        CUSTOM: 0,
+        HOLDER: 15,
+    }
+
+
+def test_pass_daily_supply() -> None:
+    points = list(daily_supply(SupplyReplay(APP_ID).replay(_blocks())))
+
+    assert [(p.timestamp // SECONDS_PER_DAY, p.supply) for p in points] == [
+        (0, TOTAL - 50),
+        (1, TOTAL - 40),
+        (2, TOTAL - 40),  # No changes, repeats the previous supply
+    ]
+
+
+def test_pass_resume_from_saved_state(tmp_path: Path) -> None:
+    blocks = _blocks()
+    replay = SupplyReplay(APP_ID)
+    list(replay.replay(blocks[:3]))
+    replay.state.save(tmp_path / "state.json")
+
+    resumed = SupplyReplay(APP_ID, ReplayState.load(tmp_path / "state.json"))
+    points = list(resumed.replay(blocks[3:]))
+
+    # The first replayed round reports the baseline of every configured ASA
+    assert points[0] == SupplyPoint(13, SECONDS_PER_DAY, ASSET_ID, TOTAL - 50)
+    assert points[-1].supply is None
+
+
+def test_pass_block_files(tmp_path: Path) -> None:
+    for block in _blocks():
+        path = tmp_path / f"{block['block']['rnd']}.msgp"
+        path.write_bytes(msgpack.packb(block, use_bin_type=True))
+
+    blocks = list(iter_block_files(tmp_path, first_round=11, last_round=12))
+
+    assert [b["block"]["rnd"] for b in blocks] == [11, 12]
+    assert blocks[0]["block"]["txns"][0]["txn"]["apid"] == APP_ID
+
+
+def test_fail_unknown_asset() -> None:
+    replay = SupplyReplay(APP_ID)
+    with pytest.raises(ReplayError, match="Unknown parameters"):
+        list(replay.replay(_blocks()[1:]))
+
+
+def test_pass_reserve_reconfiguration() -> None:
+    blocks = [
+        *_blocks()[:4],
+        # HOLDER received units before becoming the reserve
+        _block(16, 2 * SECONDS_PER_DAY, _reconfigure(reserve=HOLDER)),
+    ]
+    points = list(SupplyReplay(APP_ID).replay(blocks))
+
+    assert points[-1] == SupplyPoint(16, 2 * SECONDS_PER_DAY, ASSET_ID, TOTAL - 5 - 10)
+
+
+def test_fail_unknown_balance() -> None:
+    # ASA created before the replay, seeded without the CUSTOM balance
+    state = ReplayState(
+        params={
+            ASSET_ID: AssetParams(
+                asset_id=ASSET_ID,
+                total=TOTAL,
+                manager=CREATOR,
+                reserve=RESERVE,
+                clawback=ZERO_ADDRESS,
+            )
+        },
+        balances={ASSET_ID: {CREATOR: 50, RESERVE: 40}},
+    )
+    replay = SupplyReplay(APP_ID, state)
+    with pytest.raises(ReplayError, match=f"Unknown balance of {CUSTOM}"):
+        list(replay.replay(_blocks()[1:]))
+
+
+def test_fail_replayed_block() -> None:
+    replay = SupplyReplay(APP_ID, ReplayState(round=10))
+    with pytest.raises(ValueError, match="already replayed"):
+        list(replay.replay(_blocks()))
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from helpers.supply_service import (
+    ROUND_HEADER,
+    SupplyError,
+    SupplyServer,
+    SupplyService,
+)
+
+ROUND = 42
+FAILING_ASSET_ID = 999
+
+
+class _Source:
+    """Stand-in of the simulated getter: ASA 0 has no config, ASA 999 fails"""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[list[int]] = []
+        self.concurrency = self.max_concurrency = 0
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, asset_ids: list[int]
+    ) -> tuple[dict[int, int | SupplyError | None], int]:
+        with self._lock:
+            self.calls.append(asset_ids)
+            self.concurrency += 1
+            self.max_concurrency = max(self.max_concurrency, self.concurrency)
+        time.sleep(self.delay)
+        with self._lock:
+            self.concurrency -= 1
+        return {a: _supply(a) for a in asset_ids}, ROUND
+
+
+def _supply(asset_id: int) -> int | SupplyError | None:
+    if asset_id == FAILING_ASSET_ID:
+        return SupplyError("logic eval error")
+    return asset_id * 10 if asset_id else None
+
+
+@pytest.fixture()
+def server() -> Iterator[tuple[str, _Source]]:
+    source = _Source()
+    server = SupplyServer(("127.0.0.1", 0), SupplyService(source))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", source
+    server.shutdown()
+    server.server_close()
+
+
+def test_pass_single_endpoint(server: tuple[str, _Source]) -> None:
+    url, source = server
+    with urlopen(f"{url}/v1/supply/7") as response:
+        assert response.read() == b"70"
+        assert response.headers[ROUND_HEADER] == str(ROUND)
+    with urlopen(f"{url}/v1/supply/7?format=json") as response:
+        assert json.load(response) == {
+            "asset-id": 7,
+            "circulating-supply": 70,
+            "round": ROUND,
+        }
+    assert source.calls == [[7]]  # Cached
+
+    with pytest.raises(HTTPError) as e:
+        urlopen(f"{url}/v1/supply/0")
+    assert e.value.code == 404
+    with pytest.raises(HTTPError) as e:
+        urlopen(f"{url}/v1/supply/abc")
+    assert e.value.code == 400
+
+
+def test_pass_batch_endpoint(server: tuple[str, _Source]) -> None:
+    url, source = server
+    asset_ids = list(range(1, 21))
+    query = ",".join(map(str, asset_ids))
+    with urlopen(f"{url}/v1/supply?asset-ids={query}") as response:
+        supplies = json.load(response)["supplies"]
+
+    assert [s["circulating-supply"] for s in supplies] == [a * 10 for a in asset_ids]
+    # Read in groups of at most 16 getters
+    assert [len(c) for c in source.calls] == [16, 4]
+
+
+def test_pass_coalesced_misses() -> None:
+    source = _Source(delay=0.05)
+    service = SupplyService(source, max_concurrency=2)
+    results = []
+
+    def get(asset_id: int) -> None:
+        results.append(service.get(asset_id))
+
+    threads = [threading.Thread(target=get, args=(i % 4 + 1,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 32
+    assert sorted(a for c in source.calls for a in c) == [1, 2, 3, 4]
+    assert source.max_concurrency <= 2
+
+
+def test_pass_might_have_config() -> None:
+    source = _Source()
+    service = SupplyService(source, might_have_config=lambda a: a < 100)
+
+    result = service.get(1_000)
+
+    assert result.supply is None
+    assert result.round == ROUND
+    assert source.calls == [[]]  # Only the current round
+
+
+def test_pass_failed_asset(server: tuple[str, _Source]) -> None:
+    url, source = server
+    with urlopen(f"{url}/v1/supply?asset-ids=7,{FAILING_ASSET_ID},8") as response:
+        supplies = json.load(response)["supplies"]
+
+    assert [s["circulating-supply"] for s in supplies] == [70, None, 80]
+    assert supplies[1]["error"] == "logic eval error"
+    assert "error" not in supplies[0]
+
+    with pytest.raises(HTTPError) as e:
+        urlopen(f"{url}/v1/supply/{FAILING_ASSET_ID}")
+    assert e.value.code == 502
+    # Failed reads are not cached
+    assert source.calls == [[7, FAILING_ASSET_ID, 8], [FAILING_ASSET_ID]]
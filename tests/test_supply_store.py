@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import pytest
+
+from helpers.supply_history import SupplyPoint
+from helpers.supply_store import DAILY, HOURLY, SupplyRollup, SupplyStore
+
+ASSET_ID = 1001
+OTHER_ASSET_ID = 1002
+
+
+def _points(asset_id: int, count: int, first_round: int = 1) -> list[SupplyPoint]:
+    return [
+        SupplyPoint(
+            round=first_round + 3 * i,
+            timestamp=(first_round + 3 * i) * 600,  # 10 minutes per round
+            asset_id=asset_id,
+            supply=1_000_000 + (i % 7) * 1_000 - i,
+        )
+        for i in range(count)
+    ]
+
+
+def test_pass_query(tmp_path: Path) -> None:
+    points = _points(ASSET_ID, 100)
+    with SupplyStore(tmp_path, chunk_size=16) as store:
+        store.append(points)
+        store.append(_points(OTHER_ASSET_ID, 10))
+
+    store = SupplyStore(tmp_path)
+    assert store.assets() == [ASSET_ID, OTHER_ASSET_ID]
+    assert list(store.query(ASSET_ID)) == points
+    assert list(store.query(ASSET_ID, 100, 200)) == [
+        p for p in points if 100 <= p.round <= 200
+    ]
+    assert list(store.query(ASSET_ID, 1_000)) == []
+    assert list(store.query(42)) == []
+
+
+def test_pass_append_across_sessions(tmp_path: Path) -> None:
+    first = _points(ASSET_ID, 10)
+    # The series ends with a deleted config
+    second = [
+        *_points(ASSET_ID, 10, first_round=100),
+        SupplyPoint(200, 200 * 600, ASSET_ID, None),
+    ]
+
+    with SupplyStore(tmp_path, chunk_size=4) as store:
+        store.append(first)
+    with SupplyStore(tmp_path, chunk_size=4) as store:
+        store.append(second)
+
+    assert list(SupplyStore(tmp_path).query(ASSET_ID)) == first + second
+
+
+def test_pass_rollups(tmp_path: Path) -> None:
+    points = [
+        SupplyPoint(1, 0, ASSET_ID, 10),
+        SupplyPoint(2, 1_000, ASSET_ID, 5),
+        SupplyPoint(3, 3_600, ASSET_ID, 7),
+        SupplyPoint(4, 4_000, ASSET_ID, 8),
+        SupplyPoint(5, 86_400, ASSET_ID, 1),
+    ]
+    # Split the points across chunks, so that buckets are merged on flush
+    with SupplyStore(tmp_path, chunk_size=3) as store:
+        store.append(points)
+
+    assert list(store.rollups(ASSET_ID, HOURLY)) == [
+        SupplyRollup(0, 5, 10, 5, 2),
+        SupplyRollup(3_600, 7, 8, 8, 4),
+        SupplyRollup(86_400, 1, 1, 1, 5),
+    ]
+    assert list(store.rollups(ASSET_ID, DAILY)) == [
+        SupplyRollup(0, 5, 10, 8, 4),
+        SupplyRollup(86_400, 1, 1, 1, 5),
+    ]
+    assert list(store.rollups(ASSET_ID, HOURLY, 1, 86_400)) == [
+        SupplyRollup(3_600, 7, 8, 8, 4)
+    ]
+
+
+def test_pass_uint64_bounds(tmp_path: Path) -> None:
+    max_uint64 = 2**64 - 1
+    points = [
+        SupplyPoint(1, 0, ASSET_ID, max_uint64),
+        SupplyPoint(2, 600, ASSET_ID, 0),
+        SupplyPoint(3, 1_200, ASSET_ID, None),
+        SupplyPoint(4, 1_800, ASSET_ID, max_uint64),
+        SupplyPoint(5, 2_400, ASSET_ID, None),
+        SupplyPoint(max_uint64, max_uint64, ASSET_ID, max_uint64 - 1),
+    ]
+    with SupplyStore(tmp_path, chunk_size=4) as store:
+        store.append(points)
+
+    assert list(store.query(ASSET_ID)) == points
+    assert list(store.rollups(ASSET_ID, HOURLY)) == [
+        SupplyRollup(0, 0, max_uint64, max_uint64, 4),
+        SupplyRollup(
+            max_uint64 - max_uint64 % 3_600,
+            max_uint64 - 1,
+            max_uint64 - 1,
+            max_uint64 - 1,
+            max_uint64,
+        ),
+    ]
+
+
+def test_fail_append_out_of_order(tmp_path: Path) -> None:
+    with SupplyStore(tmp_path) as store:
+        store.append(_points(ASSET_ID, 2))
+    store = SupplyStore(tmp_path)
+    with pytest.raises(ValueError, match="is not after"):
+        store.append(_points(ASSET_ID, 1))
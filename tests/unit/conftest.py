@@ -0,0 +1,165 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Final
+
+import pytest
+from algopy import Account, Asset, String, UInt64
+from algopy_testing import AlgopyTestContext, algopy_testing_context
+
+from smart_contracts.circulating_supply.contract import CirculatingSupply
+from smart_contracts.template_vars import ARC54_BURN_ADDRESS
+from tests.conftest import (
+    ASA_TOTAL,
+    BURNED_BALANCE,
+    CONFIG_MBR,
+    CUSTOM_BALANCE_1,
+    CUSTOM_BALANCE_2,
+    CUSTOM_BALANCE_3,
+    CUSTOM_BALANCE_4,
+    RESERVE_BALANCE,
+)
+
+# Registered in the ledger before the holders opt in, its params are set by the tests
+ASSET_ID: Final[int] = 1_001
+
+
+def _holder(context: AlgopyTestContext, balance: int) -> Account:
+    return context.any.account(opted_asset_balances={ASSET_ID: UInt64(balance)})
+
+
+def set_asset_params(context: AlgopyTestContext, **params: object) -> Asset:
+    context.ledger.update_asset(ASSET_ID, **params)
+    return context.ledger.get_asset(ASSET_ID)
+
+
+def init_config(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset: Asset,
+    sender: Account,
+    *,
+    receiver: Account | None = None,
+) -> UInt64:
+    mbr_payment = context.any.txn.payment(
+        sender=sender,
+        receiver=receiver or context.ledger.get_app(contract).address,
+        amount=UInt64(CONFIG_MBR.micro_algo),
+    )
+    with context.txn.create_group(active_txn_overrides={"sender": sender}):
+        return contract.init_config(asset, mbr_payment)
+
+
+def set_not_circulating_address(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset: Asset,
+    sender: Account,
+    address: Account,
+    label: str,
+) -> None:
+    with (
+        _string_match_args(),
+        context.txn.create_group(active_txn_overrides={"sender": sender}),
+    ):
+        contract.set_not_circulating_address(asset, address, String(label))
+
+
+@contextmanager
+def _string_match_args() -> Iterator[None]:
+    """
+    Workaround for the emulator version pinned in the dev dependencies
+    (algorand-python-testing 1.1.0): its `String` has no `__match_args__`, so the
+    positional class pattern `case String(cfg.BURNED)` of the contract (required by
+    puyapy) raises a TypeError. Upstream: `_algopy_testing/primitives/string.py`
+    in https://github.com/algorandfoundation/algorand-python-testing. Drop it once
+    the emulated `String` supports positional class patterns.
+    """
+    if hasattr(String, "__match_args__"):
+        yield
+        return
+    String.__match_args__ = ("value",)
+    try:
+        yield
+    finally:
+        del String.__match_args__
+
+
+@pytest.fixture()
+def context() -> Iterator[AlgopyTestContext]:
+    with algopy_testing_context() as ctx:
+        ctx.any.asset(asset_id=ASSET_ID)
+        yield ctx
+
+
+@pytest.fixture()
+def asset_creator(context: AlgopyTestContext) -> Account:
+    return context.any.account()
+
+
+@pytest.fixture()
+def asset_manager(context: AlgopyTestContext) -> Account:
+    return context.any.account()
+
+
+@pytest.fixture()
+def reserve_with_balance(context: AlgopyTestContext) -> Account:
+    return _holder(context, RESERVE_BALANCE)
+
+
+@pytest.fixture()
+def burned_balance(context: AlgopyTestContext) -> Account:
+    return _holder(context, BURNED_BALANCE)
+
+
+@pytest.fixture()
+def custom_balance_1(context: AlgopyTestContext) -> Account:
+    return _holder(context, CUSTOM_BALANCE_1)
+
+
+@pytest.fixture()
+def custom_balance_2(context: AlgopyTestContext) -> Account:
+    return _holder(context, CUSTOM_BALANCE_2)
+
+
+@pytest.fixture()
+def custom_balance_3(context: AlgopyTestContext) -> Account:
+    return _holder(context, CUSTOM_BALANCE_3)
+
+
+@pytest.fixture()
+def custom_balance_4(context: AlgopyTestContext) -> Account:
+    return _holder(context, CUSTOM_BALANCE_4)
+
+
+@pytest.fixture()
+def asset(
+    context: AlgopyTestContext,
+    asset_creator: Account,
+    asset_manager: Account,
+    reserve_with_balance: Account,
+) -> Asset:
+    return set_asset_params(
+        context,
+        creator=asset_creator,
+        total=UInt64(ASA_TOTAL),
+        manager=asset_manager,
+        reserve=reserve_with_balance,
+        clawback=Account(),
+    )
+
+
+@pytest.fixture()
+def contract(context: AlgopyTestContext, burned_balance: Account) -> CirculatingSupply:
+    context.set_template_var(ARC54_BURN_ADDRESS, burned_balance)
+    return CirculatingSupply()
+
+
+@pytest.fixture()
+def asset_contract(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset: Asset,
+    asset_manager: Account,
+) -> CirculatingSupply:
+    init_config(context, contract, asset, asset_manager)
+    return contract
@@ -0,0 +1,81 @@
+import pytest
+from algopy import Account, Asset, UInt64
+from algopy_testing import AlgopyTestContext
+
+from smart_contracts import errors as err
+from smart_contracts.circulating_supply import config as cfg
+from smart_contracts.circulating_supply.contract import CirculatingSupply
+
+from .conftest import (
+    ASA_TOTAL,
+    BURNED_BALANCE,
+    CUSTOM_BALANCE_1,
+    CUSTOM_BALANCE_2,
+    CUSTOM_BALANCE_3,
+    CUSTOM_BALANCE_4,
+    RESERVE_BALANCE,
+    init_config,
+    set_asset_params,
+    set_not_circulating_address,
+)
+
+
+def test_pass_get_circulating_supply(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+    burned_balance: Account,
+    custom_balance_1: Account,
+    custom_balance_2: Account,
+    custom_balance_3: Account,
+    custom_balance_4: Account,
+) -> None:
+    circulating_supply = ASA_TOTAL - RESERVE_BALANCE
+    assert asset_contract.arc62_get_circulating_supply(asset.id) == circulating_supply
+
+    for label, address, balance in (
+        (cfg.BURNED, burned_balance, BURNED_BALANCE),
+        (cfg.CUSTOM_1, custom_balance_1, CUSTOM_BALANCE_1),
+        (cfg.CUSTOM_2, custom_balance_2, CUSTOM_BALANCE_2),
+        (cfg.CUSTOM_3, custom_balance_3, CUSTOM_BALANCE_3),
+        (cfg.CUSTOM_4, custom_balance_4, CUSTOM_BALANCE_4),
+    ):
+        set_not_circulating_address(
+            context, asset_contract, asset, asset_manager, address, label
+        )
+        circulating_supply -= balance
+        assert (
+            asset_contract.arc62_get_circulating_supply(asset.id) == circulating_supply
+        )
+
+
+def test_pass_no_reserve(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset_manager: Account,
+) -> None:
+    asset = set_asset_params(
+        context,
+        total=UInt64(ASA_TOTAL),
+        manager=asset_manager,
+        reserve=Account(),
+    )
+    init_config(context, contract, asset, asset_manager)
+
+    assert contract.arc62_get_circulating_supply(asset.id) == ASA_TOTAL
+
+
+def test_fail_config_not_exists(
+    contract: CirculatingSupply,
+    asset: Asset,
+) -> None:
+    with pytest.raises(AssertionError, match=err.CONFIG_NOT_EXISTS):
+        contract.arc62_get_circulating_supply(asset.id)
+
+
+def test_fail_config_not_exists_for_unknown_asset(
+    asset_contract: CirculatingSupply,
+) -> None:
+    with pytest.raises(AssertionError, match=err.CONFIG_NOT_EXISTS):
+        asset_contract.arc62_get_circulating_supply(UInt64(42))
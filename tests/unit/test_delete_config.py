@@ -0,0 +1,44 @@
+import pytest
+from algopy import Account, Asset
+from algopy_testing import AlgopyTestContext
+
+from smart_contracts import errors as err
+from smart_contracts.circulating_supply.contract import CirculatingSupply
+
+
+def test_pass_delete_config(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+) -> None:
+    with context.txn.create_group(active_txn_overrides={"sender": asset_manager}):
+        asset_contract.delete_config(asset)
+
+    assert asset not in asset_contract.circulating_supply
+
+
+def test_fail_unauthorized(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_creator: Account,
+    asset: Asset,
+) -> None:
+    with (
+        pytest.raises(AssertionError, match=err.UNAUTHORIZED),
+        context.txn.create_group(active_txn_overrides={"sender": asset_creator}),
+    ):
+        asset_contract.delete_config(asset)
+
+
+def test_fail_config_not_exists(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+) -> None:
+    with (
+        pytest.raises(AssertionError, match=err.CONFIG_NOT_EXISTS),
+        context.txn.create_group(active_txn_overrides={"sender": asset_manager}),
+    ):
+        contract.delete_config(asset)
@@ -0,0 +1,50 @@
+import pytest
+from algopy import Account, Asset
+from algopy_testing import AlgopyTestContext
+
+from smart_contracts import errors as err
+from smart_contracts.circulating_supply.contract import CirculatingSupply
+
+from .conftest import init_config
+
+
+def test_pass_init_config(asset_contract: CirculatingSupply, asset: Asset) -> None:
+    assert asset in asset_contract.circulating_supply
+    config = asset_contract.get_config(asset)
+    assert config.burned_addr == Account()
+    assert config.custom_1_addr == Account()
+    assert config.custom_2_addr == Account()
+    assert config.custom_3_addr == Account()
+    assert config.custom_4_addr == Account()
+
+
+def test_fail_unauthorized(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset_creator: Account,
+    asset: Asset,
+) -> None:
+    with pytest.raises(AssertionError, match=err.UNAUTHORIZED):
+        init_config(context, contract, asset, asset_creator)
+
+
+def test_fail_config_exists(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+) -> None:
+    with pytest.raises(AssertionError, match=err.CONFIG_EXISTS):
+        init_config(context, asset_contract, asset, asset_manager)
+
+
+def test_fail_invalid_mbr_receiver(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+) -> None:
+    with pytest.raises(AssertionError, match=err.INVALID_MBR_RECEIVER):
+        init_config(
+            context, contract, asset, asset_manager, receiver=context.any.account()
+        )
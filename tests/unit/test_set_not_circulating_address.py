@@ -0,0 +1,115 @@
+import pytest
+from algopy import Account, Asset, UInt64
+from algopy_testing import AlgopyTestContext
+
+from smart_contracts import errors as err
+from smart_contracts.circulating_supply import config as cfg
+from smart_contracts.circulating_supply.contract import CirculatingSupply
+
+from .conftest import init_config, set_asset_params, set_not_circulating_address
+
+
+def test_pass_set_not_circulating_address(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+    burned_balance: Account,
+    custom_balance_1: Account,
+    custom_balance_2: Account,
+    custom_balance_3: Account,
+    custom_balance_4: Account,
+) -> None:
+    for label, address in (
+        (cfg.BURNED, burned_balance),
+        (cfg.CUSTOM_1, custom_balance_1),
+        (cfg.CUSTOM_2, custom_balance_2),
+        (cfg.CUSTOM_3, custom_balance_3),
+        (cfg.CUSTOM_4, custom_balance_4),
+    ):
+        set_not_circulating_address(
+            context, asset_contract, asset, asset_manager, address, label
+        )
+
+    config = asset_contract.get_config(asset)
+    assert config.burned_addr == burned_balance
+    assert config.custom_1_addr == custom_balance_1
+    assert config.custom_2_addr == custom_balance_2
+    assert config.custom_3_addr == custom_balance_3
+    assert config.custom_4_addr == custom_balance_4
+
+
+def test_fail_unauthorized(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_creator: Account,
+    asset: Asset,
+    burned_balance: Account,
+) -> None:
+    with pytest.raises(AssertionError, match=err.UNAUTHORIZED):
+        set_not_circulating_address(
+            context, asset_contract, asset, asset_creator, burned_balance, cfg.BURNED
+        )
+
+
+def test_fail_config_not_exists(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+    burned_balance: Account,
+) -> None:
+    with pytest.raises(AssertionError, match=err.CONFIG_NOT_EXISTS):
+        set_not_circulating_address(
+            context, contract, asset, asset_manager, burned_balance, cfg.BURNED
+        )
+
+
+def test_fail_not_opted_in(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+) -> None:
+    with pytest.raises(AssertionError, match=err.NOT_OPTED_IN):
+        set_not_circulating_address(
+            context,
+            asset_contract,
+            asset,
+            asset_manager,
+            context.any.account(),
+            cfg.CUSTOM_1,
+        )
+
+
+def test_fail_not_arc54_compliant(
+    context: AlgopyTestContext,
+    contract: CirculatingSupply,
+    asset_manager: Account,
+    burned_balance: Account,
+) -> None:
+    asset = set_asset_params(
+        context,
+        total=UInt64(1),
+        manager=asset_manager,
+        clawback=asset_manager,
+    )
+    init_config(context, contract, asset, asset_manager)
+
+    with pytest.raises(AssertionError, match=err.ASA_NOT_ARC54_COMPLIANT):
+        set_not_circulating_address(
+            context, contract, asset, asset_manager, burned_balance, cfg.BURNED
+        )
+
+
+def test_fail_invalid_burning_address(
+    context: AlgopyTestContext,
+    asset_contract: CirculatingSupply,
+    asset_manager: Account,
+    asset: Asset,
+    custom_balance_1: Account,
+) -> None:
+    with pytest.raises(AssertionError, match=err.INVALID_BURNING_ADDRESS):
+        set_not_circulating_address(
+            context, asset_contract, asset, asset_manager, custom_balance_1, cfg.BURNED
+        )